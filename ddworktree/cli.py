@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Optional, List
 
 from .core import DDWorktreeRepo, DDWorktreeError
+from .utils.iostat import path_exists
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -72,6 +73,8 @@ def create_parser() -> argparse.ArgumentParser:
     reset_parser.add_argument('--hard', action='store_true', help='Hard reset')
     reset_parser.add_argument('--soft', action='store_true', help='Soft reset')
     reset_parser.add_argument('--keep-local', action='store_true', help='Keep local changes')
+    reset_parser.add_argument('--sequential', action='store_true', help='Reset worktrees one at a time')
+    reset_parser.add_argument('--yes', '-y', action='store_true', help='Skip the hard reset confirmation')
 
     rm_parser = subparsers.add_parser('rm', help='Remove files')
     rm_parser.add_argument('files', nargs='+', help='Files to remove')
@@ -88,15 +91,23 @@ def create_parser() -> argparse.ArgumentParser:
     pull_parser = subparsers.add_parser('pull', help='Pull updates')
     pull_parser.add_argument('remote', nargs='?', help='Remote to pull from')
     pull_parser.add_argument('branch', nargs='?', help='Branch to pull')
+    pull_parser.add_argument('--all', action='store_true', help='Pull in every configured pair')
+    pull_parser.add_argument('--jobs', '-j', type=int, help='Parallel jobs for --all')
 
     push_parser = subparsers.add_parser('push', help='Push commits')
     push_parser.add_argument('--include-local', action='store_true', help='Include local commits')
+    push_parser.add_argument('--all', action='store_true', help='Push from every configured pair')
+    push_parser.add_argument('--jobs', '-j', type=int, help='Parallel jobs for --all')
 
     merge_parser = subparsers.add_parser('merge', help='Merge branch')
     merge_parser.add_argument('branch', help='Branch to merge')
 
     rebase_parser = subparsers.add_parser('rebase', help='Rebase worktrees')
     rebase_parser.add_argument('branch', help='Branch to rebase onto')
+    rebase_parser.add_argument('--all', action='store_true', help='Rebase every configured pair')
+    rebase_parser.add_argument('--jobs', '-j', type=int, help='Parallel jobs for --all')
+    rebase_parser.add_argument('--sequential', action='store_true', help='Rebase worktrees one at a time')
+    rebase_parser.add_argument('--yes', '-y', action='store_true', help='Answer yes to all prompts')
 
     cherry_pick_parser = subparsers.add_parser('cherry-pick', help='Cherry-pick commits')
     cherry_pick_parser.add_argument('commit', help='Commit to cherry-pick')
@@ -109,6 +120,7 @@ def create_parser() -> argparse.ArgumentParser:
     sync_parser.add_argument('pair', nargs='?', help='Specific pair to sync')
     sync_parser.add_argument('--auto-commit', action='store_true', help='Auto-commit changes')
     sync_parser.add_argument('--dry-run', action='store_true', help='Show what would be done')
+    sync_parser.add_argument('--yes', '-y', action='store_true', help='Skip the confirmation prompt')
 
     # Status and diff
     status_parser = subparsers.add_parser('status', help='Show combined status')
@@ -136,6 +148,7 @@ def create_parser() -> argparse.ArgumentParser:
     restore_parser = subparsers.add_parser('restore', help='Restore worktree')
     restore_parser.add_argument('tree', help='Worktree to restore')
     restore_parser.add_argument('--from', dest='from_pair', help='Pair to restore from')
+    restore_parser.add_argument('--yes', '-y', action='store_true', help='Overwrite an existing target without asking')
 
     # Advanced operations
     clone_parser = subparsers.add_parser('clone', help='Clone with paired worktrees')
@@ -233,6 +246,8 @@ def main(args: Optional[List[str]] = None) -> int:
             hard_flag = False
             soft_flag = False
             keep_local_flag = False
+            sequential_flag = False
+            yes_flag = False
             verbose_flag = parsed_args.verbose
             i = 0
             while i < len(command_args):
@@ -245,6 +260,12 @@ def main(args: Optional[List[str]] = None) -> int:
                 elif command_args[i] == '--keep-local':
                     keep_local_flag = True
                     i += 1
+                elif command_args[i] == '--sequential':
+                    sequential_flag = True
+                    i += 1
+                elif command_args[i] in ['-y', '--yes']:
+                    yes_flag = True
+                    i += 1
                 elif command_args[i] in ['-v', '--verbose']:
                     i += 1
                 elif command_args[i].startswith('-'):
@@ -254,7 +275,10 @@ def main(args: Optional[List[str]] = None) -> int:
                 else:
                     commitish = command_args[i]
                     i += 1
-            return reset_worktrees(repo, commitish, hard_flag, soft_flag, keep_local_flag, verbose_flag)
+            if hard_flag and soft_flag:
+                print("Error: --hard and --soft are mutually exclusive", file=sys.stderr)
+                return 1
+            return reset_worktrees(repo, commitish, hard_flag, soft_flag, keep_local_flag, verbose_flag, sequential_flag, yes_flag)
         elif parsed_args.command == 'rm':
             from .commands.rm import remove_files
             # Parse rm-specific args
@@ -326,14 +350,26 @@ def main(args: Optional[List[str]] = None) -> int:
                     i += 1
             return fetch_updates(repo, all_flag, prune_flag, verbose_flag)
         elif parsed_args.command == 'pull':
-            from .commands.pull import pull_updates
+            from .commands.pull import pull_updates, pull_all_pairs
             # Parse pull-specific args
             remote = None
             branch = None
+            all_flag = False
+            jobs = parsed_args.jobs
+            if jobs is not None and jobs < 1:
+                print("Error: --jobs must be at least 1", file=sys.stderr)
+                return 1
             verbose_flag = parsed_args.verbose
             i = 0
             while i < len(command_args):
-                if command_args[i] in ['-v', '--verbose']:
+                if command_args[i] == '--all':
+                    all_flag = True
+                    i += 1
+                elif command_args[i] in ['-j', '--jobs']:
+                    i += 2
+                elif command_args[i].startswith(('--jobs=', '-j')):
+                    i += 1
+                elif command_args[i] in ['-v', '--verbose']:
                     i += 1
                 elif command_args[i].startswith('-'):
                     i += 1
@@ -348,17 +384,31 @@ def main(args: Optional[List[str]] = None) -> int:
                         print("Error: too many arguments", file=sys.stderr)
                         return 1
                     i += 1
+            if all_flag:
+                return pull_all_pairs(repo, remote, branch, jobs, verbose_flag)
             return pull_updates(repo, remote, branch, verbose_flag)
         elif parsed_args.command == 'push':
-            from .commands.push import push_commits
+            from .commands.push import push_commits, push_all_pairs
             # Parse push-specific args
             include_local_flag = False
+            all_flag = False
+            jobs = parsed_args.jobs
+            if jobs is not None and jobs < 1:
+                print("Error: --jobs must be at least 1", file=sys.stderr)
+                return 1
             verbose_flag = parsed_args.verbose
             i = 0
             while i < len(command_args):
                 if command_args[i] == '--include-local':
                     include_local_flag = True
                     i += 1
+                elif command_args[i] == '--all':
+                    all_flag = True
+                    i += 1
+                elif command_args[i] in ['-j', '--jobs']:
+                    i += 2
+                elif command_args[i].startswith(('--jobs=', '-j')):
+                    i += 1
                 elif command_args[i] in ['-v', '--verbose']:
                     i += 1
                 elif command_args[i].startswith('-'):
@@ -367,6 +417,8 @@ def main(args: Optional[List[str]] = None) -> int:
                         i += 1
                 else:
                     i += 1
+            if all_flag:
+                return push_all_pairs(repo, include_local_flag, jobs, verbose_flag)
             return push_commits(repo, include_local_flag, verbose_flag)
         elif parsed_args.command == 'merge':
             from .commands.merge import merge_branch
@@ -393,13 +445,33 @@ def main(args: Optional[List[str]] = None) -> int:
                 return 1
             return merge_branch(repo, branch, verbose_flag)
         elif parsed_args.command == 'rebase':
-            from .commands.rebase import rebase_worktrees
+            from .commands.rebase import rebase_worktrees, rebase_all_pairs
             # Parse rebase-specific args
             branch = None
+            all_flag = False
+            jobs = parsed_args.jobs
+            if jobs is not None and jobs < 1:
+                print("Error: --jobs must be at least 1", file=sys.stderr)
+                return 1
+            sequential_flag = False
+            yes_flag = False
             verbose_flag = parsed_args.verbose
             i = 0
             while i < len(command_args):
-                if command_args[i] in ['-v', '--verbose']:
+                if command_args[i] == '--all':
+                    all_flag = True
+                    i += 1
+                elif command_args[i] in ['-j', '--jobs']:
+                    i += 2
+                elif command_args[i].startswith(('--jobs=', '-j')):
+                    i += 1
+                elif command_args[i] == '--sequential':
+                    sequential_flag = True
+                    i += 1
+                elif command_args[i] in ['-y', '--yes']:
+                    yes_flag = True
+                    i += 1
+                elif command_args[i] in ['-v', '--verbose']:
                     i += 1
                 elif command_args[i].startswith('-'):
                     i += 1
@@ -415,7 +487,9 @@ def main(args: Optional[List[str]] = None) -> int:
             if not branch:
                 print("Error: branch must be specified", file=sys.stderr)
                 return 1
-            return rebase_worktrees(repo, branch, verbose_flag)
+            if all_flag:
+                return rebase_all_pairs(repo, branch, jobs, verbose_flag, yes_flag)
+            return rebase_worktrees(repo, branch, verbose_flag, sequential_flag, yes_flag)
         elif parsed_args.command == 'cherry-pick':
             from .commands.cherry_pick import cherry_pick_commit
             # Parse cherry-pick-specific args
@@ -463,6 +537,7 @@ def main(args: Optional[List[str]] = None) -> int:
             pair = None
             auto_commit = False
             dry_run = False
+            yes_flag = False
             verbose_flag = parsed_args.verbose
             i = 0
             while i < len(command_args):
@@ -472,6 +547,9 @@ def main(args: Optional[List[str]] = None) -> int:
                 elif command_args[i] == '--dry-run':
                     dry_run = True
                     i += 1
+                elif command_args[i] in ['-y', '--yes']:
+                    yes_flag = True
+                    i += 1
                 elif command_args[i] in ['-v', '--verbose']:
                     i += 1
                 elif command_args[i].startswith('-'):
@@ -481,7 +559,7 @@ def main(args: Optional[List[str]] = None) -> int:
                 else:
                     pair = command_args[i]
                     i += 1
-            return sync_worktrees(repo, pair, auto_commit, dry_run, verbose_flag)
+            return sync_worktrees(repo, pair, auto_commit, dry_run, verbose_flag, yes_flag)
         elif parsed_args.command == 'status':
             from .commands.status import show_combined_status
             # Parse status-specific args
@@ -605,6 +683,7 @@ def main(args: Optional[List[str]] = None) -> int:
             # Parse restore-specific args
             tree = None
             from_pair = None
+            yes_flag = False
             verbose_flag = parsed_args.verbose
             i = 0
             while i < len(command_args):
@@ -614,6 +693,9 @@ def main(args: Optional[List[str]] = None) -> int:
                         i += 2
                     else:
                         i += 1
+                elif command_args[i] in ['-y', '--yes']:
+                    yes_flag = True
+                    i += 1
                 elif command_args[i] in ['-v', '--verbose']:
                     i += 1
                 elif command_args[i].startswith('-'):
@@ -626,7 +708,7 @@ def main(args: Optional[List[str]] = None) -> int:
             if not tree:
                 print("Error: tree must be specified", file=sys.stderr)
                 return 1
-            return restore_worktree(repo, tree, from_pair, verbose_flag)
+            return restore_worktree(repo, tree, from_pair, verbose_flag, yes_flag)
         elif parsed_args.command == 'clone':
             from .commands.clone import clone_with_worktrees
             # Parse clone-specific args
@@ -819,8 +901,11 @@ def handle_worktree_list(repo: DDWorktreeRepo, args) -> int:
         return 0
 
     for pair_name, (main_path, local_path) in pairs.items():
-        main_exists = Path(main_path).exists() and repo.is_valid_worktree(main_path)
-        local_exists = Path(local_path).exists() and repo.is_valid_worktree(local_path)
+        main_p = Path(main_path)
+        local_p = Path(local_path)
+        # is_valid_worktree fails for a missing path, so it doubles as the existence check
+        main_exists = repo.is_valid_worktree(main_path)
+        local_exists = repo.is_valid_worktree(local_path)
 
         status = "✅" if main_exists and local_exists else "⚠️"
         print(f"{status} {pair_name}:")
@@ -831,7 +916,7 @@ def handle_worktree_list(repo: DDWorktreeRepo, args) -> int:
         if main_exists and local_exists:
             try:
                 from ..utils.diff import detect_drift
-                drift = detect_drift(Path(main_path), Path(local_path))
+                drift = detect_drift(main_p, local_p)
                 if drift.commit_drift or drift.added_files or drift.deleted_files or drift.modified_files:
                     print(f"   Status: 🔄 Drift detected")
                 else:
@@ -856,11 +941,10 @@ def handle_worktree_remove(repo: DDWorktreeRepo, args) -> int:
         main_path, local_path = pairs[path]
     else:
         # Check if path matches any worktree path
-        for pair_name, (main, local) in pairs.items():
-            if path == main or path == local:
-                pair_to_remove = pair_name
-                main_path, local_path = main, local
-                break
+        entry = repo.find_pair(path)
+        if entry:
+            pair_to_remove = entry[0]
+            main_path, local_path = pairs[pair_to_remove]
 
     if not pair_to_remove:
         print(f"Error: No paired worktree found for '{path}'")
@@ -874,11 +958,11 @@ def handle_worktree_remove(repo: DDWorktreeRepo, args) -> int:
     if not args.dry_run:
         try:
             # Remove worktrees
-            if Path(main_path).exists():
+            if path_exists(main_path):
                 repo.remove_worktree(main_path, force=True)
                 print(f"Removed main worktree: {main_path}")
 
-            if not args.keep_local and Path(local_path).exists():
+            if not args.keep_local and path_exists(local_path):
                 repo.remove_worktree(local_path, force=True)
                 print(f"Removed local worktree: {local_path}")
 
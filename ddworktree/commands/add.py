@@ -3,12 +3,19 @@ Command for staging files for commit in ddworktree.
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
 from typing import List, Optional
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
-from ddworktree.utils.gitignore import get_combined_gitignore_patterns, get_git_status
+from ddworktree.utils.gitignore import (
+    compile_patterns,
+    get_combined_gitignore_patterns,
+    get_git_status,
+    is_ignored_by_pattern
+)
+from ddworktree.utils.session import COMMAND_ENV
 
 
 def add_files(repo: DDWorktreeRepo, files: List[str], verbose: bool = False) -> int:
@@ -18,6 +25,7 @@ def add_files(repo: DDWorktreeRepo, files: List[str], verbose: bool = False) ->
 
     # Get current directory
     current_dir = Path.cwd()
+    current_dir_str = str(current_dir)
 
     try:
         # Get git status to see what files are available
@@ -29,6 +37,7 @@ def add_files(repo: DDWorktreeRepo, files: List[str], verbose: bool = False) ->
 
         staged_files = []
         skipped_files = []
+        ignore_regex = compile_patterns(get_combined_gitignore_patterns(current_dir), path_prefix=True)
 
         for file_pattern in files:
             if file_pattern == '.':
@@ -37,31 +46,33 @@ def add_files(repo: DDWorktreeRepo, files: List[str], verbose: bool = False) ->
                     print("Adding all files in current directory...")
 
                 # Get tracked files including untracked ones
-                import os
-                for root, dirs, files_list in os.walk(current_dir):
+                for root, dirs, files_list in os.walk(current_dir_str):
                     if '.git' in dirs:
                         dirs.remove('.git')
 
+                    relative_root = os.path.relpath(root, current_dir_str)
                     for file in files_list:
-                        file_path = Path(root) / file
-                        relative_path = file_path.relative_to(current_dir)
+                        if relative_root == os.curdir:
+                            relative_path = file
+                        else:
+                            relative_path = os.path.join(relative_root, file)
 
                         # Check if file should be ignored
-                        patterns = get_combined_gitignore_patterns(current_dir)
-                        if not _is_ignored(file_path, patterns):
-                            staged_files.append(str(relative_path))
+                        if not is_ignored_by_pattern(os.path.join(root, file), ignore_regex):
+                            staged_files.append(relative_path)
                         else:
-                            skipped_files.append(str(relative_path))
+                            skipped_files.append(relative_path)
             else:
                 # Add specific file or pattern
-                file_path = Path(file_pattern)
-                if file_path.exists():
-                    relative_path = file_path.relative_to(current_dir)
-                    patterns = get_combined_gitignore_patterns(current_dir)
-                    if not _is_ignored(file_path, patterns):
-                        staged_files.append(str(relative_path))
+                file_path = os.path.normpath(os.path.join(current_dir_str, file_pattern))
+                if os.path.exists(file_path):
+                    relative_path = _relative_to_worktree(file_path, current_dir_str)
+                    if relative_path is None:
+                        print(f"Warning: File outside worktree: {file_pattern}")
+                    elif not is_ignored_by_pattern(Path(file_pattern), ignore_regex):
+                        staged_files.append(relative_path)
                     else:
-                        skipped_files.append(str(relative_path))
+                        skipped_files.append(relative_path)
                 else:
                     print(f"Warning: File not found: {file_pattern}")
 
@@ -70,6 +81,7 @@ def add_files(repo: DDWorktreeRepo, files: List[str], verbose: bool = False) ->
             import subprocess
             result = subprocess.run(
                 ['git', 'add'] + staged_files,
+                env=COMMAND_ENV,
                 cwd=current_dir,
                 capture_output=True,
                 text=True
@@ -98,30 +110,15 @@ def add_files(repo: DDWorktreeRepo, files: List[str], verbose: bool = False) ->
         return 1
 
 
-def _is_ignored(file_path: Path, patterns: set) -> bool:
-    """Check if a file should be ignored."""
-    file_name = file_path.name
-    relative_path = str(file_path)
-
-    for pattern in patterns:
-        if pattern.endswith('/'):
-            # Directory pattern
-            if file_path.parent.name == pattern.rstrip('/'):
-                return True
-        elif pattern.startswith('*.'):
-            # Extension pattern
-            if file_name.endswith(pattern[1:]):
-                return True
-        elif pattern.startswith('/'):
-            # Absolute path pattern
-            if relative_path.startswith(pattern[1:]):
-                return True
-        else:
-            # Simple pattern
-            if pattern in file_name or pattern in relative_path:
-                return True
 
-    return False
+def _relative_to_worktree(file_path: str, worktree_path: str) -> Optional[str]:
+    """Get a normalized absolute path relative to the worktree (None if outside it)."""
+    if file_path == worktree_path:
+        return os.curdir
+    prefix = os.path.join(worktree_path, '')
+    if not file_path.startswith(prefix):
+        return None
+    return file_path[len(prefix):]
 
 
 def main(args: List[str]) -> int:
@@ -10,6 +10,8 @@ from typing import List
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
 from ddworktree.utils.gitignore import get_git_status
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
 
 
 def cherry_pick_commit(
@@ -22,7 +24,7 @@ def cherry_pick_commit(
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -31,7 +33,7 @@ def cherry_pick_commit(
             print(f"Cherry-picking commit: {commit}")
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir, repo, is_local)
 
         # Verify the commit exists
         if not _commit_exists(repo.repo_path, commit):
@@ -91,30 +93,6 @@ def cherry_pick_commit(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
-
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
-
-    return None
-
-
 def _print_status_summary(status: dict) -> None:
     """Print a summary of git status."""
     if status['modified']:
@@ -131,6 +109,7 @@ def _commit_exists(repo_path: Path, commit: str) -> bool:
     """Check if a commit exists."""
     result = subprocess.run(
         ['git', 'cat-file', '-e', f'{commit}^{commit}'],
+        env=COMMAND_ENV,
         cwd=repo_path,
         capture_output=True
     )
@@ -141,6 +120,7 @@ def _get_commit_info(repo_path: Path, commit: str) -> str:
     """Get commit information."""
     result = subprocess.run(
         ['git', 'log', '--oneline', '-n', '1', commit],
+        env=COMMAND_ENV,
         cwd=repo_path,
         capture_output=True,
         text=True
@@ -159,6 +139,7 @@ def _cherry_pick_in_worktree(
     # Check if commit already exists in this worktree
     exists_check = subprocess.run(
         ['git', 'merge-base', '--is-ancestor', commit, 'HEAD'],
+        env=COMMAND_ENV,
         cwd=worktree_path,
         capture_output=True
     )
@@ -172,6 +153,7 @@ def _cherry_pick_in_worktree(
     args = ['git', 'cherry-pick', commit]
     result = subprocess.run(
         args,
+        env=COMMAND_ENV,
         cwd=worktree_path,
         capture_output=True,
         text=True
@@ -196,6 +178,7 @@ def _cherry_pick_in_worktree(
         if response in ['y', 'yes']:
             abort_result = subprocess.run(
                 ['git', 'cherry-pick', '--abort'],
+                env=COMMAND_ENV,
                 cwd=worktree_path,
                 capture_output=True,
                 text=True
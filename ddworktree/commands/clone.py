@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import List, Optional
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
+from ddworktree.utils.session import COMMAND_ENV
 
 
 def clone_with_worktrees(
@@ -57,6 +58,7 @@ def clone_with_worktrees(
 
         result = subprocess.run(
             clone_args,
+            env=COMMAND_ENV,
             capture_output=True,
             text=True
         )
@@ -84,6 +86,7 @@ def clone_with_worktrees(
                 # Get current commit hash
                 commit_result = subprocess.run(
                     ['git', 'rev-parse', 'HEAD'],
+                    env=COMMAND_ENV,
                     cwd=target_dir,
                     capture_output=True,
                     text=True
@@ -6,10 +6,12 @@ import argparse
 import sys
 import subprocess
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Dict, Any
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
 from ddworktree.utils.gitignore import get_git_status
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
 
 
 def commit_changes(
@@ -36,7 +38,7 @@ def commit_changes(
             return 0
 
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -52,7 +54,7 @@ def commit_changes(
 
         # If not split, try to commit in paired worktree
         if not split:
-            paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+            paired_worktree = get_paired_worktree(current_dir, repo, is_local)
             if paired_worktree and paired_worktree.exists():
                 if verbose:
                     print(f"Attempting to commit in paired worktree: {paired_worktree}")
@@ -73,30 +75,6 @@ def commit_changes(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Optional[Path]:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
-
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
-
-    return None
-
-
 def _commit_in_worktree(
     worktree_path: Path,
     message: str,
@@ -111,6 +89,7 @@ def _commit_in_worktree(
 
     result = subprocess.run(
         args,
+        env=COMMAND_ENV,
         cwd=worktree_path,
         capture_output=True,
         text=True
@@ -166,6 +145,7 @@ def _sync_and_commit_paired(
                 # Stage the file in target worktree
                 subprocess.run(
                     ['git', 'add', str(target_file)],
+                    env=COMMAND_ENV,
                     cwd=target_path,
                     capture_output=True
                 )
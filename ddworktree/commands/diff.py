@@ -3,6 +3,7 @@ Command for showing differences between worktrees in ddworktree.
 """
 
 import argparse
+import dataclasses
 import sys
 import subprocess
 from pathlib import Path
@@ -10,6 +11,8 @@ from typing import List
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
 from ddworktree.utils.diff import detect_drift, generate_diff_report
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
 
 
 def show_worktree_diff(
@@ -24,7 +27,7 @@ def show_worktree_diff(
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -32,7 +35,7 @@ def show_worktree_diff(
             print(f"Detected {worktree_type} worktree")
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir, repo, is_local)
 
         if not paired_worktree or not paired_worktree.exists():
             print("Error: No paired worktree found")
@@ -84,54 +87,15 @@ def show_worktree_diff(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
-
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
-
-    return None
-
-
 def _filter_drift_by_paths(drift, paths: List[str]):
     """Filter drift results to only include specified paths."""
-    from dataclasses import dataclass
-
-    @dataclass
-    class WorktreeDiff:
-        added_files: List[str]
-        deleted_files: List[str]
-        modified_files: List[str]
-        commit_drift: bool
-        main_commit: str
-        local_commit: str
-
-    filtered = WorktreeDiff(
-        added_files=[f for f in drift.added_files if any(p in f for p in paths)],
-        deleted_files=[f for f in drift.deleted_files if any(p in f for p in paths)],
-        modified_files=[f for f in drift.modified_files if any(p in f for p in paths)],
-        commit_drift=drift.commit_drift,
-        main_commit=drift.main_commit,
-        local_commit=drift.local_commit
+    return dataclasses.replace(
+        drift,
+        added_files=tuple(f for f in drift.added_files if any(p in f for p in paths)),
+        deleted_files=tuple(f for f in drift.deleted_files if any(p in f for p in paths)),
+        modified_files=tuple(f for f in drift.modified_files if any(p in f for p in paths))
     )
 
-    return filtered
-
 
 def _show_name_only_diff(drift) -> None:
     """Show only file names that differ."""
@@ -183,6 +147,7 @@ def _show_patch_diff(worktree1: Path, worktree2: Path, drift, verbose: bool) ->
             print(f"\n➕ Added: {file_path}")
             result = subprocess.run(
                 ['git', 'diff', '--no-index', '/dev/null', str(file2)],
+                env=COMMAND_ENV,
                 capture_output=True,
                 text=True
             )
@@ -195,6 +160,7 @@ def _show_patch_diff(worktree1: Path, worktree2: Path, drift, verbose: bool) ->
             print(f"\n➖ Deleted: {file_path}")
             result = subprocess.run(
                 ['git', 'diff', '--no-index', str(file1), '/dev/null'],
+                env=COMMAND_ENV,
                 capture_output=True,
                 text=True
             )
@@ -208,6 +174,7 @@ def _show_patch_diff(worktree1: Path, worktree2: Path, drift, verbose: bool) ->
             print(f"\n✏️  Modified: {file_path}")
             result = subprocess.run(
                 ['git', 'diff', '--no-index', str(file1), str(file2)],
+                env=COMMAND_ENV,
                 capture_output=True,
                 text=True
             )
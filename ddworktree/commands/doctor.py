@@ -10,6 +10,8 @@ from typing import List, Dict, Any
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
 from ddworktree.utils.diff import detect_drift
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_git_worktree
 
 
 def doctor_command(
@@ -115,6 +117,7 @@ def _check_repository_health(repo: DDWorktreeRepo, verbose: bool) -> List[str]:
     try:
         result = subprocess.run(
             ['git', 'rev-list', '--count', '--all'],
+            env=COMMAND_ENV,
             cwd=repo.repo_path,
             capture_output=True,
             text=True
@@ -184,8 +187,10 @@ def _check_worktree_health(repo: DDWorktreeRepo, verbose: bool) -> List[str]:
     pairs = repo.get_pairs()
 
     for pair_name, (main_path, local_path) in pairs.items():
-        main_exists = Path(main_path).exists()
-        local_exists = Path(local_path).exists()
+        main_p = Path(main_path)
+        local_p = Path(local_path)
+        main_exists = main_p.exists()
+        local_exists = local_p.exists()
 
         if not main_exists:
             issues.append(f"Pair '{pair_name}': main worktree missing: {main_path}")
@@ -194,10 +199,10 @@ def _check_worktree_health(repo: DDWorktreeRepo, verbose: bool) -> List[str]:
             issues.append(f"Pair '{pair_name}': local worktree missing: {local_path}")
 
         # Check if worktrees are valid Git worktrees
-        if main_exists and not _is_valid_worktree(Path(main_path)):
+        if main_exists and not is_git_worktree(main_p):
             issues.append(f"Pair '{pair_name}': main worktree is not valid: {main_path}")
 
-        if local_exists and not _is_valid_worktree(Path(local_path)):
+        if local_exists and not is_git_worktree(local_p):
             issues.append(f"Pair '{pair_name}': local worktree is not valid: {local_path}")
 
     return issues
@@ -210,12 +215,12 @@ def _check_pair_synchronization(repo: DDWorktreeRepo, verbose: bool) -> List[str
     pairs = repo.get_pairs()
 
     for pair_name, (main_path, local_path) in pairs.items():
-        main_exists = Path(main_path).exists()
-        local_exists = Path(local_path).exists()
+        main_p = Path(main_path)
+        local_p = Path(local_path)
 
-        if main_exists and local_exists:
+        if main_p.exists() and local_p.exists():
             try:
-                drift = detect_drift(Path(main_path), Path(local_path))
+                drift = detect_drift(main_p, local_p)
 
                 if drift.commit_drift:
                     issues.append(f"Pair '{pair_name}': commit drift detected")
@@ -230,27 +235,6 @@ def _check_pair_synchronization(repo: DDWorktreeRepo, verbose: bool) -> List[str
     return issues
 
 
-def _is_valid_worktree(path: Path) -> bool:
-    """Check if a path is a valid Git worktree."""
-    try:
-        git_file = path / '.git'
-        git_dir = path / '.git'
-
-        if git_file.exists():
-            with open(git_file, 'r') as f:
-                content = f.read().strip()
-                if content.startswith('gitdir: '):
-                    git_dir = Path(content[8:])
-                    return (git_dir / 'HEAD').exists()
-        elif git_dir.exists():
-            return (git_dir / 'HEAD').exists()
-
-        return False
-
-    except Exception:
-        return False
-
-
 def _attempt_fixes(repo: DDWorktreeRepo, issues: List[str], verbose: bool) -> List[str]:
     """Attempt to automatically fix issues."""
     fixes = []
@@ -9,6 +9,7 @@ from typing import List, Optional
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
 from ddworktree.utils.diff import detect_drift, generate_diff_report
+from ddworktree.utils.worktree import is_local_worktree
 
 
 def detect_drift_command(
@@ -21,7 +22,7 @@ def detect_drift_command(
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -71,12 +72,6 @@ def detect_drift_command(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
 def _get_worktrees_for_comparison(
     repo: DDWorktreeRepo,
     current_path: Path,
@@ -96,19 +91,17 @@ def _get_worktrees_for_comparison(
             return None, None
     else:
         # Auto-detect pair based on current worktree
-        current_name = current_path.name
-
-        for pair_name, (main_path, local_path) in pairs.items():
-            if is_local and current_path == Path(local_path):
-                return Path(main_path), Path(local_path)
-            elif not is_local and current_path == Path(main_path):
-                return Path(main_path), Path(local_path)
+        entry = repo.find_pair(current_path)
+        if entry and entry[1] == 'local' and is_local:
+            return entry[2], current_path
+        elif entry and entry[1] == 'main' and not is_local:
+            return current_path, entry[2]
 
         # If not found in pairs, try to infer from current path
         local_suffix = repo.get_local_suffix()
         if is_local:
             # Current is local, infer main
-            main_inferred = current_path.parent / current_path.name.replace(local_suffix, '')
+            main_inferred = current_path.parent / current_path.name[:-len(local_suffix)]
             if main_inferred.exists():
                 return main_inferred, current_path
         else:
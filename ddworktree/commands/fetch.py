@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import List
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
 
 
 def fetch_updates(
@@ -22,7 +24,7 @@ def fetch_updates(
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -42,6 +44,7 @@ def fetch_updates(
 
         result = subprocess.run(
             fetch_args,
+            env=COMMAND_ENV,
             cwd=repo.repo_path,
             capture_output=True,
             text=True
@@ -56,7 +59,7 @@ def fetch_updates(
             print(result.stdout)
 
         # Get paired worktree and verify its state
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir, repo, is_local)
         if paired_worktree and paired_worktree.exists():
             if verbose:
                 print(f"Verifying branch state in paired worktree: {paired_worktree}")
@@ -64,6 +67,7 @@ def fetch_updates(
             # Get current branch in paired worktree
             paired_result = subprocess.run(
                 ['git', 'branch', '--show-current'],
+                env=COMMAND_ENV,
                 cwd=paired_worktree,
                 capture_output=True,
                 text=True
@@ -78,6 +82,7 @@ def fetch_updates(
                     # Verify remote tracking for this branch
                     remote_result = subprocess.run(
                         ['git', 'rev-parse', '--abbrev-ref', f'{paired_branch}@{{upstream}}'],
+                        env=COMMAND_ENV,
                         cwd=paired_worktree,
                         capture_output=True,
                         text=True
@@ -97,30 +102,6 @@ def fetch_updates(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
-
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
-
-    return None
-
-
 def main(args: List[str]) -> int:
     """Main entry point for fetch command."""
     parser = argparse.ArgumentParser(
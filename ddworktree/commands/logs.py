@@ -9,6 +9,9 @@ from pathlib import Path
 from typing import List, Optional
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
+from ddworktree.utils.iostat import probe_paths
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
 
 
 def show_logs(
@@ -23,7 +26,7 @@ def show_logs(
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -31,7 +34,7 @@ def show_logs(
             print(f"Detected {worktree_type} worktree")
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir, repo, is_local)
 
         # Build log command
         log_args = ['git', 'log']
@@ -51,6 +54,7 @@ def show_logs(
 
         result = subprocess.run(
             log_args,
+            env=COMMAND_ENV,
             cwd=current_dir,
             capture_output=True,
             text=True
@@ -69,6 +73,7 @@ def show_logs(
 
             paired_result = subprocess.run(
                 log_args,
+                env=COMMAND_ENV,
                 cwd=paired_worktree,
                 capture_output=True,
                 text=True
@@ -95,42 +100,20 @@ def show_logs(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
-
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
-
-    return None
-
-
 def _show_commit_comparison(worktree1: Path, worktree2: Path, verbose: bool) -> None:
     """Show a comparison of commits between worktrees."""
     try:
         # Get commit hashes for both worktrees
         result1 = subprocess.run(
             ['git', 'rev-list', '--all'],
+            env=COMMAND_ENV,
             cwd=worktree1,
             capture_output=True,
             text=True
         )
         result2 = subprocess.run(
             ['git', 'rev-list', '--all'],
+            env=COMMAND_ENV,
             cwd=worktree2,
             capture_output=True,
             text=True
@@ -169,9 +152,11 @@ def _show_repository_summary(repo: DDWorktreeRepo, current_dir: Path, paired_wor
     pairs = repo.get_pairs()
     if pairs:
         print(f"  Configured pairs ({len(pairs)}):")
+        # Check every configured path in one batch
+        exists = probe_paths(path for paths in pairs.values() for path in paths)
         for pair_name, (main_path, local_path) in pairs.items():
-            main_exists = "✅" if Path(main_path).exists() else "❌"
-            local_exists = "✅" if Path(local_path).exists() else "❌"
+            main_exists = "✅" if exists[main_path] else "❌"
+            local_exists = "✅" if exists[local_path] else "❌"
             print(f"    {pair_name}: {main_exists} {local_exists}")
     else:
         print("  No configured pairs")
@@ -180,6 +165,7 @@ def _show_repository_summary(repo: DDWorktreeRepo, current_dir: Path, paired_wor
     try:
         branch_result = subprocess.run(
             ['git', 'branch', '--show-current'],
+            env=COMMAND_ENV,
             cwd=current_dir,
             capture_output=True,
             text=True
@@ -196,6 +182,7 @@ def _show_repository_summary(repo: DDWorktreeRepo, current_dir: Path, paired_wor
             if worktree_path and worktree_path.exists():
                 count_result = subprocess.run(
                     ['git', 'rev-list', '--count', '--all'],
+                    env=COMMAND_ENV,
                     cwd=worktree_path,
                     capture_output=True,
                     text=True
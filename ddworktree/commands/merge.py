@@ -10,6 +10,8 @@ from typing import List
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
 from ddworktree.utils.gitignore import get_git_status
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_dirty, is_local_worktree, get_paired_worktree
 
 
 def merge_branch(
@@ -22,7 +24,7 @@ def merge_branch(
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -31,13 +33,12 @@ def merge_branch(
             print(f"Merging branch: {branch}")
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir, repo, is_local)
 
         # Check for uncommitted changes before merge
-        current_status = get_git_status(current_dir)
-        if any(current_status.values()):
+        if is_dirty(current_dir):
             print("Warning: You have uncommitted changes in current worktree:")
-            _print_status_summary(current_status)
+            _print_status_summary(get_git_status(current_dir))
             response = input("Continue with merge? (y/N): ").strip().lower()
             if response not in ['y', 'yes']:
                 print("Merge cancelled")
@@ -57,10 +58,9 @@ def merge_branch(
                 print(f"Merging in paired worktree: {paired_worktree}")
 
             # Check paired worktree status
-            paired_status = get_git_status(paired_worktree)
-            if any(paired_status.values()):
+            if is_dirty(paired_worktree):
                 print("Warning: Paired worktree has uncommitted changes:")
-                _print_status_summary(paired_status)
+                _print_status_summary(get_git_status(paired_worktree))
                 response = input("Continue with merge in paired worktree? (y/N): ").strip().lower()
                 if response not in ['y', 'yes']:
                     print("Merge in paired worktree cancelled")
@@ -81,30 +81,6 @@ def merge_branch(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
-
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
-
-    return None
-
-
 def _print_status_summary(status: dict) -> None:
     """Print a summary of git status."""
     if status['modified']:
@@ -125,16 +101,16 @@ def _merge_in_worktree(
     """Merge a branch in a specific worktree."""
     # First, check if the branch exists
     branch_check = subprocess.run(
-        ['git', 'show-ref', '--verify', '--quiet', f'refs/heads/{branch}'],
-        cwd=worktree_path,
+        ['git', '--no-pager', '-C', str(worktree_path), 'show-ref', '--verify', '--quiet', f'refs/heads/{branch}'],
+        env=COMMAND_ENV,
         capture_output=True
     )
 
     if branch_check.returncode != 0:
         # Check if it's a remote branch
         remote_check = subprocess.run(
-            ['git', 'show-ref', '--verify', '--quiet', f'refs/remotes/origin/{branch}'],
-            cwd=worktree_path,
+            ['git', '--no-pager', '-C', str(worktree_path), 'show-ref', '--verify', '--quiet', f'refs/remotes/origin/{branch}'],
+            env=COMMAND_ENV,
             capture_output=True
         )
 
@@ -146,10 +122,10 @@ def _merge_in_worktree(
             print(f"Using remote branch 'origin/{branch}'")
 
     # Perform the merge
-    args = ['git', 'merge', branch]
+    args = ['git', '--no-pager', '-C', str(worktree_path), 'merge', branch]
     result = subprocess.run(
         args,
-        cwd=worktree_path,
+        env=COMMAND_ENV,
         capture_output=True,
         text=True
     )
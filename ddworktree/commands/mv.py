@@ -3,13 +3,16 @@ Command for moving/renaming files in ddworktree.
 """
 
 import argparse
+import os
 import sys
 import subprocess
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
 from ddworktree.utils.gitignore import get_combined_gitignore_patterns
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
 
 
 def move_files(
@@ -31,7 +34,7 @@ def move_files(
             return 1
 
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -39,11 +42,12 @@ def move_files(
             print(f"Detected {worktree_type} worktree")
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir, repo, is_local)
 
         # Move in current worktree
+        current_prefix = _worktree_prefix(current_dir)
         move_result = _move_in_worktree(
-            current_dir, source_path, destination_path, verbose
+            current_dir, source_path, destination_path, verbose, current_prefix
         )
 
         if move_result != 0:
@@ -55,8 +59,8 @@ def move_files(
                 print(f"Moving in paired worktree: {paired_worktree}")
 
             # Calculate corresponding paths in paired worktree
-            relative_source = source_path.relative_to(current_dir)
-            relative_dest = destination_path.relative_to(current_dir)
+            relative_source = _strip_worktree_prefix(source_path, current_prefix)
+            relative_dest = _strip_worktree_prefix(destination_path, current_prefix)
 
             paired_source = paired_worktree / relative_source
             paired_dest = paired_worktree / relative_dest
@@ -78,48 +82,41 @@ def move_files(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
+def _worktree_prefix(worktree_path: Path) -> str:
+    """Get the string prefix shared by every path inside a worktree."""
+    return str(worktree_path).rstrip(os.sep) + os.sep
 
 
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
-
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
-
-    return None
+def _strip_worktree_prefix(path: Path, worktree_prefix: str) -> str:
+    """Get a path relative to the worktree whose prefix is given."""
+    path_str = str(path)
+    if not path_str.startswith(worktree_prefix):
+        raise ValueError(f"{path_str} is not inside {worktree_prefix.rstrip(os.sep)}")
+    return path_str[len(worktree_prefix):]
 
 
 def _move_in_worktree(
     worktree_path: Path,
     source_path: Path,
     destination_path: Path,
-    verbose: bool = False
+    verbose: bool = False,
+    worktree_prefix: Optional[str] = None
 ) -> int:
     """Move a file within a specific worktree."""
     try:
-        relative_source = source_path.relative_to(worktree_path)
-        relative_dest = destination_path.relative_to(worktree_path)
+        if worktree_prefix is None:
+            worktree_prefix = _worktree_prefix(worktree_path)
+        relative_source = _strip_worktree_prefix(source_path, worktree_prefix)
+        relative_dest = _strip_worktree_prefix(destination_path, worktree_prefix)
 
         # Create destination directory if it doesn't exist
         destination_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Use git mv for tracked files
         result = subprocess.run(
-            ['git', 'mv', str(relative_source), str(relative_dest)],
+            ['git', 'mv', relative_source, relative_dest],
             cwd=worktree_path,
+            env=COMMAND_ENV,
             capture_output=True,
             text=True
         )
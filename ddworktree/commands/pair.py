@@ -3,11 +3,13 @@ Command for manually linking worktrees in ddworktree.
 """
 
 import argparse
+import re
 import sys
 from pathlib import Path
 from typing import List
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
+from ddworktree.utils.worktree import is_git_worktree
 
 
 def pair_worktrees(
@@ -38,11 +40,11 @@ def pair_worktrees(
             return 1
 
         # Validate both are valid Git worktrees
-        if not _is_valid_worktree(pathA):
+        if not is_git_worktree(pathA):
             print(f"Error: Path A is not a valid Git worktree: {pathA}")
             return 1
 
-        if not _is_valid_worktree(pathB):
+        if not is_git_worktree(pathB):
             print(f"Error: Path B is not a valid Git worktree: {pathB}")
             return 1
 
@@ -50,11 +52,9 @@ def pair_worktrees(
         existing_pairs = repo.get_pairs()
         pair_name = None
 
-        for name, (main, local) in existing_pairs.items():
-            if (Path(main) == pathA and Path(local) == pathB) or \
-               (Path(main) == pathB and Path(local) == pathA):
-                pair_name = name
-                break
+        entry = repo.find_pair(pathA)
+        if entry and entry[2] == pathB:
+            pair_name = entry[0]
 
         if pair_name and not force:
             print(f"Worktrees are already paired as '{pair_name}'")
@@ -63,9 +63,9 @@ def pair_worktrees(
 
         # Determine which is main and which is local
         local_suffix = repo.get_local_suffix()
-        if local_suffix in pathB.name:
+        if pathB.name.endswith(local_suffix):
             main_path, local_path = str(pathA), str(pathB)
-        elif local_suffix in pathA.name:
+        elif pathA.name.endswith(local_suffix):
             main_path, local_path = str(pathB), str(pathA)
         else:
             # Neither has local suffix, ask user
@@ -104,30 +104,6 @@ def pair_worktrees(
         return 1
 
 
-def _is_valid_worktree(path: Path) -> bool:
-    """Check if a path is a valid Git worktree."""
-    try:
-        # Check if it has a .git file (worktree) or .git directory (regular repo)
-        git_file = path / '.git'
-        git_dir = path / '.git'
-
-        if git_file.exists():
-            # It's a worktree - check if the gitdir points to a valid repo
-            with open(git_file, 'r') as f:
-                content = f.read().strip()
-                if content.startswith('gitdir: '):
-                    git_dir = Path(content[8:])
-                    return (git_dir / 'HEAD').exists()
-        elif git_dir.exists():
-            # It's a regular repo - check if it has HEAD
-            return (git_dir / 'HEAD').exists()
-
-        return False
-
-    except Exception:
-        return False
-
-
 def _generate_pair_name(main_path: str, local_path: str, existing_pairs: dict) -> str:
     """Generate a unique pair name."""
     # Extract directory names
@@ -145,10 +121,14 @@ def _generate_pair_name(main_path: str, local_path: str, existing_pairs: dict) -
     if base_name not in existing_pairs:
         return base_name
 
-    # If already exists, add a number
-    counter = 2
-    while f"{base_name}{counter}" in existing_pairs:
-        counter += 1
+    # If already exists, add one past the highest number already in use
+    pattern = re.compile(re.escape(base_name) + r'(\d*)$')
+    numbers = [
+        int(match.group(1) or '1')
+        for match in map(pattern.match, existing_pairs)
+        if match
+    ]
+    counter = max(numbers) + 1 if numbers else 2
 
     return f"{base_name}{counter}"
 
@@ -5,11 +5,14 @@ Command for pulling updates in ddworktree.
 import argparse
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
 from ddworktree.utils.gitignore import get_git_status
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_dirty, is_local_worktree, get_paired_worktree
 
 
 def pull_updates(
@@ -23,7 +26,7 @@ def pull_updates(
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -31,13 +34,12 @@ def pull_updates(
             print(f"Detected {worktree_type} worktree")
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir, repo, is_local)
 
         # Check for uncommitted changes before pull
-        current_status = get_git_status(current_dir)
-        if any(current_status.values()):
+        if is_dirty(current_dir):
             print("Warning: You have uncommitted changes:")
-            _print_status_summary(current_status)
+            _print_status_summary(get_git_status(current_dir))
             response = input("Continue with pull? (y/N): ").strip().lower()
             if response not in ['y', 'yes']:
                 print("Pull cancelled")
@@ -57,10 +59,9 @@ def pull_updates(
                 print(f"Pulling in paired worktree: {paired_worktree}")
 
             # Check paired worktree status
-            paired_status = get_git_status(paired_worktree)
-            if any(paired_status.values()):
+            if is_dirty(paired_worktree):
                 print("Warning: Paired worktree has uncommitted changes:")
-                _print_status_summary(paired_status)
+                _print_status_summary(get_git_status(paired_worktree))
                 response = input("Continue with pull in paired worktree? (y/N): ").strip().lower()
                 if response not in ['y', 'yes']:
                     print("Pull in paired worktree cancelled")
@@ -81,28 +82,52 @@ def pull_updates(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
+def pull_all_pairs(
+    repo: DDWorktreeRepo,
+    remote: Optional[str] = None,
+    branch: Optional[str] = None,
+    jobs: Optional[int] = None,
+    verbose: bool = False
+) -> int:
+    """Pull updates in every worktree of every configured pair in parallel."""
+    try:
+        worktrees = []
+        for main_path, local_path in repo.get_pairs().values():
+            for worktree in (repo.resolve_pair_path(main_path), repo.resolve_pair_path(local_path)):
+                if worktree.exists():
+                    worktrees.append(worktree)
+                elif verbose:
+                    print(f"Skipping missing worktree: {worktree}")
+
+        if not worktrees:
+            print("No paired worktrees found")
+            return 0
+
+        max_workers = jobs or min(8, len(worktrees))
+        if verbose:
+            print(f"Pulling {len(worktrees)} worktrees with {max_workers} jobs")
 
+        # Each pull is dominated by git's network and disk I/O, so threads scale
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda worktree: _pull_in_worktree(worktree, remote, branch, verbose),
+                worktrees
+            ))
 
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
+        failed = [worktree for worktree, result in zip(worktrees, results) if result != 0]
+        print(f"Pulled updates in {len(worktrees) - len(failed)} of {len(worktrees)} worktrees")
 
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
+        if failed:
+            print("Failed worktrees:")
+            for worktree in failed:
+                print(f"  {worktree}")
+            return 1
 
-    return None
+        return 0
+
+    except Exception as e:
+        print(f"Error pulling updates: {e}")
+        return 1
 
 
 def _print_status_summary(status: dict) -> None:
@@ -124,7 +149,7 @@ def _pull_in_worktree(
     verbose: bool = False
 ) -> int:
     """Pull updates in a specific worktree."""
-    args = ['git', 'pull']
+    args = ['git', '--no-pager', '-C', str(worktree_path), 'pull']
 
     if remote:
         args.append(remote)
@@ -133,7 +158,7 @@ def _pull_in_worktree(
 
     result = subprocess.run(
         args,
-        cwd=worktree_path,
+        env=COMMAND_ENV,
         capture_output=True,
         text=True
     )
@@ -167,6 +192,17 @@ def main(args: List[str]) -> int:
         nargs='?',
         help='Branch to pull'
     )
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Pull in every worktree of every configured pair'
+    )
+    parser.add_argument(
+        '--jobs',
+        '-j',
+        type=int,
+        help='Number of parallel jobs for --all (default: up to 8)'
+    )
     parser.add_argument(
         '--verbose',
         '-v',
@@ -176,8 +212,20 @@ def main(args: List[str]) -> int:
 
     parsed_args = parser.parse_args(args)
 
+    if parsed_args.jobs is not None and parsed_args.jobs < 1:
+        print("Error: --jobs must be at least 1", file=sys.stderr)
+        return 1
+
     try:
         repo = DDWorktreeRepo()
+        if parsed_args.all:
+            return pull_all_pairs(
+                repo,
+                parsed_args.remote,
+                parsed_args.branch,
+                parsed_args.jobs,
+                parsed_args.verbose
+            )
         return pull_updates(repo, parsed_args.remote, parsed_args.branch, parsed_args.verbose)
     except DDWorktreeError as e:
         print(f"Error: {e}", file=sys.stderr)
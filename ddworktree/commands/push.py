@@ -5,10 +5,13 @@ Command for pushing commits in ddworktree.
 import argparse
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
 
 
 def push_commits(
@@ -21,7 +24,7 @@ def push_commits(
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -33,7 +36,7 @@ def push_commits(
         push_local = push_local_config == 'true' or include_local
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir, repo, is_local)
 
         # Push from main worktree
         if not is_local:
@@ -61,46 +64,78 @@ def push_commits(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
+def push_all_pairs(
     repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
+    include_local: bool = False,
+    jobs: Optional[int] = None,
+    verbose: bool = False
+) -> int:
+    """Push commits from every configured pair in parallel."""
+    try:
+        # Check configuration for push_local
+        push_local_config = repo.get_option('push_local', 'false')
+        push_local = push_local_config == 'true' or include_local
 
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
+        worktrees = []
+        for main_path, local_path in repo.get_pairs().values():
+            candidates = [repo.resolve_pair_path(main_path)]
+            if push_local:
+                candidates.append(repo.resolve_pair_path(local_path))
+            for worktree in candidates:
+                if worktree.exists():
+                    worktrees.append(worktree)
+                elif verbose:
+                    print(f"Skipping missing worktree: {worktree}")
+
+        if not worktrees:
+            print("No paired worktrees found")
+            return 0
+
+        max_workers = jobs or min(8, len(worktrees))
+        if verbose:
+            print(f"Pushing {len(worktrees)} worktrees with {max_workers} jobs")
+
+        # Each push is dominated by git's network I/O, so threads scale
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda worktree: _push_from_worktree(worktree, verbose),
+                worktrees
+            ))
+
+        failed = [worktree for worktree, result in zip(worktrees, results) if result != 0]
+        print(f"Pushed commits from {len(worktrees) - len(failed)} of {len(worktrees)} worktrees")
+
+        if failed:
+            print("Failed worktrees:")
+            for worktree in failed:
+                print(f"  {worktree}")
+            return 1
 
-    return None
+        return 0
+
+    except Exception as e:
+        print(f"Error pushing commits: {e}")
+        return 1
 
 
 def _push_from_worktree(worktree_path: Path, verbose: bool = False) -> int:
     """Push commits from a specific worktree."""
-    # Get current branch
+    # Get current branch and its upstream in one call; rev-parse still prints
+    # the branch name before failing when no upstream is configured
     branch_result = subprocess.run(
-        ['git', 'branch', '--show-current'],
-        cwd=worktree_path,
+        ['git', '--no-pager', '-C', str(worktree_path), 'rev-parse', '--abbrev-ref', 'HEAD', '@{upstream}'],
+        env=COMMAND_ENV,
         capture_output=True,
         text=True
     )
 
-    if branch_result.returncode != 0:
+    branch_lines = branch_result.stdout.split()
+    if not branch_lines:
         print(f"Error getting current branch in {worktree_path}")
         return 1
 
-    current_branch = branch_result.stdout.strip()
-    if not current_branch:
+    current_branch = branch_lines[0]
+    if current_branch == 'HEAD':
         print(f"No current branch in {worktree_path}")
         return 1
 
@@ -108,21 +143,14 @@ def _push_from_worktree(worktree_path: Path, verbose: bool = False) -> int:
         print(f"Pushing branch '{current_branch}' from {worktree_path.name}")
 
     # Check if branch has upstream tracking
-    remote_result = subprocess.run(
-        ['git', 'rev-parse', '--abbrev-ref', f'{current_branch}@{{upstream}}'],
-        cwd=worktree_path,
-        capture_output=True,
-        text=True
-    )
-
-    if remote_result.returncode != 0:
+    if branch_result.returncode != 0:
         print(f"Branch '{current_branch}' has no upstream tracking branch")
         print("Setting upstream tracking...")
 
         # Try to set upstream tracking
         upstream_result = subprocess.run(
-            ['git', 'push', '-u', 'origin', current_branch],
-            cwd=worktree_path,
+            ['git', '--no-pager', '-C', str(worktree_path), 'push', '-u', 'origin', current_branch],
+            env=COMMAND_ENV,
             capture_output=True,
             text=True
         )
@@ -136,8 +164,8 @@ def _push_from_worktree(worktree_path: Path, verbose: bool = False) -> int:
     else:
         # Normal push
         push_result = subprocess.run(
-            ['git', 'push'],
-            cwd=worktree_path,
+            ['git', '--no-pager', '-C', str(worktree_path), 'push'],
+            env=COMMAND_ENV,
             capture_output=True,
             text=True
         )
@@ -164,6 +192,17 @@ def main(args: List[str]) -> int:
         action='store_true',
         help='Include local commits in push'
     )
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Push from every configured pair'
+    )
+    parser.add_argument(
+        '--jobs',
+        '-j',
+        type=int,
+        help='Number of parallel jobs for --all (default: up to 8)'
+    )
     parser.add_argument(
         '--verbose',
         '-v',
@@ -173,8 +212,19 @@ def main(args: List[str]) -> int:
 
     parsed_args = parser.parse_args(args)
 
+    if parsed_args.jobs is not None and parsed_args.jobs < 1:
+        print("Error: --jobs must be at least 1", file=sys.stderr)
+        return 1
+
     try:
         repo = DDWorktreeRepo()
+        if parsed_args.all:
+            return push_all_pairs(
+                repo,
+                parsed_args.include_local,
+                parsed_args.jobs,
+                parsed_args.verbose
+            )
         return push_commits(repo, parsed_args.include_local, parsed_args.verbose)
     except DDWorktreeError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -3,26 +3,41 @@ Command for rebasing worktrees in ddworktree.
 """
 
 import argparse
+import os
 import sys
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import IO, List, Optional, Tuple
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
-from ddworktree.utils.gitignore import get_git_status
+from ddworktree.utils.gitignore import get_git_status_many
+from ddworktree.utils.session import COMMAND_ENV, PLUMBING_ENV, get_session
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
+
+# How much of each rebase output stream is kept for conflict detection
+_OUTPUT_TAIL_SIZE = 64 * 1024
+
+# Serializes forwarded lines so output from parallel rebases doesn't interleave
+_output_lock = threading.Lock()
 
 
 def rebase_worktrees(
     repo: DDWorktreeRepo,
     branch: str,
-    verbose: bool = False
+    verbose: bool = False,
+    sequential: bool = False,
+    yes: bool = False
 ) -> int:
     """Rebase both paired trees on a branch."""
-    current_dir = Path.cwd()
+    current_dir_str = os.path.realpath(os.getcwd())
+    current_dir = Path(current_dir_str)
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir_str, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -31,10 +46,19 @@ def rebase_worktrees(
             print(f"Rebasing onto branch: {branch}")
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir_str, repo, is_local)
+
+        rebase_paired = bool(paired_worktree and paired_worktree.exists())
+
+        # Check for uncommitted changes in both trees before any rebase starts;
+        # with --yes the answer is already known, so skip the status scan
+        statuses = {}
+        if not yes:
+            statuses = get_git_status_many(
+                [current_dir, paired_worktree] if rebase_paired else [current_dir]
+            )
 
-        # Check for uncommitted changes before rebase
-        current_status = get_git_status(current_dir)
+        current_status = statuses.get(current_dir, {})
         if any(current_status.values()):
             print("Warning: You have uncommitted changes in current worktree:")
             _print_status_summary(current_status)
@@ -43,35 +67,31 @@ def rebase_worktrees(
                 print("Rebase cancelled")
                 return 0
 
-        # Rebase current worktree
-        rebase_result = _rebase_worktree(
-            current_dir, branch, verbose
-        )
-
-        if rebase_result != 0:
-            return rebase_result
-
-        # Rebase paired worktree if it exists
-        if paired_worktree and paired_worktree.exists():
-            if verbose:
-                print(f"Rebasing paired worktree: {paired_worktree}")
-
-            # Check paired worktree status
-            paired_status = get_git_status(paired_worktree)
+        if rebase_paired and not yes:
+            paired_status = statuses[paired_worktree]
             if any(paired_status.values()):
                 print("Warning: Paired worktree has uncommitted changes:")
                 _print_status_summary(paired_status)
                 response = input("Continue with rebase in paired worktree? (y/N): ").strip().lower()
                 if response not in ['y', 'yes']:
                     print("Rebase in paired worktree cancelled")
-                    return 0
-
-            paired_result = _rebase_worktree(
-                paired_worktree, branch, verbose
-            )
+                    rebase_paired = False
 
-            if paired_result != 0:
-                return paired_result
+        worktrees = [current_dir]
+        if rebase_paired:
+            if verbose:
+                print(f"Rebasing paired worktree: {paired_worktree}")
+            worktrees.append(paired_worktree)
+
+        if sequential or len(worktrees) == 1:
+            for worktree in worktrees:
+                rebase_result = _rebase_worktree(worktree, branch, verbose, yes)
+                if rebase_result != 0:
+                    return rebase_result
+        else:
+            rebase_result = _rebase_worktrees_parallel(worktrees, branch, verbose, yes)
+            if rebase_result != 0:
+                return rebase_result
 
         print(f"Successfully rebased onto branch '{branch}'")
         return 0
@@ -81,28 +101,73 @@ def rebase_worktrees(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
+def rebase_all_pairs(
     repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
+    branch: str,
+    jobs: Optional[int] = None,
+    verbose: bool = False,
+    yes: bool = False
+) -> int:
+    """Rebase every worktree of every configured pair onto a branch in parallel."""
+    try:
+        worktrees = []
+        pair_names = {}
+        for pair_name, (main_path, local_path) in repo.get_pairs().items():
+            for worktree in (repo.resolve_pair_path(main_path), repo.resolve_pair_path(local_path)):
+                if worktree.exists():
+                    worktrees.append(worktree)
+                    pair_names[worktree] = pair_name
+                elif verbose:
+                    print(f"Skipping missing worktree: {worktree}")
+
+        if not worktrees:
+            print("No paired worktrees found")
+            return 0
+
+        # Check every tree before starting, so a bad target fails fast
+        failed = []
+        prepared = []
+        for worktree in worktrees:
+            current_commit_hash = _prepare_rebase(worktree, branch, verbose)
+            if current_commit_hash is None:
+                failed.append(worktree)
+            else:
+                prepared.append((worktree, current_commit_hash))
 
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
+        if prepared:
+            max_workers = jobs or min(8, len(prepared))
+            if verbose:
+                print(f"Rebasing {len(prepared)} worktrees with {max_workers} jobs")
+
+            def run_rebase(worktree: Path) -> Tuple[int, str, str]:
+                process = _start_rebase(worktree, branch)
+                stdout, stderr = _stream_rebases([worktree], [process], labeled=True)[0]
+                return process.returncode, stdout, stderr
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                outputs = list(executor.map(run_rebase, [worktree for worktree, _ in prepared]))
+
+            # Report (and prompt) one tree at a time once all rebases have finished
+            for (worktree, current_commit_hash), (returncode, stdout, stderr) in zip(prepared, outputs):
+                if _finish_rebase(
+                    worktree, branch, current_commit_hash,
+                    returncode, stdout, stderr, verbose, yes
+                ) != 0:
+                    failed.append(worktree)
+
+        print(f"Rebased {len(worktrees) - len(failed)} of {len(worktrees)} worktrees onto '{branch}'")
+
+        if failed:
+            print("Failed worktrees:")
+            for worktree in failed:
+                print(f"  {pair_names[worktree]}: {worktree}")
+            return 1
 
-    return None
+        return 0
+
+    except Exception as e:
+        print(f"Error rebasing worktrees: {e}")
+        return 1
 
 
 def _print_status_summary(status: dict) -> None:
@@ -117,64 +182,87 @@ def _print_status_summary(status: dict) -> None:
         print(f"  Untracked: {len(status['untracked'])} files")
 
 
-def _rebase_worktree(
+def _prepare_rebase(
     worktree_path: Path,
     branch: str,
     verbose: bool = False
-) -> int:
-    """Rebase a specific worktree onto a branch."""
-    # Check if the target branch exists
-    branch_check = subprocess.run(
-        ['git', 'show-ref', '--verify', '--quiet', f'refs/heads/{branch}'],
+) -> Optional[str]:
+    """Check the rebase target and return the commit to roll back to."""
+    # Look up the local and remote-tracking refs for the target in one call
+    local_ref = f'refs/heads/{branch}'
+    remote_ref = f'refs/remotes/origin/{branch}'
+    ref_args = ['git', 'for-each-ref', '--format=%(refname)', local_ref, remote_ref]
+    ref_check = subprocess.run(
+        ref_args,
         cwd=worktree_path,
-        capture_output=True
+        env=PLUMBING_ENV,
+        capture_output=True,
+        text=True
     )
-
-    if branch_check.returncode != 0:
-        # Check if it's a remote branch
-        remote_check = subprocess.run(
-            ['git', 'show-ref', '--verify', '--quiet', f'refs/remotes/origin/{branch}'],
+    if ref_check.returncode != 0:
+        # The repository may only be readable with the user's config
+        ref_check = subprocess.run(
+            ref_args,
+            env=COMMAND_ENV,
             cwd=worktree_path,
-            capture_output=True
+            capture_output=True,
+            text=True
         )
+    # Patterns also match refs nested under the name, so compare exactly
+    existing_refs = set(ref_check.stdout.splitlines())
 
-        if remote_check.returncode != 0:
+    if local_ref not in existing_refs:
+        # Check if it's a remote branch
+        if remote_ref not in existing_refs:
             print(f"Error: Target branch '{branch}' not found")
-            return 1
+            return None
 
         if verbose:
             print(f"Using remote branch 'origin/{branch}' as rebase target")
 
     # Store current commit for potential rollback
-    current_commit = subprocess.run(
-        ['git', 'rev-parse', 'HEAD'],
-        cwd=worktree_path,
-        capture_output=True,
-        text=True
-    )
-
-    if current_commit.returncode != 0:
+    current_commit_hash = get_session(worktree_path).rev_parse('HEAD')
+    if current_commit_hash is None:
         print(f"Error getting current commit in {worktree_path}")
-        return 1
+        return None
 
-    current_commit_hash = current_commit.stdout.strip()
     if verbose:
         print(f"Current commit: {current_commit_hash[:8]}")
 
-    # Perform the rebase
-    args = ['git', 'rebase', branch]
-    result = subprocess.run(
-        args,
+    return current_commit_hash
+
+
+def _start_rebase(worktree_path: Path, branch: str) -> subprocess.Popen:
+    """Start a rebase in a worktree without waiting for it to finish."""
+    return subprocess.Popen(
+        ['git', 'rebase', branch],
+        env=COMMAND_ENV,
         cwd=worktree_path,
-        capture_output=True,
-        text=True
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace'
     )
 
-    if result.returncode != 0:
-        print(f"Error rebasing {worktree_path} onto '{branch}': {result.stderr}")
+
+def _finish_rebase(
+    worktree_path: Path,
+    branch: str,
+    current_commit_hash: str,
+    returncode: int,
+    stdout: str,
+    stderr: str,
+    verbose: bool = False,
+    yes: bool = False
+) -> int:
+    """Report the outcome of a finished rebase, offering rollback on failure."""
+    if returncode != 0:
+        # The git output itself has already been streamed to the terminal
+        print(f"Error rebasing {worktree_path} onto '{branch}'")
 
         # Check if it's a rebase conflict
-        if "CONFLICT" in result.stderr or "merge failed" in result.stderr:
+        output = stdout + stderr
+        if "CONFLICT" in output or "merge failed" in output:
             print("Rebase conflict detected!")
             print("Please resolve conflicts manually:")
             print(f"  1. Work in: {worktree_path}")
@@ -185,10 +273,11 @@ def _rebase_worktree(
 
         # Offer to abort and rollback
         print("Rebase failed. Would you like to abort and rollback?")
-        response = input("Abort rebase? (y/N): ").strip().lower()
+        response = 'y' if yes else input("Abort rebase? (y/N): ").strip().lower()
         if response in ['y', 'yes']:
             abort_result = subprocess.run(
                 ['git', 'rebase', '--abort'],
+                env=COMMAND_ENV,
                 cwd=worktree_path,
                 capture_output=True,
                 text=True
@@ -201,13 +290,114 @@ def _rebase_worktree(
 
     if verbose:
         print(f"Successfully rebased {worktree_path} onto '{branch}'")
-        if result.stdout:
-            print("Rebase output:")
-            print(result.stdout)
 
     return 0
 
 
+def _rebase_worktree(
+    worktree_path: Path,
+    branch: str,
+    verbose: bool = False,
+    yes: bool = False
+) -> int:
+    """Rebase a specific worktree onto a branch."""
+    current_commit_hash = _prepare_rebase(worktree_path, branch, verbose)
+    if current_commit_hash is None:
+        return 1
+
+    process = _start_rebase(worktree_path, branch)
+    stdout, stderr = _stream_rebases([worktree_path], [process])[0]
+
+    return _finish_rebase(
+        worktree_path, branch, current_commit_hash,
+        process.returncode, stdout, stderr, verbose, yes
+    )
+
+
+def _forward_output(pipe: IO[str], stream: IO[str], prefix: str) -> str:
+    """Copy a process pipe to a stream line by line, returning the last 64 KB."""
+    tail = deque()
+    tail_size = 0
+
+    with pipe:
+        try:
+            for line in pipe:
+                with _output_lock:
+                    stream.write(prefix + line)
+                    stream.flush()
+
+                tail.append(line)
+                tail_size += len(line)
+                while tail_size > _OUTPUT_TAIL_SIZE and len(tail) > 1:
+                    tail_size -= len(tail.popleft())
+        except UnicodeDecodeError:
+            # Keep draining the raw pipe so the process never blocks on it
+            for _ in pipe.buffer:
+                pass
+
+    return ''.join(tail)
+
+
+def _stream_rebases(
+    worktrees: List[Path],
+    processes: List[subprocess.Popen],
+    labeled: Optional[bool] = None
+) -> List[Tuple[str, str]]:
+    """Forward output from running rebases as it arrives and wait for them to exit."""
+    # Label lines by worktree when more than one rebase is writing at once
+    if labeled is None:
+        labeled = len(worktrees) > 1
+    prefixes = [f"[{path.name}] " if labeled else '' for path in worktrees]
+
+    try:
+        with ThreadPoolExecutor(max_workers=2 * len(processes)) as executor:
+            futures = [
+                (executor.submit(_forward_output, process.stdout, sys.stdout, prefix),
+                 executor.submit(_forward_output, process.stderr, sys.stderr, prefix))
+                for process, prefix in zip(processes, prefixes)
+            ]
+            outputs = [(stdout.result(), stderr.result()) for stdout, stderr in futures]
+    finally:
+        # Reap every rebase even if forwarding one of them failed
+        for process in processes:
+            process.wait()
+
+    return outputs
+
+
+def _rebase_worktrees_parallel(
+    worktrees: List[Path],
+    branch: str,
+    verbose: bool = False,
+    yes: bool = False
+) -> int:
+    """Rebase several worktrees onto a branch concurrently."""
+    # Validate every tree first so nothing starts if one cannot be rebased
+    commit_hashes = []
+    for worktree_path in worktrees:
+        current_commit_hash = _prepare_rebase(worktree_path, branch, verbose)
+        if current_commit_hash is None:
+            return 1
+        commit_hashes.append(current_commit_hash)
+
+    # Worktrees have independent indices and working trees, so the rebases
+    # can overlap
+    processes = [_start_rebase(worktree_path, branch) for worktree_path in worktrees]
+    outputs = _stream_rebases(worktrees, processes)
+
+    # Report (and prompt) one tree at a time once all rebases have finished
+    result = 0
+    for worktree_path, current_commit_hash, process, (stdout, stderr) in zip(
+        worktrees, commit_hashes, processes, outputs
+    ):
+        result = max(result, _finish_rebase(
+            worktree_path, branch, current_commit_hash,
+            process.returncode, stdout, stderr, verbose, yes
+        ))
+
+    return result
+
+
 def main(args: List[str]) -> int:
     """Main entry point for rebase command."""
     parser = argparse.ArgumentParser(
@@ -218,6 +408,28 @@ def main(args: List[str]) -> int:
         'branch',
         help='Branch to rebase onto'
     )
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Rebase every worktree of every configured pair'
+    )
+    parser.add_argument(
+        '--jobs',
+        '-j',
+        type=int,
+        help='Number of parallel jobs for --all (default: up to 8)'
+    )
+    parser.add_argument(
+        '--sequential',
+        action='store_true',
+        help='Rebase the paired worktree only after the current one finishes'
+    )
+    parser.add_argument(
+        '--yes',
+        '-y',
+        action='store_true',
+        help='Answer yes to all prompts without checking for uncommitted changes'
+    )
     parser.add_argument(
         '--verbose',
         '-v',
@@ -227,9 +439,21 @@ def main(args: List[str]) -> int:
 
     parsed_args = parser.parse_args(args)
 
+    if parsed_args.jobs is not None and parsed_args.jobs < 1:
+        print("Error: --jobs must be at least 1", file=sys.stderr)
+        return 1
+
     try:
         repo = DDWorktreeRepo()
-        return rebase_worktrees(repo, parsed_args.branch, parsed_args.verbose)
+        if parsed_args.all:
+            return rebase_all_pairs(
+                repo, parsed_args.branch, parsed_args.jobs,
+                parsed_args.verbose, parsed_args.yes
+            )
+        return rebase_worktrees(
+            repo, parsed_args.branch, parsed_args.verbose,
+            parsed_args.sequential, parsed_args.yes
+        )
     except DDWorktreeError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
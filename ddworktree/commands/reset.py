@@ -3,13 +3,17 @@ Command for resetting worktrees in ddworktree.
 """
 
 import argparse
+import os
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
-from ddworktree.utils.gitignore import get_git_status
+from ddworktree.utils.gitignore import get_git_status_many
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
 
 
 def reset_worktrees(
@@ -18,14 +22,17 @@ def reset_worktrees(
     hard: bool = False,
     soft: bool = False,
     keep_local: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    sequential: bool = False,
+    yes: bool = False
 ) -> int:
     """Reset both trees to same commit or HEAD safely."""
-    current_dir = Path.cwd()
+    current_dir_str = os.path.realpath(os.getcwd())
+    current_dir = Path(current_dir_str)
 
     try:
         # Check if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir_str, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -33,36 +40,47 @@ def reset_worktrees(
             print(f"Detected {worktree_type} worktree")
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir_str, repo, is_local)
+        paired_exists = bool(paired_worktree and paired_worktree.exists())
 
         # Confirm before hard reset
-        if hard:
-            if not _confirm_hard_reset(current_dir, paired_worktree, verbose):
+        if hard and not yes:
+            if not _confirm_hard_reset(
+                current_dir, paired_worktree if paired_exists else None, verbose
+            ):
                 print("Hard reset cancelled")
                 return 0
 
-        # Reset current worktree
-        reset_result = _reset_worktree(
-            current_dir, commitish, hard, soft, verbose
-        )
-
-        if reset_result != 0:
-            return reset_result
+        worktrees = [current_dir]
 
         # Reset paired worktree if not keeping local changes
-        if paired_worktree and paired_worktree.exists() and not keep_local:
+        if paired_exists and not keep_local:
             if verbose:
                 print(f"Resetting paired worktree: {paired_worktree}")
-
-            paired_result = _reset_worktree(
-                paired_worktree, commitish, hard, soft, verbose
-            )
-
-            if paired_result != 0:
-                return paired_result
+            worktrees.append(paired_worktree)
+
+        if sequential or len(worktrees) == 1:
+            for worktree in worktrees:
+                reset_result = _reset_worktree(
+                    worktree, commitish, hard, soft, verbose
+                )
+
+                if reset_result != 0:
+                    return reset_result
+        else:
+            # The trees touch disjoint paths, so both resets can run at once
+            with ThreadPoolExecutor(max_workers=len(worktrees)) as executor:
+                results = list(executor.map(
+                    lambda worktree: _reset_worktree(worktree, commitish, hard, soft, verbose),
+                    worktrees
+                ))
+
+            reset_result = max(results)
+            if reset_result != 0:
+                return reset_result
 
         print(f"Reset completed in {worktree_type} worktree")
-        if paired_worktree and not keep_local:
+        if paired_exists and not keep_local:
             print(f"Reset completed in paired worktree")
 
         return 0
@@ -72,30 +90,6 @@ def reset_worktrees(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Optional[Path]:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
-
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
-
-    return None
-
-
 def _confirm_hard_reset(
     current_path: Path,
     paired_path: Optional[Path],
@@ -105,18 +99,22 @@ def _confirm_hard_reset(
     print("⚠️  WARNING: Hard reset will discard all uncommitted changes!")
     print(f"Current worktree: {current_path}")
 
-    if paired_path and paired_path.exists():
+    if paired_path:
         print(f"Paired worktree: {paired_path}")
 
     # Get status to show what will be lost
     try:
-        current_status = get_git_status(current_path)
+        statuses = get_git_status_many(
+            [current_path, paired_path] if paired_path else [current_path]
+        )
+
+        current_status = statuses[current_path]
         if any(current_status.values()):
             print("Uncommitted changes in current worktree:")
             _print_status_summary(current_status)
 
-        if paired_path and paired_path.exists():
-            paired_status = get_git_status(paired_path)
+        if paired_path:
+            paired_status = statuses[paired_path]
             if any(paired_status.values()):
                 print("Uncommitted changes in paired worktree:")
                 _print_status_summary(paired_status)
@@ -159,6 +157,7 @@ def _reset_worktree(
 
     result = subprocess.run(
         args,
+        env=COMMAND_ENV,
         cwd=worktree_path,
         capture_output=True,
         text=True
@@ -202,6 +201,17 @@ def main(args: List[str]) -> int:
         action='store_true',
         help='Keep local changes in paired worktree'
     )
+    parser.add_argument(
+        '--sequential',
+        action='store_true',
+        help='Reset the paired worktree only after the current one finishes'
+    )
+    parser.add_argument(
+        '--yes',
+        '-y',
+        action='store_true',
+        help='Skip the hard reset confirmation'
+    )
     parser.add_argument(
         '--verbose',
         '-v',
@@ -224,7 +234,9 @@ def main(args: List[str]) -> int:
             parsed_args.hard,
             parsed_args.soft,
             parsed_args.keep_local,
-            parsed_args.verbose
+            parsed_args.verbose,
+            parsed_args.sequential,
+            parsed_args.yes
         )
     except DDWorktreeError as e:
         print(f"Error: {e}", file=sys.stderr)
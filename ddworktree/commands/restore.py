@@ -3,19 +3,25 @@ Command for restoring worktrees in ddworktree.
 """
 
 import argparse
+import functools
 import sys
 import subprocess
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
+from ddworktree.utils.iostat import probe_paths
+from ddworktree.utils.rmtree import fast_rmtree
+from ddworktree.utils.session import COMMAND_ENV, get_session
+from ddworktree.utils.worktree import is_git_worktree
 
 
 def restore_worktree(
     repo: DDWorktreeRepo,
     tree: str,
     from_pair: Optional[str] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    yes: bool = False
 ) -> int:
     """Rebuild a missing or broken paired worktree."""
     try:
@@ -24,14 +30,18 @@ def restore_worktree(
 
         # Determine which worktree to restore
         target_path = Path(tree).resolve()
-        is_local = _is_local_worktree_name(target_path.name, repo)
+        pairs = repo.get_pairs()
+        local_suffix = repo.get_local_suffix()
+        is_local = _is_local_worktree_name(target_path.name, local_suffix)
 
         if verbose:
             worktree_type = "local" if is_local else "main"
             print(f"Target is a {worktree_type} worktree")
 
         # Find the source worktree
-        source_path = _find_source_worktree(repo, target_path, from_pair, is_local, verbose)
+        source_path = _find_source_worktree(
+            repo, target_path, from_pair, is_local, verbose, pairs, local_suffix
+        )
 
         if not source_path:
             print("Error: Could not find source worktree for restoration")
@@ -46,38 +56,60 @@ def restore_worktree(
             return 1
 
         # Check if target already exists
+        repaired = False
         if target_path.exists():
             if verbose:
                 print("Target worktree already exists")
-            response = input("Overwrite existing worktree? (y/N): ").strip().lower()
-            if response not in ['y', 'yes']:
-                print("Restore cancelled")
-                return 0
+
+            # Files intact but metadata stale: relinking is enough, no checkout
+            repaired = _repair_worktree(repo, target_path)
+            if repaired and verbose:
+                print(f"Repaired worktree metadata: {target_path}")
+
+        if target_path.exists() and not repaired:
+            if not yes:
+                response = input("Overwrite existing worktree? (y/N): ").strip().lower()
+                if response not in ['y', 'yes']:
+                    print("Restore cancelled")
+                    return 0
 
             # Remove existing worktree
             try:
-                import shutil
-                shutil.rmtree(target_path)
+                fast_rmtree(target_path)
+                _is_valid_worktree.cache_clear()
                 if verbose:
                     print(f"Removed existing worktree: {target_path}")
             except Exception as e:
                 print(f"Error removing existing worktree: {e}")
                 return 1
 
-        # Get current commit from source worktree
-        commit_hash = _get_current_commit(source_path)
-        if not commit_hash:
-            print("Error: Could not get current commit from source worktree")
-            return 1
-
-        if verbose:
-            print(f"Restoring from commit: {commit_hash[:8]}")
+        if not repaired:
+            # Get current commit from source worktree
+            commit_hash = _get_current_commit(source_path)
+            if not commit_hash:
+                print("Error: Could not get current commit from source worktree")
+                return 1
 
-        # Create the worktree
-        create_result = repo.create_worktree(str(target_path), commit_hash)
-        if create_result != 0:
-            print("Error creating worktree")
-            return 1
+            if verbose:
+                print(f"Restoring from commit: {commit_hash[:8]}")
+
+            # Drop registrations of worktrees whose directories are gone, so
+            # the target path can be added again
+            subprocess.run(
+                ['git', 'worktree', 'prune'],
+                env=COMMAND_ENV,
+                cwd=repo.repo_path,
+                capture_output=True
+            )
+
+            # Create the worktree
+            try:
+                repo.create_worktree(str(target_path), commit_hash)
+            except DDWorktreeError as e:
+                print(f"Error creating worktree: {e}")
+                return 1
+            finally:
+                _is_valid_worktree.cache_clear()
 
         # Copy .gitignore-local if restoring local worktree
         if is_local:
@@ -86,7 +118,7 @@ def restore_worktree(
                 print("Created .gitignore-local in restored worktree")
 
         # Update configuration if needed
-        _update_configuration(repo, target_path, source_path, verbose)
+        _update_configuration(repo, target_path, source_path, verbose, pairs, local_suffix)
 
         print(f"✅ Successfully restored worktree: {target_path}")
         return 0
@@ -96,10 +128,9 @@ def restore_worktree(
         return 1
 
 
-def _is_local_worktree_name(name: str, repo: DDWorktreeRepo) -> bool:
+def _is_local_worktree_name(name: str, local_suffix: str) -> bool:
     """Check if a worktree name indicates it's a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in name
+    return name.endswith(local_suffix)
 
 
 def _find_source_worktree(
@@ -107,10 +138,11 @@ def _find_source_worktree(
     target_path: Path,
     from_pair: Optional[str],
     is_local: bool,
-    verbose: bool
+    verbose: bool,
+    pairs: Dict[str, Tuple[str, str]],
+    local_suffix: str
 ) -> Optional[Path]:
     """Find the source worktree for restoration."""
-    pairs = repo.get_pairs()
 
     if from_pair:
         # Use specified pair
@@ -128,99 +160,77 @@ def _find_source_worktree(
             return None
     else:
         # Auto-detect based on configuration
-        target_name = target_path.name
-
-        for pair_name, (main_path, local_path) in pairs.items():
-            if is_local and target_path == Path(local_path):
-                return Path(main_path)
-            elif not is_local and target_path == Path(main_path):
-                return Path(local_path)
+        pair = repo.find_pair(target_path)
+        if pair and pair[1] == ('local' if is_local else 'main'):
+            return pair[2]
 
         # Try to infer from naming convention
-        local_suffix = repo.get_local_suffix()
         if is_local:
             # Target is local, look for main
-            inferred_main = target_path.parent / target_path.name.replace(local_suffix, '')
-            if inferred_main.exists() and _is_valid_worktree(inferred_main):
+            inferred_main = target_path.parent / target_path.name[:-len(local_suffix)]
+            if _is_valid_worktree(inferred_main):
                 return inferred_main
         else:
             # Target is main, look for local
             inferred_local = target_path.parent / (target_path.name + local_suffix)
-            if inferred_local.exists() and _is_valid_worktree(inferred_local):
+            if _is_valid_worktree(inferred_local):
                 return inferred_local
 
         # If no configured pair found, ask user
         print("No source worktree found in configuration.")
         print("Available worktrees:")
 
-        available_worktrees = []
-        # Check all configured worktrees
+        # Check all configured worktrees and the main repository in one batch
+        candidates = []
         for pair_name, (main_path, local_path) in pairs.items():
-            main_exists = Path(main_path).exists()
-            local_exists = Path(local_path).exists()
-
-            if main_exists and _is_valid_worktree(Path(main_path)):
-                available_worktrees.append((Path(main_path), f"{pair_name} (main)"))
-            if local_exists and _is_valid_worktree(Path(local_path)):
-                available_worktrees.append((Path(local_path), f"{pair_name} (local)"))
+            candidates.append((Path(main_path), f"{pair_name} (main)"))
+            candidates.append((Path(local_path), f"{pair_name} (local)"))
+        candidates.append((repo.repo_path, "Main repository"))
 
-        # Also check main repository
-        if _is_valid_worktree(repo.repo_path):
-            available_worktrees.append((repo.repo_path, "Main repository"))
+        valid = probe_paths((path for path, _ in candidates), _is_valid_worktree)
+        available_worktrees = [(path, desc) for path, desc in candidates if valid[path]]
 
         if not available_worktrees:
             print("No valid worktrees found for restoration")
             return None
 
+        choices = {}
         for i, (path, desc) in enumerate(available_worktrees, 1):
+            choices[str(i)] = path
             print(f"  {i}. {desc} ({path})")
 
         while True:
             try:
                 choice = input("Select source worktree (number): ").strip()
-                index = int(choice) - 1
-                if 0 <= index < len(available_worktrees):
-                    return available_worktrees[index][0]
-                else:
-                    print("Invalid selection")
-            except (ValueError, KeyboardInterrupt):
+            except (EOFError, KeyboardInterrupt):
                 print("Invalid selection")
                 return None
 
+            if choice in choices:
+                return choices[choice]
+            print("Invalid selection")
 
-def _is_valid_worktree(path: Path) -> bool:
-    """Check if a path is a valid Git worktree."""
-    try:
-        git_file = path / '.git'
-        git_dir = path / '.git'
 
-        if git_file.exists():
-            with open(git_file, 'r') as f:
-                content = f.read().strip()
-                if content.startswith('gitdir: '):
-                    git_dir = Path(content[8:])
-                    return (git_dir / 'HEAD').exists()
-        elif git_dir.exists():
-            return (git_dir / 'HEAD').exists()
+# Probed repeatedly for the same candidates; cleared after each repair
+_is_valid_worktree = functools.lru_cache(maxsize=256)(is_git_worktree)
 
-        return False
 
-    except Exception:
-        return False
+def _repair_worktree(repo: DDWorktreeRepo, worktree_path: Path) -> bool:
+    """Try to fix an existing worktree's administrative links in place."""
+    result = subprocess.run(
+        ['git', 'worktree', 'repair', str(worktree_path)],
+        env=COMMAND_ENV,
+        cwd=repo.repo_path,
+        capture_output=True
+    )
+    _is_valid_worktree.cache_clear()
+    return result.returncode == 0 and _is_valid_worktree(worktree_path)
 
 
 def _get_current_commit(worktree_path: Path) -> Optional[str]:
     """Get the current commit hash from a worktree."""
     try:
-        result = subprocess.run(
-            ['git', 'rev-parse', 'HEAD'],
-            cwd=worktree_path,
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-        return None
+        return get_session(worktree_path).rev_parse('HEAD')
     except Exception:
         return None
 
@@ -229,30 +239,26 @@ def _update_configuration(
     repo: DDWorktreeRepo,
     target_path: Path,
     source_path: Path,
-    verbose: bool
+    verbose: bool,
+    pairs: Dict[str, Tuple[str, str]],
+    local_suffix: str
 ) -> None:
     """Update configuration if the restored worktree needs to be paired."""
-    # Check if the worktree should be paired
-    pairs = repo.get_pairs()
-    local_suffix = repo.get_local_suffix()
-
     # Determine if this should be a paired worktree
-    target_is_local = local_suffix in target_path.name
-    source_is_local = local_suffix in source_path.name
+    target_is_local = target_path.name.endswith(local_suffix)
+    source_is_local = source_path.name.endswith(local_suffix)
 
     # If one is local and one is main, they should be paired
     if target_is_local != source_is_local:
         # Find or create a pair name
         pair_name = None
-        for name, (main, local) in pairs.items():
-            if (Path(main) == source_path and Path(local) == target_path) or \
-               (Path(main) == target_path and Path(local) == source_path):
-                pair_name = name
-                break
+        pair = repo.find_pair(target_path)
+        if pair and pair[2] == source_path.resolve():
+            pair_name = pair[0]
 
         if not pair_name:
             # Generate a pair name
-            base_name = target_path.name.replace(local_suffix, '') if target_is_local else target_path.name
+            base_name = target_path.name[:-len(local_suffix)] if target_is_local else target_path.name
             counter = 1
             pair_name = base_name
             while pair_name in pairs:
@@ -284,6 +290,12 @@ def main(args: List[str]) -> int:
         dest='from_pair',
         help='Pair to restore from'
     )
+    parser.add_argument(
+        '--yes',
+        '-y',
+        action='store_true',
+        help='Overwrite an existing target without asking'
+    )
     parser.add_argument(
         '--verbose',
         '-v',
@@ -295,7 +307,10 @@ def main(args: List[str]) -> int:
 
     try:
         repo = DDWorktreeRepo()
-        return restore_worktree(repo, parsed_args.tree, parsed_args.from_pair, parsed_args.verbose)
+        return restore_worktree(
+            repo, parsed_args.tree, parsed_args.from_pair,
+            parsed_args.verbose, parsed_args.yes
+        )
     except DDWorktreeError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
@@ -3,13 +3,23 @@ Command for removing files in ddworktree.
 """
 
 import argparse
+import os
 import sys
 import subprocess
 from pathlib import Path
 from typing import List
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
-from ddworktree.utils.gitignore import get_combined_gitignore_patterns, get_git_status
+from ddworktree.utils.batch import chunk_paths
+from ddworktree.utils.gitignore import (
+    compile_patterns,
+    get_combined_gitignore_patterns,
+    get_git_status,
+    is_ignored_by_pattern
+)
+from ddworktree.utils.iostat import probe_paths
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
 
 
 def remove_files(repo: DDWorktreeRepo, files: List[str], verbose: bool = False) -> int:
@@ -18,7 +28,7 @@ def remove_files(repo: DDWorktreeRepo, files: List[str], verbose: bool = False)
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -26,38 +36,61 @@ def remove_files(repo: DDWorktreeRepo, files: List[str], verbose: bool = False)
             print(f"Detected {worktree_type} worktree")
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
+        paired_worktree = get_paired_worktree(current_dir, repo, is_local)
 
-        # Process each file
+        # Sort the files into removable paths and reportable problems first
         removed_files = []
         skipped_files = []
         error_files = []
+        ignore_regex = compile_patterns(get_combined_gitignore_patterns(current_dir), path_prefix=True)
+        to_remove = {}
+
+        # Resolve arguments against the worktree as plain strings
+        current_dir_str = str(current_dir)
+        worktree_prefix = os.path.join(current_dir_str, '')
 
         for file_pattern in files:
-            file_path = Path(file_pattern)
+            absolute_path = os.path.normpath(os.path.join(current_dir_str, file_pattern))
 
-            if not file_path.exists():
+            if not os.path.lexists(absolute_path):
                 error_files.append(f"{file_pattern} (not found)")
                 continue
 
             # Check if file should be ignored
-            patterns = get_combined_gitignore_patterns(current_dir)
-            if _is_ignored(file_path, patterns):
+            if is_ignored_by_pattern(Path(file_pattern), ignore_regex):
                 skipped_files.append(f"{file_pattern} (ignored)")
                 continue
 
-            # Remove from current worktree
-            if _remove_file(current_dir, file_path, verbose):
-                removed_files.append(str(file_pattern))
-
-                # Remove from paired worktree if it exists
-                if paired_worktree and paired_worktree.exists():
-                    paired_file_path = paired_worktree / file_path.relative_to(current_dir)
-                    if paired_file_path.exists():
-                        if _remove_file(paired_worktree, paired_file_path, verbose):
-                            removed_files.append(f"{file_pattern} (paired)")
+            if absolute_path == current_dir_str:
+                relative_path = os.curdir
+            elif absolute_path.startswith(worktree_prefix):
+                relative_path = absolute_path[len(worktree_prefix):]
             else:
-                error_files.append(f"{file_pattern} (failed)")
+                error_files.append(f"{file_pattern} (outside worktree)")
+                continue
+
+            to_remove[relative_path.replace(os.sep, '/')] = file_pattern
+
+        # Remove from current worktree in batches
+        failed = _remove_files_batch(current_dir, list(to_remove), verbose)
+        error_files.extend(f"{to_remove[path]} (failed)" for path in failed)
+        removed = [path for path in to_remove if path not in failed]
+        removed_files.extend(str(to_remove[path]) for path in removed)
+
+        # Remove the same files from the paired worktree if it exists; a pair
+        # that resolves to this very checkout has nothing left to remove
+        if (
+            paired_worktree
+            and paired_worktree.exists()
+            and not os.path.samefile(current_dir, paired_worktree)
+        ):
+            paired_files = {os.path.join(paired_worktree, path): path for path in removed}
+            present = probe_paths(paired_files, os.path.lexists)
+            paired_paths = [path for paired_file, path in paired_files.items() if present[paired_file]]
+            paired_failed = _remove_files_batch(paired_worktree, paired_paths, verbose)
+            removed_files.extend(
+                f"{to_remove[path]} (paired)" for path in paired_paths if path not in paired_failed
+            )
 
         # Report results
         if removed_files:
@@ -83,54 +116,73 @@ def remove_files(repo: DDWorktreeRepo, files: List[str], verbose: bool = False)
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
+def _remove_files_batch(
+    worktree_path: Path,
+    relative_paths: List[str],
+    verbose: bool = False
+) -> set:
+    """Remove files from a worktree with as few git calls as possible, returning failures."""
+    failed = set()
 
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
+    for batch in chunk_paths(relative_paths):
+        # One ls-files call tells tracked paths (git rm) from untracked ones (unlink)
+        listed = subprocess.run(
+            ['git', 'ls-files', '-z', '--', *batch],
+            env=COMMAND_ENV,
+            cwd=worktree_path,
+            capture_output=True,
+            text=True
+        )
+        tracked = set(listed.stdout.split('\0')) if listed.returncode == 0 else set(batch)
+        tracked_batch = [path for path in batch if path in tracked]
 
-    return None
+        # Untracked files only need unlinking; git rm would just refuse them
+        failed.update(_unlink_files(
+            worktree_path, [path for path in batch if path not in tracked], verbose
+        ))
 
+        if not tracked_batch:
+            continue
 
-def _is_ignored(file_path: Path, patterns: set) -> bool:
-    """Check if a file should be ignored."""
-    file_name = file_path.name
-    relative_path = str(file_path)
+        result = subprocess.run(
+            ['git', 'rm', '--', *tracked_batch],
+            env=COMMAND_ENV,
+            cwd=worktree_path,
+            capture_output=True,
+            text=True
+        )
 
-    for pattern in patterns:
-        if pattern.endswith('/'):
-            # Directory pattern
-            if file_path.parent.name == pattern.rstrip('/'):
-                return True
-        elif pattern.startswith('*.'):
-            # Extension pattern
-            if file_name.endswith(pattern[1:]):
-                return True
-        elif pattern.startswith('/'):
-            # Absolute path pattern
-            if relative_path.startswith(pattern[1:]):
-                return True
+        if result.returncode == 0:
+            if verbose:
+                for path in tracked_batch:
+                    print(f"Removed {path} from {worktree_path.name}")
         else:
-            # Simple pattern
-            if pattern in file_name or pattern in relative_path:
-                return True
+            # git rm removes nothing when it rejects any path (e.g. one with
+            # staged changes), so handle this batch one file at a time
+            for path in tracked_batch:
+                if not _remove_file(worktree_path, worktree_path / path, verbose):
+                    failed.add(path)
+
+    return failed
+
+
+def _unlink_files(worktree_path: Path, relative_paths: List[str], verbose: bool = False) -> set:
+    """Delete untracked files directly, returning those that could not be removed."""
+    failed = set()
+    root = str(worktree_path)
+
+    # Sorting keeps files of the same directory together, so the kernel's
+    # lookups for that directory stay cached
+    for path in sorted(relative_paths):
+        try:
+            os.unlink(os.path.join(root, path))
+        except OSError:
+            failed.add(path)
+            continue
+        if verbose:
+            print(f"Removed {path} from {worktree_path.name} (not tracked)")
 
-    return False
+    return failed
 
 
 def _remove_file(worktree_path: Path, file_path: Path, verbose: bool = False) -> bool:
@@ -141,6 +193,7 @@ def _remove_file(worktree_path: Path, file_path: Path, verbose: bool = False) ->
         # Use git rm to properly remove from version control
         result = subprocess.run(
             ['git', 'rm', str(relative_path)],
+            env=COMMAND_ENV,
             cwd=worktree_path,
             capture_output=True,
             text=True
@@ -153,7 +206,7 @@ def _remove_file(worktree_path: Path, file_path: Path, verbose: bool = False) ->
         else:
             # If git rm fails, try regular file removal
             try:
-                file_path.unlink()
+                os.unlink(file_path)
                 if verbose:
                     print(f"Removed {relative_path} from {worktree_path.name} (not tracked)")
                 return True
@@ -5,11 +5,14 @@ Command for showing combined git status across both worktrees.
 import argparse
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
-from ddworktree.utils.gitignore import get_git_status
+from ddworktree.utils.gitignore import get_git_status_counts_many, get_git_status_many
+from ddworktree.utils.iostat import probe_paths
+from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
 
 
 def show_combined_status(
@@ -22,7 +25,7 @@ def show_combined_status(
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -30,10 +33,16 @@ def show_combined_status(
             print(f"Detected {worktree_type} worktree")
 
         # Get paired worktree
-        paired_worktree = _get_paired_worktree(current_dir, repo, is_local)
-
-        # Get status for current worktree
-        current_status = get_git_status(current_dir)
+        paired_worktree = get_paired_worktree(current_dir, repo, is_local)
+
+        # Get status for both worktrees at once
+        paired_exists = bool(paired_worktree and paired_worktree.exists())
+        # (the short format only needs per-category counts, not file lists)
+        get_statuses = get_git_status_counts_many if short else get_git_status_many
+        statuses = get_statuses(
+            [current_dir, paired_worktree] if paired_exists else [current_dir]
+        )
+        current_status = statuses[current_dir]
 
         if verbose:
             print(f"\n📁 Status for {worktree_type} worktree ({current_dir.name}):")
@@ -43,9 +52,9 @@ def show_combined_status(
         _print_worktree_status(current_status, current_dir.name, short, verbose)
 
         # Get status for paired worktree if it exists
-        if paired_worktree and paired_worktree.exists():
+        if paired_exists:
             paired_type = "main" if is_local else "local"
-            paired_status = get_git_status(paired_worktree)
+            paired_status = statuses[paired_worktree]
 
             if verbose:
                 print(f"\n📁 Status for {paired_type} worktree ({paired_worktree.name}):")
@@ -72,76 +81,46 @@ def show_combined_status(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
-def _get_paired_worktree(
-    current_path: Path,
-    repo: DDWorktreeRepo,
-    is_local: bool
-) -> Path:
-    """Get the paired worktree path."""
-    pairs = repo.get_pairs()
-    current_name = current_path.name
-
-    for pair_name, (main_path, local_path) in pairs.items():
-        if is_local and current_path == Path(local_path):
-            return Path(main_path)
-        elif not is_local and current_path == Path(main_path):
-            return Path(local_path)
-
-    return None
+# Categories listed by the detailed format: (status key, marker, heading)
+_STATUS_SECTIONS = (
+    ('modified', 'M', '📝 Modified files'),
+    ('added', 'A', '➕ Added files'),
+    ('deleted', 'D', '➖ Deleted files'),
+    ('untracked', '?', '❓ Untracked files'),
+)
 
 
 def _print_worktree_status(status: dict, worktree_name: str, short: bool, verbose: bool) -> None:
     """Print status for a single worktree."""
     if short:
-        # Short format - just show summary
-        total_changes = (
-            len(status['modified']) +
-            len(status['added']) +
-            len(status['deleted']) +
-            len(status['untracked'])
-        )
-
-        if total_changes == 0:
+        # Short format - just show summary; status holds counts here
+        changes = []
+        if status['modified']:
+            changes.append(f"M:{status['modified']}")
+        if status['added']:
+            changes.append(f"A:{status['added']}")
+        if status['deleted']:
+            changes.append(f"D:{status['deleted']}")
+        if status['untracked']:
+            changes.append(f"U:{status['untracked']}")
+
+        if not changes:
             print(f"  ✅ Clean")
         else:
-            changes = []
-            if status['modified']:
-                changes.append(f"M:{len(status['modified'])}")
-            if status['added']:
-                changes.append(f"A:{len(status['added'])}")
-            if status['deleted']:
-                changes.append(f"D:{len(status['deleted'])}")
-            if status['untracked']:
-                changes.append(f"U:{len(status['untracked'])}")
             print(f"  ⚠️  {' '.join(changes)}")
     else:
         # Verbose format - show detailed status
         if any(status.values()):
-            if status['modified']:
-                print(f"  📝 Modified files ({len(status['modified'])}):")
-                for file in status['modified']:
-                    print(f"    M {file}")
-
-            if status['added']:
-                print(f"  ➕ Added files ({len(status['added'])}):")
-                for file in status['added']:
-                    print(f"    A {file}")
-
-            if status['deleted']:
-                print(f"  ➖ Deleted files ({len(status['deleted'])}):")
-                for file in status['deleted']:
-                    print(f"    D {file}")
-
-            if status['untracked']:
-                print(f"  ❓ Untracked files ({len(status['untracked'])}):")
-                for file in status['untracked']:
-                    print(f"    ? {file}")
+            # Build the whole listing first and write it in one go instead
+            # of one print() per file
+            lines = []
+            for category, marker, heading in _STATUS_SECTIONS:
+                files = status[category]
+                if files:
+                    lines.append(f"  {heading} ({len(files)}):")
+                    lines.extend(f"    {marker} {file}" for file in files)
+            if lines:
+                sys.stdout.write('\n'.join(lines) + '\n')
         else:
             print("  ✅ Working tree clean")
 
@@ -149,7 +128,11 @@ def _print_worktree_status(status: dict, worktree_name: str, short: bool, verbos
 def _show_drift_summary(main_dir: Path, local_dir: Path, repo: DDWorktreeRepo, verbose: bool) -> None:
     """Show drift summary between worktrees."""
     try:
-        from ddworktree.utils.diff import detect_drift
+        from ddworktree.utils.diff import detect_drift, is_trivially_in_sync
+
+        if is_trivially_in_sync(main_dir, local_dir):
+            print(f"\n✅ No drift detected")
+            return
 
         drift = detect_drift(main_dir, local_dir)
 
@@ -187,21 +170,35 @@ def _show_repository_summary(repo: DDWorktreeRepo, current_dir: Path, paired_wor
     pairs = repo.get_pairs()
     if pairs:
         print(f"  Configured pairs ({len(pairs)}):")
+        # Check every configured path in one batch
+        exists = probe_paths(path for paths in pairs.values() for path in paths)
         for pair_name, (main_path, local_path) in pairs.items():
-            main_exists = "✅" if Path(main_path).exists() else "❌"
-            local_exists = "✅" if Path(local_path).exists() else "❌"
+            main_exists = "✅" if exists[main_path] else "❌"
+            local_exists = "✅" if exists[local_path] else "❌"
             print(f"    {pair_name}: {main_exists} {local_exists}")
     else:
         print("  No configured pairs")
 
-    # Show current branch info
-    try:
-        branch_result = subprocess.run(
-            ['git', 'branch', '--show-current'],
+    # The branch and remote lookups are independent, so run them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        branch_future = executor.submit(
+            subprocess.run,
+            ['git', '--no-optional-locks', 'branch', '--show-current'],
             cwd=current_dir,
             capture_output=True,
             text=True
         )
+        remote_future = executor.submit(
+            subprocess.run,
+            ['git', '--no-optional-locks', 'remote', '-v'],
+            cwd=repo.repo_path,
+            capture_output=True,
+            text=True
+        )
+
+    # Show current branch info
+    try:
+        branch_result = branch_future.result()
         if branch_result.returncode == 0:
             current_branch = branch_result.stdout.strip()
             print(f"  Current branch: {current_branch}")
@@ -210,12 +207,7 @@ def _show_repository_summary(repo: DDWorktreeRepo, current_dir: Path, paired_wor
 
     # Show remote info
     try:
-        remote_result = subprocess.run(
-            ['git', 'remote', '-v'],
-            cwd=repo.repo_path,
-            capture_output=True,
-            text=True
-        )
+        remote_result = remote_future.result()
         if remote_result.returncode == 0:
             remotes = remote_result.stdout.strip().split('\n')
             if remotes and remotes[0]:
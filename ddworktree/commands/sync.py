@@ -3,12 +3,27 @@ Command for synchronizing worktrees in ddworktree.
 """
 
 import argparse
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
-from ddworktree.utils.diff import detect_drift, generate_diff_report, sync_files
+from ddworktree.utils.batch import chunk_paths
+from ddworktree.utils.diff import (
+    detect_drift,
+    generate_diff_report,
+    is_trivially_in_sync,
+    sync_files
+)
+from ddworktree.utils.iostat import probe_paths
+from ddworktree.utils.session import COMMAND_ENV
+from ddworktree.utils.worktree import is_local_worktree
+
+# File copies and deletions are independent, so they are spread over a pool
+_MAX_SYNC_WORKERS = min(16, os.cpu_count() or 1)
+_SYNC_CHUNK_PATHS = 200
 
 
 def sync_worktrees(
@@ -16,14 +31,15 @@ def sync_worktrees(
     pair: Optional[str] = None,
     auto_commit: bool = False,
     dry_run: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    yes: bool = False
 ) -> int:
     """Resynchronize pair to remove drift."""
     current_dir = Path.cwd()
 
     try:
         # Determine if this is a main or local worktree
-        is_local = _is_local_worktree(current_dir, repo)
+        is_local = is_local_worktree(current_dir, repo)
         worktree_type = "local" if is_local else "main"
 
         if verbose:
@@ -54,6 +70,12 @@ def sync_worktrees(
             print(f"Error: Local worktree does not exist: {local_worktree}")
             return 1
 
+        # Same commit and nothing changed, untracked or ignored on either
+        # side means there is nothing to compare file by file
+        if is_trivially_in_sync(main_worktree, local_worktree):
+            print("✅ No drift detected - worktrees are already in sync")
+            return 0
+
         # Detect current drift
         drift = detect_drift(main_worktree, local_worktree)
 
@@ -70,8 +92,13 @@ def sync_worktrees(
             print("\n🔍 Dry run complete - no changes made")
             return 0
 
-        # Ask for confirmation unless auto-commit is enabled
-        if not auto_commit:
+        # Ask for confirmation unless auto-commit or --yes is given; without
+        # a terminal nobody can answer, so fail instead of waiting forever
+        if not (auto_commit or yes):
+            if not sys.stdin.isatty():
+                print("Error: Confirmation required but stdin is not a terminal "
+                      "(use --yes or --auto-commit)")
+                return 2
             response = input("\nProceed with synchronization? (y/N): ").strip().lower()
             if response not in ['y', 'yes']:
                 print("Synchronization cancelled")
@@ -85,10 +112,16 @@ def sync_worktrees(
         if sync_result != 0:
             return sync_result
 
-        # Verify synchronization
+        # Verify synchronization. Unless main was reset to another commit,
+        # only the paths just synchronized can have changed, so only those
+        # are compared again
         if verbose:
             print("\n🔍 Verifying synchronization...")
-        new_drift = detect_drift(main_worktree, local_worktree)
+        if drift.commit_drift:
+            verify_paths = None
+        else:
+            verify_paths = drift.added_files + drift.deleted_files + drift.modified_files
+        new_drift = detect_drift(main_worktree, local_worktree, verify_paths)
 
         if new_drift.commit_drift or new_drift.added_files or new_drift.deleted_files or new_drift.modified_files:
             print("⚠️  Warning: Synchronization completed but drift still detected")
@@ -105,12 +138,6 @@ def sync_worktrees(
         return 1
 
 
-def _is_local_worktree(worktree_path: Path, repo: DDWorktreeRepo) -> bool:
-    """Check if this is a local worktree."""
-    local_suffix = repo.get_local_suffix()
-    return local_suffix in worktree_path.name
-
-
 def _get_worktrees_for_sync(
     repo: DDWorktreeRepo,
     current_path: Path,
@@ -130,19 +157,17 @@ def _get_worktrees_for_sync(
             return None, None
     else:
         # Auto-detect pair based on current worktree
-        current_name = current_path.name
-
-        for pair_name, (main_path, local_path) in pairs.items():
-            if is_local and current_path == Path(local_path):
-                return Path(main_path), Path(local_path)
-            elif not is_local and current_path == Path(main_path):
-                return Path(main_path), Path(local_path)
+        entry = repo.find_pair(current_path)
+        if entry and entry[1] == 'local' and is_local:
+            return entry[2], current_path
+        elif entry and entry[1] == 'main' and not is_local:
+            return current_path, entry[2]
 
         # If not found in pairs, try to infer from current path
         local_suffix = repo.get_local_suffix()
         if is_local:
             # Current is local, infer main
-            main_inferred = current_path.parent / current_path.name.replace(local_suffix, '')
+            main_inferred = current_path.parent / current_path.name[:-len(local_suffix)]
             if main_inferred.exists():
                 return main_inferred, current_path
         else:
@@ -168,54 +193,53 @@ def _perform_synchronization(
 ) -> int:
     """Perform the actual synchronization."""
     import subprocess
-    import shutil
 
     sync_actions = []
 
-    # Handle added files (copy from local to main)
-    if drift.added_files:
-        if verbose:
+    if verbose:
+        if drift.added_files:
             print(f"\n📁 Syncing {len(drift.added_files)} added files...")
-        result = sync_files(local_worktree, main_worktree, drift.added_files, dry_run=False)
-        sync_actions.extend(result)
-
-        # Stage the files in main worktree
-        for file_path in drift.added_files:
-            subprocess.run(
-                ['git', 'add', file_path],
-                cwd=main_worktree,
-                capture_output=True
-            )
-
-    # Handle deleted files (remove from main if they don't exist in local)
-    if drift.deleted_files:
-        if verbose:
+        if drift.deleted_files:
             print(f"\n🗑️  Syncing {len(drift.deleted_files)} deleted files...")
-        for file_path in drift.deleted_files:
-            main_file = main_worktree / file_path
-            if main_file.exists():
-                main_file.unlink()
-                subprocess.run(
-                    ['git', 'rm', file_path],
-                    cwd=main_worktree,
-                    capture_output=True
-                )
-                sync_actions.append(f"Removed: {file_path}")
-
-    # Handle modified files (copy newer version)
-    if drift.modified_files:
-        if verbose:
+        if drift.modified_files:
             print(f"\n✏️  Syncing {len(drift.modified_files)} modified files...")
-        result = sync_files(local_worktree, main_worktree, drift.modified_files, dry_run=False)
-        sync_actions.extend(result)
 
-        # Stage the modified files in main worktree
-        for file_path in drift.modified_files:
-            subprocess.run(
-                ['git', 'add', file_path],
-                cwd=main_worktree,
-                capture_output=True
-            )
+    # Copy added and modified files (local to main) and remove files deleted
+    # in local, spreading the independent file operations over a thread pool
+    copy_paths = list(drift.added_files) + list(drift.modified_files)
+    copy_chunks = list(chunk_paths(copy_paths, max_paths=_SYNC_CHUNK_PATHS))
+    delete_chunks = list(chunk_paths(drift.deleted_files, max_paths=_SYNC_CHUNK_PATHS))
+    workers = min(_MAX_SYNC_WORKERS, len(copy_chunks) + len(delete_chunks)) or 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        copy_results = [
+            executor.submit(sync_files, local_worktree, main_worktree, chunk, False)
+            for chunk in copy_chunks
+        ]
+        delete_results = [
+            executor.submit(_unlink_files, main_worktree, chunk)
+            for chunk in delete_chunks
+        ]
+        for future in copy_results:
+            sync_actions.extend(future.result())
+        removed_paths = [path for future in delete_results for path in future.result()]
+    sync_actions.extend(f"Removed: {file_path}" for file_path in removed_paths)
+
+    # Stage everything in main with one git add and one git rm, feeding the
+    # paths through stdin instead of spawning a process per batch. A path
+    # that is neither on disk nor in the index would abort git add, so only
+    # files that made it into main are passed. Untracked deletions are
+    # skipped by --ignore-unmatch
+    copied = probe_paths(
+        (os.path.join(main_worktree, file_path) for file_path in copy_paths),
+        os.path.lexists
+    )
+    staged_paths = [
+        file_path for file_path in copy_paths
+        if copied[os.path.join(main_worktree, file_path)]
+    ]
+    _run_with_pathspecs(main_worktree, ['add', '--all'], staged_paths)
+    _run_with_pathspecs(main_worktree, ['rm', '--quiet', '--ignore-unmatch'], removed_paths)
 
     # Handle commit drift
     if drift.commit_drift:
@@ -230,8 +254,10 @@ def _perform_synchronization(
                 print(f"Resetting main worktree to commit {drift.local_commit[:8]}")
             subprocess.run(
                 ['git', 'reset', '--hard', drift.local_commit],
+                env=COMMAND_ENV,
                 cwd=main_worktree,
-                capture_output=True
+                capture_output=True,
+                stdin=subprocess.DEVNULL
             )
             sync_actions.append(f"Reset main to {drift.local_commit[:8]}")
 
@@ -240,19 +266,24 @@ def _perform_synchronization(
         if verbose:
             print("\n💾 Auto-committing synchronization changes...")
 
-        # Check if there are staged changes
-        status_result = subprocess.run(
-            ['git', 'status', '--porcelain'],
+        # Check if there are staged changes; the exit status is the answer,
+        # so no output is read or decoded
+        staged_result = subprocess.run(
+            ['git', 'diff', '--cached', '--quiet'],
+            env=COMMAND_ENV,
             cwd=main_worktree,
-            capture_output=True,
-            text=True
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
         )
 
-        if status_result.stdout.strip():
+        if staged_result.returncode == 1:
             commit_result = subprocess.run(
                 ['git', 'commit', '-m', 'Automatic synchronization from ddworktree'],
+                env=COMMAND_ENV,
                 cwd=main_worktree,
                 capture_output=True,
+                stdin=subprocess.DEVNULL,
                 text=True
             )
 
@@ -267,6 +298,35 @@ def _perform_synchronization(
     return 0
 
 
+def _run_with_pathspecs(worktree: Path, command: List[str], file_paths: List[str]) -> None:
+    """Run a git command over many literal paths passed NUL-separated on stdin."""
+    if not file_paths:
+        return
+
+    import subprocess
+
+    subprocess.run(
+        ['git', '--literal-pathspecs', *command,
+         '--pathspec-from-file=-', '--pathspec-file-nul'],
+        env=COMMAND_ENV,
+        cwd=worktree,
+        input=b''.join(os.fsencode(file_path) + b'\0' for file_path in file_paths),
+        capture_output=True
+    )
+
+
+def _unlink_files(worktree: Path, file_paths: List[str]) -> List[str]:
+    """Delete the given files from a worktree, returning those that existed."""
+    removed_paths = []
+    for file_path in file_paths:
+        try:
+            (worktree / file_path).unlink()
+        except FileNotFoundError:
+            continue
+        removed_paths.append(file_path)
+    return removed_paths
+
+
 def main(args: List[str]) -> int:
     """Main entry point for sync command."""
     parser = argparse.ArgumentParser(
@@ -288,6 +348,12 @@ def main(args: List[str]) -> int:
         action='store_true',
         help='Show what would be done'
     )
+    parser.add_argument(
+        '--yes',
+        '-y',
+        action='store_true',
+        help='Skip the confirmation prompt'
+    )
     parser.add_argument(
         '--verbose',
         '-v',
@@ -304,7 +370,8 @@ def main(args: List[str]) -> int:
             parsed_args.pair,
             parsed_args.auto_commit,
             parsed_args.dry_run,
-            parsed_args.verbose
+            parsed_args.verbose,
+            parsed_args.yes
         )
     except DDWorktreeError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -4,10 +4,13 @@ Command for removing pairing in ddworktree.
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Optional
 
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
+from ddworktree.utils.iostat import path_exists
+from ddworktree.utils.rmtree import fast_rmtree
 
 
 def unpair_worktrees(
@@ -30,11 +33,9 @@ def unpair_worktrees(
             pair_to_remove = path
         else:
             # Check if path matches any worktree path
-            search_path = Path(path).resolve()
-            for pair_name, (main_path, local_path) in pairs.items():
-                if search_path == Path(main_path) or search_path == Path(local_path):
-                    pair_to_remove = pair_name
-                    break
+            entry = repo.find_pair(Path(path))
+            if entry:
+                pair_to_remove = entry[0]
 
         if not pair_to_remove:
             print(f"Error: No paired worktree found for '{path}'")
@@ -52,8 +53,8 @@ def unpair_worktrees(
             print(f"  Local: {local_path}")
 
         # Check if worktrees still exist
-        main_exists = Path(main_path).exists()
-        local_exists = Path(local_path).exists()
+        main_exists = path_exists(main_path)
+        local_exists = path_exists(local_path)
 
         # Warn before removing if worktrees still exist
         if (main_exists or local_exists) and not keep_both:
@@ -81,24 +82,28 @@ def unpair_worktrees(
             response = input("Remove worktree directories? (y/N): ").strip().lower()
 
             if response in ['y', 'yes']:
-                removed_count = 0
+                to_remove = []
                 if main_exists:
-                    try:
-                        import shutil
-                        shutil.rmtree(main_path)
-                        print(f"Removed main worktree: {main_path}")
-                        removed_count += 1
-                    except Exception as e:
-                        print(f"Error removing main worktree: {e}")
-
+                    to_remove.append(('main', main_path))
                 if local_exists:
-                    try:
-                        import shutil
-                        shutil.rmtree(local_path)
-                        print(f"Removed local worktree: {local_path}")
-                        removed_count += 1
-                    except Exception as e:
-                        print(f"Error removing local worktree: {e}")
+                    to_remove.append(('local', local_path))
+
+                # The two trees are disjoint, so delete them side by side;
+                # messages are printed here as each removal finishes
+                removed_count = 0
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    futures = {
+                        executor.submit(fast_rmtree, worktree_path): (kind, worktree_path)
+                        for kind, worktree_path in to_remove
+                    }
+                    for future in as_completed(futures):
+                        kind, worktree_path = futures[future]
+                        try:
+                            future.result()
+                            print(f"Removed {kind} worktree: {worktree_path}")
+                            removed_count += 1
+                        except Exception as e:
+                            print(f"Error removing {kind} worktree: {e}")
 
                 if removed_count > 0:
                     print(f"\n✅ Removed {removed_count} worktree directories")
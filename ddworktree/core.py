@@ -2,17 +2,87 @@
 Core ddworktree functionality - Git repository wrapper and worktree management.
 """
 
+import copy
+import mmap
 import os
+import re
 import subprocess
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
-import git
-from git import Repo
+from typing import Dict, List, Optional, Tuple, Any, Union
+
+# TOML reader for .ddconfig: tomllib on Python 3.11+, else tomli if installed
+try:
+    import tomllib as _toml
+except ImportError:
+    try:
+        import tomli as _toml
+    except ImportError:
+        _toml = None
+
+# Optional libgit2 bindings, used to add worktrees without starting git
+try:
+    import pygit2 as _pygit2
+except ImportError:
+    _pygit2 = None
+
+# Configs larger than this (hundreds of pairs) are parsed from a memory map
+_MMAP_CONFIG_SIZE = 64 * 1024
+
+# Written to new local worktrees: common files that should not be committed globally
+_LOCAL_GITIGNORE_TEMPLATE = (
+    b"# Local files that should not be committed globally\n"
+    b"*.local\n"
+    b"*.env.local\n"
+    b"*.secrets\n"
+    b"config/local/\n"
+    b"logs/\n"
+    b"tmp/\n"
+    b".env\n"
+    b".env.local\n"
+    b".env.development.local\n"
+    b".env.test.local\n"
+    b".env.production.local\n"
+)
+
+
+# Any table header line, including ones followed by a comment
+_TABLE_HEADER = re.compile(r'^[ \t]*\[(.*)$', re.MULTILINE)
+
+
+def _trailing_table(text: str) -> Optional[str]:
+    """Name the table ("pairs" or "options") a line appended to text would join.
+
+    None if text doesn't end with a newline or ends in any other table, in
+    which case the config has to be rewritten to add a key.
+    """
+    if not text.endswith('\n'):
+        return None
+
+    header = None
+    for header in _TABLE_HEADER.finditer(text):
+        pass
+    if header is None:
+        return None
+
+    name = header.group(1).split('#', 1)[0].strip()
+    if not name.endswith(']') or name.startswith('['):
+        return None
+    name = name[:-1].strip()
+    return name if name in ('pairs', 'options') else None
+
+
+def _format_option(key: str, value: Any) -> str:
+    """Render one [options] entry as a TOML line."""
+    if isinstance(value, bool):
+        return f'{key} = {"true" if value else "false"}\n'
+    if isinstance(value, str):
+        return f'{key} = "{value}"\n'
+    return f'{key} = {value}\n'
 
 
 class DDWorktreeError(Exception):
     """Base exception for ddworktree operations."""
-    pass
+    __slots__ = ()
 
 
 class DDWorktreeRepo:
@@ -21,11 +91,41 @@ class DDWorktreeRepo:
     def __init__(self, repo_path: Optional[str] = None):
         """Initialize with repository path (defaults to current directory)."""
         self.repo_path = Path(repo_path) if repo_path else Path.cwd()
-        try:
-            self.repo = Repo(self.repo_path)
-        except git.exc.InvalidGitRepositoryError:
+        # Parsed config values, loaded on first lookup and cleared whenever
+        # the config is saved
+        self._config: Optional[Dict[str, Any]] = None
+        self._config_version: Optional[Tuple[int, int]] = None
+        self._pairs: Optional[Dict[str, Tuple[str, str]]] = None
+        self._local_suffix: Optional[str] = None
+        self._pair_index: Optional[Dict[str, Tuple[str, str, Path]]] = None
+        # Table that ends the config file as last read, which new keys of
+        # that table can be appended to
+        self._config_tail: Optional[str] = None
+        self._libgit2_repo = None
+        self._repo = None
+        if not self._is_repository(self.repo_path):
             raise DDWorktreeError(f"Not a Git repository: {self.repo_path}")
 
+    @staticmethod
+    def _is_repository(path: Path) -> bool:
+        """Check for a worktree root (.git directory or gitdir file) or a bare repository."""
+        # A few stats instead of importing GitPython and opening the repository
+        if os.path.lexists(os.path.join(path, '.git')):
+            return True
+        return (
+            os.path.isfile(os.path.join(path, 'HEAD'))
+            and os.path.isdir(os.path.join(path, 'objects'))
+            and os.path.isdir(os.path.join(path, 'refs'))
+        )
+
+    @property
+    def repo(self):
+        """GitPython Repo for this repository, imported and opened on first use."""
+        if self._repo is None:
+            import git
+            self._repo = git.Repo(self.repo_path)
+        return self._repo
+
     @property
     def config_file(self) -> Path:
         """Path to .ddconfig file."""
@@ -33,117 +133,178 @@ class DDWorktreeRepo:
 
     def load_config(self) -> Dict[str, Any]:
         """Load .ddconfig file."""
-        if not self.config_file.exists():
-            return {'pairs': {}, 'options': {}}
-
-        # Try TOML first, then YAML
+        # The parsed config is reused until the file's mtime or size changes
         try:
-            import tomllib
-            with open(self.config_file, 'rb') as f:
-                config = tomllib.load(f)
-                # Convert boolean values back to strings for consistency
-                if 'options' in config:
-                    for key, value in config['options'].items():
-                        if isinstance(value, bool):
-                            config['options'][key] = str(value).lower()
-                return config
-        except ImportError:
-            try:
-                import tomli
-                with open(self.config_file, 'rb') as f:
-                    config = tomli.load(f)
-                    # Convert boolean values back to strings for consistency
-                    if 'options' in config:
-                        for key, value in config['options'].items():
-                            if isinstance(value, bool):
-                                config['options'][key] = str(value).lower()
-                    return config
-            except ImportError:
-                # Fallback to basic parsing
-                return self._parse_basic_config()
+            st = os.stat(self.config_file)
+            version = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            version = None
+
+        if self._config is None or version != self._config_version:
+            self._invalidate_config_cache()
+            if version is None:
+                self._config = {'pairs': {}, 'options': {}}
+            else:
+                self._config = self._read_config()
+            self._config_version = version
+
+        # Callers may modify what they get back, so hand out a copy
+        return copy.deepcopy(self._config)
+
+    def _read_config(self) -> Dict[str, Any]:
+        """Parse the .ddconfig file."""
+        if _toml is None:
+            # Fallback to basic parsing
+            return self._parse_basic_config()
+
+        with open(self.config_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > _MMAP_CONFIG_SIZE:
+                # Decoding straight from the mapping skips the copy read() makes
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    text = str(mapped, 'utf-8')
+            else:
+                text = f.read().decode('utf-8')
+
+        config = _toml.loads(text)
+        self._config_tail = _trailing_table(text)
+
+        # Convert boolean values back to strings for consistency
+        if 'options' in config:
+            for key, value in config['options'].items():
+                if isinstance(value, bool):
+                    config['options'][key] = str(value).lower()
+        return config
 
     def save_config(self, config: Dict[str, Any]) -> None:
         """Save configuration to .ddconfig file."""
-        try:
-            import tomllib
+        self._invalidate_config_cache()
+        if _toml is not None:
             # Write basic TOML format
-            with open(self.config_file, 'w') as f:
-                f.write('# ddworktree configuration\n\n')
-
-                if 'pairs' in config:
-                    f.write('[pairs]\n')
-                    for key, value in config['pairs'].items():
-                        f.write(f'{key} = "{value}"\n')
-                    f.write('\n')
-
-                if 'options' in config:
-                    f.write('[options]\n')
-                    for key, value in config['options'].items():
-                        if isinstance(value, bool):
-                            f.write(f'{key} = {str(value).lower()}\n')
-                        elif isinstance(value, str):
-                            f.write(f'{key} = "{value}"\n')
-                        else:
-                            f.write(f'{key} = {value}\n')
-        except ImportError:
+            self._write_config_text(self._format_config(config, skip_empty=False))
+        else:
             # Fallback to basic format
             self._save_basic_config(config)
 
+    @staticmethod
+    def _format_config(config: Dict[str, Any], skip_empty: bool) -> str:
+        """Render the config file contents in one string."""
+        parts = ['# ddworktree configuration\n\n']
+
+        pairs = config.get('pairs')
+        if 'pairs' in config and not (skip_empty and not pairs):
+            parts.append('[pairs]\n')
+            parts.extend([f'{key} = "{value}"\n' for key, value in pairs.items()])
+            parts.append('\n')
+
+        options = config.get('options')
+        if 'options' in config and not (skip_empty and not options):
+            parts.append('[options]\n')
+            parts.extend([_format_option(key, value) for key, value in options.items()])
+
+        return ''.join(parts)
+
+    def _write_config_text(self, text: str) -> None:
+        """Replace the config file atomically, so a crash never leaves it truncated."""
+        temp_file = self.config_file.with_name(self.config_file.name + '.tmp')
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(temp_file, self.config_file)
+        except BaseException:
+            try:
+                os.unlink(temp_file)
+            except OSError:
+                pass
+            raise
+
+    def _invalidate_config_cache(self) -> None:
+        """Drop cached pairs and options so the next lookup re-reads the config."""
+        self._config = None
+        self._config_version = None
+        self._pairs = None
+        self._local_suffix = None
+        self._pair_index = None
+        self._config_tail = None
+
+    def _append_config_line(self, line: str) -> None:
+        """Add a key to the table that ends the config file, without rewriting it."""
+        self._invalidate_config_cache()
+        fd = os.open(self.config_file, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def _cached_config(self) -> Dict[str, Any]:
+        """Get the parsed config for read-only lookups, loading it on first use."""
+        if self._config is None:
+            self.load_config()
+        return self._config
+
     def _parse_basic_config(self) -> Dict[str, Any]:
         """Basic config file parser for when TOML is not available."""
         config = {'pairs': {}, 'options': {}}
         if self.config_file.exists():
             with open(self.config_file, 'r') as f:
-                current_section = None
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('[pairs]'):
-                        current_section = 'pairs'
-                    elif line.startswith('[options]'):
-                        current_section = 'options'
-                    elif '=' in line and current_section:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip().strip('"\'')
-                        # Keep boolean values as strings for consistency
-                        config[current_section][key] = value
+                text = f.read()
+            self._config_tail = _trailing_table(text)
+
+            current_section = None
+            for line in text.splitlines():
+                line = line.strip()
+                if line.startswith('[pairs]'):
+                    current_section = 'pairs'
+                elif line.startswith('[options]'):
+                    current_section = 'options'
+                elif '=' in line and current_section:
+                    key, value = line.split('=', 1)
+                    key = key.strip()
+                    value = value.strip().strip('"\'')
+                    # Keep boolean values as strings for consistency
+                    config[current_section][key] = value
         return config
 
     def _save_basic_config(self, config: Dict[str, Any]) -> None:
         """Save config in basic format when TOML is not available."""
-        with open(self.config_file, 'w') as f:
-            f.write('# ddworktree configuration\n\n')
-
-            if 'pairs' in config and config['pairs']:
-                f.write('[pairs]\n')
-                for key, value in config['pairs'].items():
-                    f.write(f'{key} = "{value}"\n')
-                f.write('\n')
-
-            if 'options' in config and config['options']:
-                f.write('[options]\n')
-                for key, value in config['options'].items():
-                    if isinstance(value, bool):
-                        f.write(f'{key} = {str(value).lower()}\n')
-                    elif isinstance(value, str):
-                        f.write(f'{key} = "{value}"\n')
-                    else:
-                        f.write(f'{key} = {value}\n')
+        self._write_config_text(self._format_config(config, skip_empty=True))
 
     def get_pairs(self) -> Dict[str, Tuple[str, str]]:
         """Get all configured worktree pairs."""
-        config = self.load_config()
-        pairs = {}
-        for name, pair_str in config.get('pairs', {}).items():
-            main, local = pair_str.split(',', 1)
-            pairs[name] = (main.strip(), local.strip())
-        return pairs
+        if self._pairs is None:
+            config = self._cached_config()
+            pairs = {}
+            for name, pair_str in config.get('pairs', {}).items():
+                main, local = pair_str.split(',', 1)
+                pairs[name] = (main.strip(), local.strip())
+            self._pairs = pairs
+        return dict(self._pairs)
+
+    def resolve_pair_path(self, path: str) -> Path:
+        """Get the real path of a configured pair entry, taking relative ones from the repository."""
+        return Path(os.path.realpath(os.path.join(self.repo_path, path)))
+
+    def find_pair(self, path: Union[str, Path]) -> Optional[Tuple[str, str, Path]]:
+        """Look up a worktree path, returning (pair name, 'main' or 'local', partner path)."""
+        if self._pair_index is None:
+            # Key both sides of every pair by real path string; relative
+            # entries are taken relative to the repository
+            index = {}
+            for name, (main, local) in self.get_pairs().items():
+                main_path = self.resolve_pair_path(main)
+                local_path = self.resolve_pair_path(local)
+                index[os.fspath(main_path)] = (name, 'main', local_path)
+                index[os.fspath(local_path)] = (name, 'local', main_path)
+            self._pair_index = index
+        return self._pair_index.get(os.path.realpath(path))
 
     def add_pair(self, name: str, main_path: str, local_path: str) -> None:
         """Add a new worktree pair configuration."""
         config = self.load_config()
         if 'pairs' not in config:
             config['pairs'] = {}
+        if name not in config['pairs'] and self._config_tail == 'pairs':
+            self._append_config_line(f'{name} = "{main_path}, {local_path}"\n')
+            return
         config['pairs'][name] = f"{main_path}, {local_path}"
         self.save_config(config)
 
@@ -156,67 +317,67 @@ class DDWorktreeRepo:
 
     def get_option(self, key: str, default: Any = None) -> Any:
         """Get a configuration option value."""
-        config = self.load_config()
-        return config.get('options', {}).get(key, default)
+        return self._cached_config().get('options', {}).get(key, default)
 
     def set_option(self, key: str, value: Any) -> None:
         """Set a configuration option value."""
         config = self.load_config()
         if 'options' not in config:
             config['options'] = {}
+        if key not in config['options'] and self._config_tail == 'options':
+            self._append_config_line(_format_option(key, value))
+            return
         config['options'][key] = value
         self.save_config(config)
 
     def get_worktrees(self) -> List[dict]:
         """Get all worktrees for this repository."""
-        try:
-            return list(self.repo.worktrees)
-        except AttributeError:
-            # Handle different GitPython versions
-            result = subprocess.run(
-                ['git', 'worktree', 'list', '--porcelain'],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True
+        # -z (git 2.36+) keeps paths containing newlines intact; older
+        # git rejects it, so retry with the newline-separated format
+        for separator in (b'\0', b'\n'):
+            args = ['git', 'worktree', 'list', '--porcelain']
+            if separator == b'\0':
+                args.append('-z')
+            result = subprocess.run(args, cwd=self.repo_path, capture_output=True)
+            if result.returncode == 0:
+                break
+        else:
+            return []
+
+        # Records are separated by an empty field, fields are "<key> <value>"
+        worktrees = []
+        for record in result.stdout.split(separator * 2):
+            fields = dict(
+                field.split(b' ', 1)
+                for field in record.split(separator)
+                if b' ' in field
             )
-            if result.returncode != 0:
-                return []
+            if b'worktree' not in fields:
+                continue
 
-            worktrees = []
-            current_worktree = {}
-            for line in result.stdout.split('\n'):
-                line = line.strip()
-                if line.startswith('worktree '):
-                    if current_worktree:
-                        worktrees.append(current_worktree)
-                    current_worktree = {'path': line[9:]}
-                elif line.startswith('HEAD '):
-                    current_worktree['head'] = line[5:]
-                elif line.startswith('branch '):
-                    current_worktree['branch'] = line[7:]
-
-            if current_worktree:
-                worktrees.append(current_worktree)
+            worktree = {'path': os.fsdecode(fields[b'worktree'])}
+            if b'HEAD' in fields:
+                worktree['head'] = fields[b'HEAD'].decode('ascii')
+            if b'branch' in fields:
+                worktree['branch'] = os.fsdecode(fields[b'branch'])
+            worktrees.append(worktree)
 
-            return worktrees
+        return worktrees
 
     def is_valid_worktree(self, path: str) -> bool:
         """Check if a path is a valid worktree."""
-        worktree_path = Path(path).resolve()
-        try:
-            # Check if path exists and has .git file pointing to main repo
-            git_file = worktree_path / '.git'
-            if not git_file.exists():
-                return False
+        # Imported here: ddworktree.utils imports this module
+        from ddworktree.utils.refs import read_gitdir_file
 
-            with open(git_file, 'r') as f:
-                content = f.read().strip()
-                return 'gitdir:' in content and self.repo_path.name in content
-        except (OSError, IOError):
-            return False
+        # A linked worktree's .git file points into the main repository
+        git_dir = read_gitdir_file(Path(path).resolve())
+        return git_dir is not None and self.repo_path.name in git_dir
 
     def create_worktree(self, path: str, commitish: Optional[str] = None) -> None:
         """Create a new worktree."""
+        if self._add_worktree_in_process(path, commitish):
+            return
+
         args = ['git', 'worktree', 'add', path]
         if commitish:
             args.append(commitish)
@@ -225,6 +386,55 @@ class DDWorktreeRepo:
         if result.returncode != 0:
             raise DDWorktreeError(f"Failed to create worktree: {result.stderr}")
 
+    def _add_worktree_in_process(self, path: str, commitish: Optional[str]) -> bool:
+        """Add a worktree through pygit2 when that matches `git worktree add`.
+
+        Only branch checkouts into a new directory are handled, the same way
+        git picks the branch: the named local branch, or one named after the
+        directory (created from HEAD if missing). Returns False whenever git
+        has to do it instead: pygit2 missing, a detached commit, an existing
+        path or worktree name, or a post-checkout hook or external filter
+        driver (git-lfs, for one) that libgit2 won't run.
+        """
+        if _pygit2 is None:
+            return False
+
+        target = os.path.join(os.fspath(self.repo_path), path)
+        name = os.path.basename(os.path.normpath(target))
+        if os.path.lexists(target):
+            return False
+
+        try:
+            if self._libgit2_repo is None:
+                self._libgit2_repo = _pygit2.Repository(os.fspath(self.repo_path))
+            repository = self._libgit2_repo
+
+            # Entry names come back with section and key lowercased
+            config_names = {entry.name.lower() for entry in repository.config}
+            if 'core.hookspath' in config_names:
+                return False
+            # libgit2 skips clean/smudge/process filters, so e.g. git-lfs
+            # files would be checked out as pointer files
+            if any(
+                name.startswith('filter.') and name.endswith(('.smudge', '.process'))
+                for name in config_names
+            ):
+                return False
+            if os.path.exists(os.path.join(repository.path, 'hooks', 'post-checkout')):
+                return False
+            # git would pick a suffixed admin name; leave that to git
+            if name in repository.list_worktrees():
+                return False
+
+            branch = repository.branches.local.get(commitish or name)
+            if commitish and branch is None:
+                return False
+
+            repository.add_worktree(name, target, branch)
+        except _pygit2.GitError as e:
+            raise DDWorktreeError(f"Failed to create worktree: {e}")
+        return True
+
     def remove_worktree(self, path: str, force: bool = False) -> None:
         """Remove a worktree."""
         args = ['git', 'worktree', 'remove']
@@ -238,26 +448,19 @@ class DDWorktreeRepo:
 
     def get_local_suffix(self) -> str:
         """Get the local suffix from configuration."""
-        return self.get_option('local_suffix', '-local')
+        if self._local_suffix is None:
+            self._local_suffix = self.get_option('local_suffix', '-local')
+        return self._local_suffix
 
     def create_local_gitignore(self, worktree_path: str) -> None:
         """Create .gitignore-local file in a worktree."""
-        local_ignore_path = Path(worktree_path) / '.gitignore-local'
-        if not local_ignore_path.exists():
-            # Create basic .gitignore-local with common local files
-            basic_ignores = [
-                "# Local files that should not be committed globally",
-                "*.local",
-                "*.env.local",
-                "*.secrets",
-                "config/local/",
-                "logs/",
-                "tmp/",
-                ".env",
-                ".env.local",
-                ".env.development.local",
-                ".env.test.local",
-                ".env.production.local"
-            ]
-            with open(local_ignore_path, 'w') as f:
-                f.write('\n'.join(basic_ignores) + '\n')
\ No newline at end of file
+        local_ignore_path = os.path.join(worktree_path, '.gitignore-local')
+        # O_EXCL leaves an existing file untouched without a separate check
+        try:
+            fd = os.open(local_ignore_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return
+        try:
+            os.write(fd, _LOCAL_GITIGNORE_TEMPLATE)
+        finally:
+            os.close(fd)
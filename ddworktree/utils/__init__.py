@@ -5,35 +5,92 @@ Utility modules for ddworktree.
 from .gitignore import (
     parse_gitignore,
     get_combined_gitignore_patterns,
+    get_ignore_regex,
     is_ignored_by_pattern,
+    compile_patterns,
     get_tracked_files,
-    get_git_status
+    get_tracked_files_git,
+    get_git_status,
+    get_git_status_many,
+    get_git_status_counts_many
 )
 
 from .diff import (
     WorktreeDiff,
     get_commit_hash,
+    get_commit_hashes,
     compare_commits,
     get_file_differences,
+    get_file_differences_git,
+    get_path_differences,
     detect_drift,
+    is_trivially_in_sync,
     sync_files,
     generate_diff_report
 )
 
+from .iostat import path_exists, probe_paths
+from .refs import read_head_commit, find_git_dir, read_gitdir_file
+from .rmtree import fast_rmtree, parallel_rmtree
+from .batch import chunk_paths
+from .worktree import is_local_worktree, get_paired_worktree, is_git_worktree, is_dirty
+
+from .session import (
+    PLUMBING_ENV,
+    COMMAND_ENV,
+    GitSession,
+    get_session,
+    close_sessions
+)
+
 __all__ = [
     # gitignore utilities
     'parse_gitignore',
     'get_combined_gitignore_patterns',
+    'get_ignore_regex',
     'is_ignored_by_pattern',
+    'compile_patterns',
     'get_tracked_files',
+    'get_tracked_files_git',
     'get_git_status',
+    'get_git_status_many',
+    'get_git_status_counts_many',
 
     # diff utilities
     'WorktreeDiff',
     'get_commit_hash',
+    'get_commit_hashes',
     'compare_commits',
     'get_file_differences',
+    'get_file_differences_git',
+    'get_path_differences',
     'detect_drift',
+    'is_trivially_in_sync',
     'sync_files',
-    'generate_diff_report'
+    'generate_diff_report',
+
+    # filesystem utilities
+    'path_exists',
+    'probe_paths',
+    'parallel_rmtree',
+    'fast_rmtree',
+    'read_head_commit',
+    'find_git_dir',
+    'read_gitdir_file',
+
+    # batching utilities
+    'chunk_paths',
+
+    # worktree pairing utilities
+    'is_local_worktree',
+    'get_paired_worktree',
+    'is_git_worktree',
+    'is_dirty',
+
+    # git session utilities
+    'PLUMBING_ENV',
+    'COMMAND_ENV',
+    'GitSession',
+    'get_session',
+    'close_sessions'
 ]
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Helpers for passing many paths to a single git invocation.
+"""
+
+from typing import Iterator, List, Sequence
+
+# Keep each command line well under ARG_MAX (and Windows' 32K limit)
+_MAX_BATCH_PATHS = 500
+_MAX_BATCH_BYTES = 24 * 1024
+
+
+def chunk_paths(
+    paths: Sequence[str],
+    max_paths: int = _MAX_BATCH_PATHS,
+    max_bytes: int = _MAX_BATCH_BYTES
+) -> Iterator[List[str]]:
+    """Split paths into batches small enough for one command line each."""
+    batch: List[str] = []
+    batch_bytes = 0
+
+    for path in paths:
+        path_bytes = len(path.encode('utf-8', 'surrogateescape')) + 1
+        if batch and (len(batch) >= max_paths or batch_bytes + path_bytes > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(path)
+        batch_bytes += path_bytes
+
+    if batch:
+        yield batch
@@ -2,39 +2,79 @@
 Utilities for detecting drift and comparing worktrees.
 """
 
+import os
+import shutil
 import subprocess
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, Iterable, List, Tuple, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+from .refs import read_head_commit
+from .session import get_session
 
-@dataclass
+# Contents are compared this many bytes at a time
+_COMPARE_CHUNK_SIZE = 64 * 1024
+# Below this many same-size files, handing comparisons to threads isn't worth it
+_PARALLEL_COMPARE_THRESHOLD = 32
+_MAX_COMPARE_WORKERS = 8
+# Files above this size get a sequential read-ahead hint before comparing
+_SEQUENTIAL_HINT_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
 class WorktreeDiff:
     """Represents differences between two worktrees."""
-    added_files: List[str]
-    deleted_files: List[str]
-    modified_files: List[str]
+    # Slots instead of a per-instance __dict__ (dataclass(slots=True) needs 3.10)
+    __slots__ = (
+        'added_files', 'deleted_files', 'modified_files',
+        'commit_drift', 'main_commit', 'local_commit'
+    )
+
+    added_files: Tuple[str, ...]
+    deleted_files: Tuple[str, ...]
+    modified_files: Tuple[str, ...]
     commit_drift: bool
     main_commit: Optional[str]
     local_commit: Optional[str]
 
 
+_REV_PARSE_HEAD = ('git', 'rev-parse', 'HEAD')
+
+
 def get_commit_hash(directory: Path) -> Optional[str]:
     """Get the current commit hash for a directory."""
+    # Reading HEAD and the ref it names avoids a git process in the common case
+    commit = read_head_commit(directory)
+    if commit is not None:
+        return commit
+
+    if 'GIT_DIR' not in os.environ:
+        # The worktree's long-lived cat-file process answers repeated
+        # lookups (an unborn branch, reftable refs) without a fork each
+        return get_session(directory).rev_parse('HEAD')
+
     try:
+        # Read bytes: an object name needs no locale-aware text decoding
         result = subprocess.run(
-            ['git', 'rev-parse', 'HEAD'],
+            _REV_PARSE_HEAD,
             cwd=directory,
-            capture_output=True,
-            text=True
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
         )
         if result.returncode == 0:
-            return result.stdout.strip()
+            return result.stdout.strip().decode('ascii')
     except (subprocess.SubprocessError, FileNotFoundError):
         pass
     return None
 
 
+def get_commit_hashes(directories: Iterable[Path]) -> Dict[Path, Optional[str]]:
+    """Get the current commit hash for several directories."""
+    return {directory: get_commit_hash(directory) for directory in dict.fromkeys(directories)}
+
+
 def compare_commits(main_dir: Path, local_dir: Path) -> Tuple[bool, Optional[str], Optional[str]]:
     """Compare commit hashes between two worktrees."""
     main_commit = get_commit_hash(main_dir)
@@ -46,82 +86,303 @@ def compare_commits(main_dir: Path, local_dir: Path) -> Tuple[bool, Optional[str
 
 def get_file_differences(main_dir: Path, local_dir: Path) -> Tuple[List[str], List[str], List[str]]:
     """Get file differences between two directories."""
-    import os
+    main_files = _scan_files(main_dir)
+    local_files = _scan_files(local_dir)
+
+    added_files = [file_path for file_path in local_files if file_path not in main_files]
+    deleted_files = [file_path for file_path in main_files if file_path not in local_files]
+
+    # Files of different sizes differ without reading a byte, so only
+    # same-size pairs need their contents compared
+    modified_files = []
+    same_size = []
+    for file_path, main_size in main_files.items():
+        if file_path not in local_files:
+            continue
+        if main_size is not None and main_size == local_files[file_path]:
+            same_size.append(file_path)
+        else:
+            modified_files.append(file_path)
+
+    def differs(file_path: str) -> bool:
+        return _files_differ(
+            os.path.join(main_dir, file_path), os.path.join(local_dir, file_path)
+        )
+
+    if len(same_size) < _PARALLEL_COMPARE_THRESHOLD:
+        modified_files.extend(file_path for file_path in same_size if differs(file_path))
+    else:
+        # File reads release the GIL, so comparisons overlap on a small pool
+        with ThreadPoolExecutor(max_workers=_MAX_COMPARE_WORKERS) as executor:
+            modified_files.extend(
+                file_path
+                for file_path, changed in zip(same_size, executor.map(differs, same_size))
+                if changed
+            )
+
+    return added_files, deleted_files, modified_files
 
-    def get_files_recursive(directory: Path) -> Dict[str, str]:
-        files = {}
-        for root, dirs, filenames in os.walk(directory):
-            if '.git' in dirs:
-                dirs.remove('.git')
-            for filename in filenames:
-                filepath = Path(root) / filename
-                relative_path = filepath.relative_to(directory)
-                files[str(relative_path)] = str(filepath)
-        return files
 
-    main_files = get_files_recursive(main_dir)
-    local_files = get_files_recursive(local_dir)
+def get_file_differences_git(
+    main_dir: Path,
+    local_dir: Path
+) -> Optional[Tuple[List[str], List[str], List[str]]]:
+    """Get file differences with `git diff --no-index`, or None if git can't be used.
 
-    main_set = set(main_files.keys())
-    local_set = set(local_files.keys())
+    Git walks and compares both trees in C. Its view is narrowed to match
+    get_file_differences: .git entries and symlinked directories are
+    dropped, and reported modifications are confirmed byte for byte so
+    mode-only or symlink-only changes don't count.
+    """
+    main_root = os.path.normpath(main_dir)
+    local_root = os.path.normpath(local_dir)
 
-    added_files = list(local_set - main_set)
-    deleted_files = list(main_set - local_set)
-    common_files = main_set & local_set
+    # git can't be told to skip .git, and walking a repository's object
+    # store would cost more than the scan saves
+    if os.path.isdir(os.path.join(main_root, '.git')) or os.path.isdir(os.path.join(local_root, '.git')):
+        return None
 
+    try:
+        result = subprocess.run(
+            ['git', 'diff', '--no-index', '--no-renames', '--name-status', '-z',
+             '--', main_root, local_root],
+            stdin=subprocess.DEVNULL,
+            capture_output=True
+        )
+    except OSError:
+        return None
+
+    # 0 means no differences, 1 means some; anything else is an error
+    if result.returncode not in (0, 1):
+        return None
+
+    prefixes = {
+        os.fsencode(main_root).replace(b'\\', b'/') + b'/': main_root,
+        os.fsencode(local_root).replace(b'\\', b'/') + b'/': local_root,
+    }
+
+    added_files = []
+    deleted_files = []
     modified_files = []
-    for file_path in common_files:
-        # Compare file contents
+    fields = result.stdout.split(b'\0')
+
+    for status, raw_path in zip(fields[0::2], fields[1::2]):
+        # Longest prefix first, in case one tree lies inside the other
+        for prefix, root in sorted(prefixes.items(), key=lambda item: -len(item[0])):
+            if raw_path.startswith(prefix):
+                break
+        else:
+            return None
+
+        relative_path = os.fsdecode(raw_path[len(prefix):]).replace('/', os.sep)
+        if '.git' in relative_path.split(os.sep):
+            continue
+
+        if status in (b'A', b'D'):
+            if os.path.isdir(os.path.join(root, relative_path)):
+                continue
+            (added_files if status == b'A' else deleted_files).append(relative_path)
+        elif _files_differ(os.path.join(main_root, relative_path), os.path.join(local_root, relative_path)):
+            modified_files.append(relative_path)
+
+    return added_files, deleted_files, modified_files
+
+
+def _scan_files(directory: Path) -> Dict[str, Optional[int]]:
+    """Map each file's relative path to its size (None if it can't be stat'ed)."""
+    files = {}
+    pending = [(os.fspath(directory), '')]
+
+    while pending:
+        path, prefix = pending.pop()
         try:
-            with open(main_files[file_path], 'r') as f1, open(local_files[file_path], 'r') as f2:
-                if f1.read() != f2.read():
-                    modified_files.append(file_path)
-        except (OSError, UnicodeDecodeError):
-            # Binary files or read errors - consider them different
+            entries = os.scandir(path)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                # Skip git's metadata, be it a directory or a worktree's .git file
+                if entry.name == '.git':
+                    continue
+
+                relative_path = prefix + entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    # Like os.walk, symlinked directories are not descended into
+                    if not entry.is_symlink():
+                        pending.append((entry.path, relative_path + os.sep))
+                    continue
+
+                try:
+                    files[relative_path] = entry.stat().st_size
+                except OSError:
+                    files[relative_path] = None
+
+    return files
+
+
+def get_path_differences(
+    main_dir: Path,
+    local_dir: Path,
+    paths: Iterable[str]
+) -> Tuple[List[str], List[str], List[str]]:
+    """Get file differences between two directories, limited to the given paths."""
+    def is_file(path: str) -> bool:
+        # Same notion of a file as the full scan: anything that is not a directory
+        return os.path.lexists(path) and not os.path.isdir(path)
+
+    added_files = []
+    deleted_files = []
+    modified_files = []
+
+    for file_path in dict.fromkeys(paths):
+        main_file = os.path.join(main_dir, file_path)
+        local_file = os.path.join(local_dir, file_path)
+        in_main = is_file(main_file)
+        in_local = is_file(local_file)
+
+        if in_local and not in_main:
+            added_files.append(file_path)
+        elif in_main and not in_local:
+            deleted_files.append(file_path)
+        elif in_main and in_local and _files_differ(main_file, local_file):
             modified_files.append(file_path)
 
     return added_files, deleted_files, modified_files
 
 
-def detect_drift(main_dir: Path, local_dir: Path) -> WorktreeDiff:
-    """Detect drift between two worktrees."""
+def _files_differ(main_file: str, local_file: str) -> bool:
+    """Compare file contents, reading both in chunks until they diverge."""
+    try:
+        with open(main_file, 'rb') as f1, open(local_file, 'rb') as f2:
+            size = os.fstat(f1.fileno()).st_size
+            if size != os.fstat(f2.fileno()).st_size:
+                return True
+            if size > _SEQUENTIAL_HINT_SIZE:
+                _advise_sequential(f1.fileno())
+                _advise_sequential(f2.fileno())
+            while True:
+                chunk = f1.read(_COMPARE_CHUNK_SIZE)
+                if chunk != f2.read(_COMPARE_CHUNK_SIZE):
+                    return True
+                if not chunk:
+                    return False
+    except OSError:
+        # Read errors - consider them different
+        return True
+
+
+def _advise_sequential(fd: int) -> None:
+    """Ask the kernel for aggressive read-ahead on a file read front to back."""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            # Only a hint; some filesystems don't support it
+            pass
+
+
+def detect_drift(
+    main_dir: Path,
+    local_dir: Path,
+    paths: Optional[Iterable[str]] = None
+) -> WorktreeDiff:
+    """Detect drift between two worktrees, optionally checking only some paths."""
     # Check commit alignment
     has_commit_drift, main_commit, local_commit = compare_commits(main_dir, local_dir)
 
     # Check file differences
-    added_files, deleted_files, modified_files = get_file_differences(main_dir, local_dir)
-
+    if paths is None:
+        differences = get_file_differences_git(main_dir, local_dir)
+        if differences is None:
+            differences = get_file_differences(main_dir, local_dir)
+        added_files, deleted_files, modified_files = differences
+    else:
+        added_files, deleted_files, modified_files = get_path_differences(main_dir, local_dir, paths)
+
+    # Sorted, so results don't depend on directory listing order
     return WorktreeDiff(
-        added_files=added_files,
-        deleted_files=deleted_files,
-        modified_files=modified_files,
+        added_files=tuple(sorted(added_files)),
+        deleted_files=tuple(sorted(deleted_files)),
+        modified_files=tuple(sorted(modified_files)),
         commit_drift=has_commit_drift,
         main_commit=main_commit,
         local_commit=local_commit
     )
 
 
+# Anything listed here (changes, untracked or ignored files) means the
+# working tree may differ from its commit
+_CLEAN_CHECK_ARGS = [
+    'git', '--no-optional-locks', 'status', '--porcelain', '--ignored',
+    '--untracked-files=normal'
+]
+
+
+def is_trivially_in_sync(main_dir: Path, local_dir: Path) -> bool:
+    """Check whether both worktrees are on the same commit with nothing else on disk.
+
+    This is a cheap pre-check for detect_drift: a False result only means
+    the full comparison is needed.
+    """
+    directories = (main_dir, local_dir)
+
+    # Start both status processes first so they run while HEAD is resolved
+    status_processes = [
+        subprocess.Popen(
+            _CLEAN_CHECK_ARGS,
+            cwd=directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        for directory in directories
+    ]
+
+    try:
+        main_head = get_commit_hash(main_dir)
+        if not main_head or main_head != get_commit_hash(local_dir):
+            return False
+
+        for process in status_processes:
+            # The first byte of output is enough to know the tree is not clean
+            if process.stdout.read(1) or process.wait() != 0:
+                return False
+        return True
+    finally:
+        for process in status_processes:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            process.stdout.close()
+
+
 def sync_files(source_dir: Path, target_dir: Path, files_to_sync: List[str], dry_run: bool = False) -> List[str]:
     """Sync files from source to target directory."""
-    import shutil
-
     synced_files = []
 
     for file_path in files_to_sync:
-        source_file = source_dir / file_path
-        target_file = target_dir / file_path
+        source_file = os.path.join(source_dir, file_path)
+        target_file = os.path.join(target_dir, file_path)
 
-        if not source_file.exists():
+        if not os.path.exists(source_file):
             continue
 
-        # Create target directory if it doesn't exist
-        target_file.parent.mkdir(parents=True, exist_ok=True)
+        # A target that already holds the same bytes needs no copy
+        if os.path.exists(target_file) and not _files_differ(source_file, target_file):
+            continue
 
         if dry_run:
             synced_files.append(f"Would copy: {file_path}")
         else:
             try:
-                shutil.copy2(source_file, target_file)
+                # Create target directory if it doesn't exist
+                os.makedirs(os.path.dirname(target_file), exist_ok=True)
+                _copy_file(source_file, target_file)
                 synced_files.append(f"Copied: {file_path}")
             except (OSError, shutil.Error) as e:
                 synced_files.append(f"Failed to copy {file_path}: {e}")
@@ -129,9 +390,33 @@ def sync_files(source_dir: Path, target_dir: Path, files_to_sync: List[str], dry
     return synced_files
 
 
+def _copy_file(source_file: str, target_file: str) -> None:
+    """Copy contents and metadata like shutil.copy2, with the kernel moving the bytes."""
+    # copy_file_range (Linux) copies inside the kernel and can share extents
+    # on filesystems with reflinks; shutil.copyfile covers everything else,
+    # including filesystems or file pairs the call rejects
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(source_file, 'rb') as source, open(target_file, 'wb') as target:
+                remaining = os.fstat(source.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(source.fileno(), target.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+        except OSError:
+            shutil.copyfile(source_file, target_file)
+    else:
+        shutil.copyfile(source_file, target_file)
+
+    shutil.copystat(source_file, target_file)
+
+
 def generate_diff_report(drift: WorktreeDiff) -> str:
     """Generate a human-readable diff report."""
-    report = []
+    # Collect lines and join once; reports can list thousands of files.
+    # File tuples come sorted from detect_drift, so list them as-is
+    report: List[str] = []
 
     if drift.commit_drift:
         report.append("🔄 Commit drift detected:")
@@ -143,23 +428,20 @@ def generate_diff_report(drift: WorktreeDiff) -> str:
 
     if drift.added_files:
         report.append("➕ Files added in local:")
-        for file in sorted(drift.added_files):
-            report.append(f"  {file}")
+        report.extend(f"  {file}" for file in drift.added_files)
         report.append("")
 
     if drift.deleted_files:
         report.append("➖ Files deleted in local:")
-        for file in sorted(drift.deleted_files):
-            report.append(f"  {file}")
+        report.extend(f"  {file}" for file in drift.deleted_files)
         report.append("")
 
     if drift.modified_files:
         report.append("✏️  Files modified:")
-        for file in sorted(drift.modified_files):
-            report.append(f"  {file}")
+        report.extend(f"  {file}" for file in drift.modified_files)
         report.append("")
 
-    if not any([drift.commit_drift, drift.added_files, drift.deleted_files, drift.modified_files]):
+    if not (drift.commit_drift or drift.added_files or drift.deleted_files or drift.modified_files):
         report.append("✅ No drift detected - worktrees are in sync")
 
     return '\n'.join(report)
\ No newline at end of file
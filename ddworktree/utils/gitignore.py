@@ -2,13 +2,30 @@
 Utilities for parsing and comparing .gitignore files.
 """
 
+import functools
 import os
+import re
+import subprocess
+import tempfile
 from pathlib import Path
-from typing import Set, List, Optional
+from typing import Callable, Dict, FrozenSet, Set, List, Optional, Pattern, Tuple, Union
+
+# Optional RE2 bindings (google-re2): its DFA matches a pattern union in
+# time linear in the path, however many patterns the union holds
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = None
 
 
 def parse_gitignore(gitignore_path: Path) -> Set[str]:
     """Parse a .gitignore file and return set of patterns."""
+    # The parse is reused until the file changes on disk
+    return set(_load_patterns(os.fspath(gitignore_path), _file_version(gitignore_path)))
+
+
+def _read_gitignore(gitignore_path: Path) -> Set[str]:
+    """Read the patterns of one ignore file."""
     patterns = set()
 
     if not gitignore_path.exists():
@@ -27,42 +44,149 @@ def parse_gitignore(gitignore_path: Path) -> Set[str]:
 
 def get_combined_gitignore_patterns(directory: Path) -> Set[str]:
     """Get combined patterns from .gitignore and .gitignore-local."""
-    patterns = set()
+    return set(_combined_patterns(directory))
 
-    # Standard .gitignore
-    gitignore_path = directory / '.gitignore'
-    patterns.update(parse_gitignore(gitignore_path))
 
-    # Local .gitignore-local
-    gitignore_local_path = directory / '.gitignore-local'
-    patterns.update(parse_gitignore(gitignore_local_path))
+def get_ignore_regex(directory: Path) -> Pattern[str]:
+    """Get the compiled patterns of a directory's ignore files for is_ignored_by_pattern."""
+    return _compile_pattern_union(_combined_patterns(directory))
 
-    return patterns
 
+def _combined_patterns(directory: Path) -> FrozenSet[str]:
+    """Get the shared, cached pattern set of a directory's ignore files."""
+    gitignore_path = os.path.join(directory, '.gitignore')
+    gitignore_local_path = os.path.join(directory, '.gitignore-local')
+
+    # Results are reused until either file changes on disk
+    return _load_combined_patterns(
+        gitignore_path, _file_version(gitignore_path),
+        gitignore_local_path, _file_version(gitignore_local_path)
+    )
+
+
+def _file_version(path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+    """Identify a file's current contents by mtime and size (None if missing)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_combined_patterns(
+    gitignore_path: str,
+    gitignore_version: Optional[Tuple[int, int]],
+    gitignore_local_path: str,
+    gitignore_local_version: Optional[Tuple[int, int]]
+) -> FrozenSet[str]:
+    """Combine both ignore files; the versions only serve as cache keys."""
+    # Standard .gitignore, then local .gitignore-local; each file's parse is
+    # cached on its own, so editing one doesn't re-read the other
+    return (
+        _load_patterns(gitignore_path, gitignore_version)
+        | _load_patterns(gitignore_local_path, gitignore_local_version)
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _load_patterns(path: str, version: Optional[Tuple[int, int]]) -> FrozenSet[str]:
+    """Parse one ignore file; the version only serves as a cache key."""
+    if version is None:
+        return frozenset()
+    return frozenset(_read_gitignore(Path(path)))
+
+
+def is_ignored_by_pattern(
+    file_path: Union[str, Path],
+    patterns: Union[Set[str], FrozenSet[str], Pattern[str]]
+) -> bool:
+    """Check if a file matches any ignore pattern.
+
+    `patterns` may be a set of patterns or the result of compile_patterns;
+    callers checking many files should compile once and pass the regex.
+    """
+    # Compiled unions may be re or re2 objects; both have search()
+    if not hasattr(patterns, 'search'):
+        patterns = compile_patterns(patterns)
+    return patterns.search(_pattern_subject(file_path)) is not None
 
-def is_ignored_by_pattern(file_path: Path, patterns: Set[str]) -> bool:
-    """Check if a file matches any ignore pattern."""
-    relative_path = file_path.name
-
-    for pattern in patterns:
-        if pattern.endswith('/'):
-            # Directory pattern
-            if file_path.parent.name == pattern.rstrip('/'):
-                return True
-        elif pattern.startswith('*.'):
-            # Extension pattern
-            if relative_path.endswith(pattern[1:]):
-                return True
-        elif pattern.startswith('/'):
-            # Absolute path pattern
-            if str(file_path).endswith(pattern[1:]):
-                return True
-        else:
-            # Simple pattern
-            if pattern in relative_path:
-                return True
 
-    return False
+def compile_patterns(
+    patterns: Union[Set[str], FrozenSet[str]],
+    path_prefix: bool = False
+) -> Pattern[str]:
+    """Fold ignore patterns into one regex for is_ignored_by_pattern.
+
+    Directory patterns ("build/") match the parent directory name and
+    extension patterns ("*.pyc") the end of the file name. By default an
+    anchored pattern ("/config") matches the end of the path and any other
+    pattern a substring of the file name. With path_prefix, the rules the
+    add and rm commands use, an anchored pattern matches the start of the
+    path and any other pattern a substring of the whole path.
+    """
+    return _compile_pattern_union(frozenset(patterns), path_prefix)
+
+
+def _pattern_subject(file_path: Union[str, Path]) -> str:
+    """Build the "<parent name>\0<path>\0<name>" string the pattern union matches."""
+    # NUL can't occur in a path, so every alternative stays within its field.
+    # Splitting the string once is cheaper than building Path.parent
+    path = os.fspath(file_path)
+    directory, name = os.path.split(path)
+    return f"{os.path.basename(directory)}\0{path}\0{name}"
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_pattern_union(patterns: FrozenSet[str], path_prefix: bool = False) -> Pattern[str]:
+    """Translate each pattern into a regex fragment and join them."""
+    if not patterns:
+        # An empty union never matches
+        return re.compile('(?!)')
+
+    # The parent name field, which also starts the path field
+    path_field = r'\A' + '[^\0]*\0'
+
+    def alternatives(end: str) -> List[str]:
+        fragments = []
+        for pattern in sorted(patterns):
+            if pattern.endswith('/'):
+                # Directory pattern: the whole parent directory name
+                fragments.append(r'\A' + re.escape(pattern.rstrip('/')) + '\0')
+            elif pattern.startswith('*.'):
+                # Extension pattern: the end of the file name
+                fragments.append(re.escape(pattern[1:]) + end)
+            elif pattern.startswith('/'):
+                if path_prefix:
+                    # Absolute path pattern: the start of the path
+                    fragments.append(path_field + re.escape(pattern[1:]))
+                else:
+                    # Absolute path pattern: the end of the path
+                    fragments.append(re.escape(pattern[1:]) + '\0[^\0]*' + end)
+            elif path_prefix:
+                # Simple pattern: anywhere in the path (the name is its suffix)
+                fragments.append(path_field + '[^\0]*' + re.escape(pattern))
+            else:
+                # Simple pattern: anywhere in the file name
+                fragments.append('\0[^\0]*' + re.escape(pattern) + '[^\0]*' + end)
+        return fragments
+
+    return _compile_alternation(alternatives)
+
+
+def _compile_alternation(alternatives: Callable[[str], List[str]]) -> Pattern[str]:
+    """Compile regex alternatives with RE2 when it is installed, else with re.
+
+    `alternatives` builds the fragments given the end-of-text assertion,
+    which RE2 spells \\z and re (before 3.14) only accepts as \\Z. Unions
+    RE2 refuses (e.g. over its memory budget) are compiled with re instead.
+    """
+    if _re2 is not None:
+        try:
+            return _re2.compile('(?:' + '|'.join(alternatives(r'\z')) + ')')
+        except _re2.error:
+            pass
+    return re.compile('(?:' + '|'.join(alternatives(r'\Z')) + ')')
 
 
 def get_tracked_files(directory: Path, include_ignored: bool = False) -> List[Path]:
@@ -71,75 +195,244 @@ def get_tracked_files(directory: Path, include_ignored: bool = False) -> List[Pa
 
     if include_ignored:
         # Include all files
-        for root, dirs, files in os.walk(directory):
-            # Skip .git directory
-            if '.git' in dirs:
-                dirs.remove('.git')
-
-            for file in files:
-                file_path = Path(root) / file
-                tracked_files.append(file_path)
+        ignore_regex = None
+        pruned_names: FrozenSet[str] = frozenset()
     else:
-        # Only include non-ignored files
-        patterns = get_combined_gitignore_patterns(directory)
+        # Only include non-ignored files; directories named by a directory
+        # pattern are skipped whole instead of walked and filtered file by file
+        patterns = _combined_patterns(directory)
+        ignore_regex = _compile_pattern_union(patterns)
+        pruned_names = _directory_pattern_names(patterns)
 
-        for root, dirs, files in os.walk(directory):
-            # Skip .git directory
-            if '.git' in dirs:
-                dirs.remove('.git')
+    # DirEntry answers is_dir() from the directory listing, so unlike
+    # os.walk nothing is stat'ed just to tell files from directories
+    pending = [os.fspath(directory)]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            continue
 
-            for file in files:
-                file_path = Path(root) / file
-                if not is_ignored_by_pattern(file_path, patterns):
-                    tracked_files.append(file_path)
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    # Skip .git directory; like os.walk, don't follow links
+                    if entry.name != '.git' and entry.name not in pruned_names and not entry.is_symlink():
+                        pending.append(entry.path)
+                elif ignore_regex is None or not ignore_regex.search(_pattern_subject(entry.path)):
+                    tracked_files.append(Path(entry.path))
 
     return tracked_files
 
 
+@functools.lru_cache(maxsize=32)
+def _directory_pattern_names(patterns: FrozenSet[str]) -> FrozenSet[str]:
+    """Get the directory names named by directory patterns ("build/")."""
+    return frozenset(pattern.rstrip('/') for pattern in patterns if pattern.endswith('/'))
+
+
+def get_tracked_files_git(directory: Path, include_ignored: bool = False) -> List[Path]:
+    """Get the same file list as get_tracked_files from `git ls-files`.
+
+    Git applies the full ignore rules (anchors, negation, nested .gitignore
+    files and .git/info/exclude) in C, plus the directory's .gitignore-local
+    as the walk does. Unlike the walk, files that are tracked but match an
+    ignore pattern are listed, since git only ignores untracked files.
+    Falls back to the Python walk when git is unavailable or the directory
+    is not inside a work tree.
+    """
+    list_args = ['git', 'ls-files', '-z', '--cached', '--others']
+    if not include_ignored:
+        list_args.append('--exclude-standard')
+        # Git doesn't know about .gitignore-local; the walk applies it too
+        local_ignore = os.path.join(directory, '.gitignore-local')
+        if os.path.isfile(local_ignore):
+            list_args.append(f'--exclude-from={local_ignore}')
+
+    try:
+        # Tracked files missing from disk are listed too, so ask for those
+        # alongside and drop them, as the walk would never see them
+        processes = [
+            subprocess.Popen(
+                args,
+                cwd=directory,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            for args in (list_args, ['git', 'ls-files', '-z', '--deleted'])
+        ]
+    except OSError:
+        return get_tracked_files(directory, include_ignored)
+
+    outputs = []
+    for process in processes:
+        stdout, _ = process.communicate()
+        outputs.append(stdout)
+
+    if any(process.returncode != 0 for process in processes):
+        return get_tracked_files(directory, include_ignored)
+
+    listed, deleted = (os.fsdecode(output).split('\0') for output in outputs)
+    deleted_paths = set(deleted)
+
+    # Untracked nested repositories are listed as "<dir>/"; skip those
+    return [
+        directory / path
+        for path in dict.fromkeys(listed)
+        if path and not path.endswith('/') and path not in deleted_paths
+    ]
+
+
+# Read-only status: don't refresh the index on disk (no lock contention with
+# concurrent git commands), skip the ahead/behind walk, and list untracked
+# directories without descending into them. The NUL-separated v2 format
+# needs no unquoting and keeps the path apart from the status fields
+_STATUS_V2_ARGS = [
+    'git', '--no-optional-locks', 'status', '--porcelain=v2', '-z',
+    '--no-ahead-behind', '--untracked-files=normal'
+]
+
+_STATUS_CATEGORIES = ('modified', 'added', 'deleted', 'untracked', 'renamed', 'copied')
+
+# Category by status letter, for entries that aren't modified
+_CATEGORY_BY_CODE = {
+    ord('A'): 'added', ord('D'): 'deleted', ord('R'): 'renamed', ord('C'): 'copied'
+}
+
+# Number of space-separated fields before the path in each v2 record type
+_FIELDS_BEFORE_PATH = {b'1': 8, b'2': 9, b'u': 10, b'?': 1}
+
+
 def get_git_status(directory: Path) -> dict:
     """Get git status for a directory."""
-    import subprocess
-
     result = subprocess.run(
-        ['git', 'status', '--porcelain'],
+        _STATUS_V2_ARGS,
         cwd=directory,
-        capture_output=True,
-        text=True
+        capture_output=True
     )
 
     if result.returncode != 0:
-        return {'error': result.stderr}
-
-    status = {
-        'modified': [],
-        'added': [],
-        'deleted': [],
-        'untracked': [],
-        'renamed': [],
-        'copied': []
+        return {'error': result.stderr.decode('utf-8', 'replace')}
+
+    return _parse_status_records(result.stdout)
+
+
+def get_git_status_many(directories: List[Path]) -> Dict[Path, dict]:
+    """Get git status for several directories with the git processes running side by side."""
+    # Start every status first so the processes overlap, then collect them
+    processes = {
+        directory: subprocess.Popen(
+            _STATUS_V2_ARGS,
+            cwd=directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        for directory in dict.fromkeys(directories)
     }
 
-    for line in result.stdout.split('\n'):
-        line = line.strip()
-        if not line:
+    statuses = {}
+    for directory, process in processes.items():
+        stdout, stderr = process.communicate()
+        if process.returncode != 0:
+            statuses[directory] = {'error': stderr.decode('utf-8', 'replace')}
+        else:
+            statuses[directory] = _parse_status_records(stdout)
+
+    return statuses
+
+
+def _status_category(record: bytes) -> Optional[str]:
+    """Classify one v2 status record, or None if it fits no category.
+
+    XY sits after "<kind> "; v2 writes "." where v1 writes a space. Entries
+    changed in the work tree only are classified by their work tree letter.
+    """
+    kind = record[:1]
+    if kind == b'?':
+        return 'untracked'
+    if kind not in (b'1', b'2', b'u'):
+        return None
+
+    x, y = record[2], record[3]
+    if x == ord('M') or y == ord('M'):
+        return 'modified'
+    return _CATEGORY_BY_CODE.get(x if x != ord('.') else y)
+
+
+def _parse_status_records(output: bytes) -> dict:
+    """Parse `git status --porcelain=v2 -z` output into per-category file lists."""
+    status = {category: [] for category in _STATUS_CATEGORIES}
+    appenders = {category: files.append for category, files in status.items()}
+
+    records = iter(output.split(b'\0'))
+    for record in records:
+        kind = record[:1]
+        # Rename/copy records are followed by the original path
+        original = next(records, b'') if kind == b'2' else None
+
+        category = _status_category(record)
+        if category is None:
             continue
 
-        # Parse porcelain output
-        index_status = line[0] if len(line) > 0 else ' '
-        working_status = line[1] if len(line) > 1 else ' '
-        file_path = line[3:]
-
-        if index_status == 'M' or working_status == 'M':
-            status['modified'].append(file_path)
-        elif index_status == 'A':
-            status['added'].append(file_path)
-        elif index_status == 'D':
-            status['deleted'].append(file_path)
-        elif index_status == 'R':
-            status['renamed'].append(file_path)
-        elif index_status == 'C':
-            status['copied'].append(file_path)
-        elif index_status == '?' and working_status == '?':
-            status['untracked'].append(file_path)
-
-    return status
\ No newline at end of file
+        path = os.fsdecode(record.split(b' ', _FIELDS_BEFORE_PATH[kind])[-1])
+        if original is not None:
+            path = f"{os.fsdecode(original)} -> {path}"
+        appenders[category](path)
+
+    return status
+
+
+def get_git_status_counts_many(directories: List[Path]) -> Dict[Path, dict]:
+    """Count changed files per category for several directories without listing them."""
+    processes = {}
+    for directory in dict.fromkeys(directories):
+        # stderr goes to a file so an error flood can't block the stdout stream
+        stderr_file = tempfile.TemporaryFile()
+        processes[directory] = (subprocess.Popen(
+            _STATUS_V2_ARGS,
+            cwd=directory,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file
+        ), stderr_file)
+
+    statuses = {}
+    for directory, (process, stderr_file) in processes.items():
+        with process, stderr_file:
+            counts = _count_status_records(process.stdout)
+            if process.wait() != 0:
+                stderr_file.seek(0)
+                counts = {'error': stderr_file.read().decode('utf-8', 'replace')}
+        statuses[directory] = counts
+
+    return statuses
+
+
+def _count_status_records(stream) -> dict:
+    """Count `git status --porcelain=v2 -z` records by the categories of _parse_status_records."""
+    counts = dict.fromkeys(_STATUS_CATEGORIES, 0)
+    skip_next = False
+    pending = b''
+
+    for chunk in iter(lambda: stream.read(65536), b''):
+        records = (pending + chunk).split(b'\0')
+        pending = records.pop()
+
+        for record in records:
+            if skip_next:
+                # Rename/copy records are followed by the original path
+                skip_next = False
+                continue
+
+            skip_next = record[:1] == b'2'
+            category = _status_category(record)
+            if category is not None:
+                counts[category] += 1
+
+    return counts
@@ -0,0 +1,36 @@
+"""
+Batched filesystem metadata probes.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, TypeVar
+
+PathT = TypeVar('PathT')
+
+# Below this many paths, handing work to threads costs more than the stats
+_PARALLEL_THRESHOLD = 32
+_MAX_WORKERS = 8
+
+
+def path_exists(path) -> bool:
+    """Check whether a path exists with access(2) rather than a full stat."""
+    return os.access(path, os.F_OK)
+
+
+def probe_paths(
+    paths: Iterable[PathT],
+    probe: Callable[[PathT], bool] = os.path.exists
+) -> Dict[PathT, bool]:
+    """Run a metadata probe over many paths at once, each path only once.
+
+    Large batches are spread over a small thread pool; stat-family syscalls
+    release the GIL, so their latencies overlap instead of adding up.
+    """
+    unique_paths = list(dict.fromkeys(paths))
+
+    if len(unique_paths) < _PARALLEL_THRESHOLD:
+        return {path: probe(path) for path in unique_paths}
+
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        return dict(zip(unique_paths, executor.map(probe, unique_paths)))
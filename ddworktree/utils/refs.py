@@ -0,0 +1,109 @@
+"""
+Resolve HEAD by reading the repository files directly instead of running git.
+"""
+
+import functools
+import os
+import re
+from typing import Dict, Optional, Tuple, Union
+from pathlib import Path
+
+_OBJECT_NAME = re.compile(rb'[0-9a-f]{40}(?:[0-9a-f]{24})?')
+
+# Symbolic refs can point at other symbolic refs; git itself stops at 5
+_MAX_SYMREF_DEPTH = 5
+
+
+def read_head_commit(directory: Union[str, Path]) -> Optional[str]:
+    """Resolve HEAD of the worktree rooted at directory from its files.
+
+    Returns None whenever the answer is not certain from loose refs and
+    packed-refs alone (no .git at the root, GIT_DIR set, an unborn branch,
+    reftable storage, ...), so callers can fall back to `git rev-parse`.
+    """
+    if 'GIT_DIR' in os.environ:
+        return None
+
+    git_dir = find_git_dir(os.fspath(directory))
+    if git_dir is None:
+        return None
+
+    common_dir = _read_file(os.path.join(git_dir, 'commondir'))
+    if common_dir is not None:
+        common_dir = os.path.join(git_dir, os.fsdecode(common_dir.strip()))
+    else:
+        common_dir = git_dir
+
+    content = _read_file(os.path.join(git_dir, 'HEAD'))
+    for _ in range(_MAX_SYMREF_DEPTH):
+        if content is None:
+            return None
+        content = content.strip()
+
+        if not content.startswith(b'ref: '):
+            return content.decode('ascii') if _OBJECT_NAME.fullmatch(content) else None
+
+        ref = os.fsdecode(content[5:].strip())
+        if not ref.startswith('refs/') or '..' in ref.split('/'):
+            return None
+
+        # Per-worktree refs live in the worktree's git dir, all others in
+        # the common dir, either loose or in packed-refs
+        content = _read_file(os.path.join(git_dir, ref))
+        if content is None and common_dir != git_dir:
+            content = _read_file(os.path.join(common_dir, ref))
+        if content is None:
+            object_name = _packed_refs(common_dir).get(ref)
+            content = object_name.encode('ascii') if object_name else None
+
+    return None
+
+
+def find_git_dir(directory: Union[str, Path]) -> Optional[str]:
+    """Locate the git dir for a worktree root: .git itself or its gitdir: target."""
+    dot_git = os.path.join(directory, '.git')
+    if os.path.isdir(dot_git):
+        return dot_git
+    return read_gitdir_file(directory)
+
+
+def read_gitdir_file(directory: Union[str, Path]) -> Optional[str]:
+    """Get the git dir a linked worktree's .git file points to, or None."""
+    content = _read_file(os.path.join(directory, '.git'))
+    if content is None or not content.startswith(b'gitdir: '):
+        return None
+    return os.path.join(directory, os.fsdecode(content[8:].strip()))
+
+
+def _read_file(path: str) -> Optional[bytes]:
+    """Read a small file, or None if it can't be read as one."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _packed_refs(common_dir: str) -> Dict[str, str]:
+    """Get the packed refs of a repository, re-reading the file only when it changes."""
+    path = os.path.join(common_dir, 'packed-refs')
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    return _load_packed_refs(path, (st.st_mtime_ns, st.st_size))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_packed_refs(path: str, version: Tuple[int, int]) -> Dict[str, str]:
+    """Parse packed-refs; the version only serves as a cache key."""
+    refs = {}
+    content = _read_file(path) or b''
+    for line in content.splitlines():
+        # Skip the header and "^<peeled>" lines that follow annotated tags
+        if line[:1] in (b'#', b'^'):
+            continue
+        object_name, _, ref = line.partition(b' ')
+        if ref and _OBJECT_NAME.fullmatch(object_name):
+            refs[os.fsdecode(ref)] = object_name.decode('ascii')
+    return refs
@@ -0,0 +1,189 @@
+"""
+Recursive directory removal for large worktrees.
+"""
+
+import os
+import shutil
+import stat
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Union
+
+_MAX_WORKERS = 8
+
+# cmd.exe would interpret these itself, even inside a quoted argument
+_CMD_METACHARACTERS = set('&|<>^%"')
+
+
+def parallel_rmtree(path: Union[str, Path], max_workers: int = _MAX_WORKERS) -> None:
+    """Remove a directory tree, unlinking files on a thread pool.
+
+    The tree is walked with os.scandir while worker threads unlink the files
+    found so far; directories are removed deepest-first once they are empty.
+    Anything the fast path cannot remove (e.g. read-only entries on Windows)
+    is handed to shutil.rmtree, which raises if it fails too.
+    """
+    root = os.fspath(path)
+
+    # Match shutil.rmtree: refuse to follow a symlink to a directory
+    if os.path.islink(root):
+        raise OSError(f"Cannot call rmtree on a symbolic link: {root}")
+
+    directories: List[str] = []
+    pending = [root]
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            while pending:
+                directory = pending.pop()
+                directories.append(directory)
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        else:
+                            futures.append(executor.submit(os.unlink, entry.path))
+
+            for future in futures:
+                future.result()
+
+        # Parents were appended before their children, so reverse is bottom-up
+        for directory in reversed(directories):
+            os.rmdir(directory)
+    except OSError:
+        if os.path.lexists(root):
+            # onerror is deprecated from 3.12 in favour of onexc
+            if sys.version_info >= (3, 12):
+                shutil.rmtree(root, onexc=_clear_readonly)
+            else:
+                shutil.rmtree(root, onerror=_clear_readonly_exc_info)
+
+
+def _clear_readonly(function, path: str, exc: BaseException) -> None:
+    """Retry a failed removal after making the entry writable."""
+    if not os.access(path, os.W_OK):
+        os.chmod(path, stat.S_IWRITE)
+        function(path)
+    else:
+        raise exc
+
+
+def _clear_readonly_exc_info(function, path: str, exc_info) -> None:
+    """Adapt _clear_readonly to the onerror signature used before 3.12."""
+    _clear_readonly(function, path, exc_info[1])
+
+
+def fast_rmtree(path: Union[str, Path], fallback: bool = True) -> None:
+    """Remove a directory tree with the platform's native tool.
+
+    `rm -rf` (or `rd /s /q` on Windows) deletes large trees far faster than a
+    Python-level walk. If the tool is missing or leaves the tree behind, the
+    removal is finished with a scandir-based walk, or OSError is raised when
+    fallback is disabled.
+    """
+    root = os.fspath(path)
+
+    if os.path.islink(root):
+        raise OSError(f"Cannot call rmtree on a symbolic link: {root}")
+
+    if _remove_trivial_tree(root):
+        return
+
+    if os.name == 'nt':
+        command = ['cmd', '/c', 'rd', '/s', '/q', root]
+        native = not (_CMD_METACHARACTERS & set(root))
+    else:
+        command = ['rm', '-rf', '--', root]
+        native = True
+
+    if native:
+        try:
+            subprocess.run(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            pass
+
+        # rd reports success even when it leaves files behind, so check
+        if not os.path.lexists(root):
+            return
+
+    if not fallback:
+        raise OSError(f"Could not remove directory tree: {root}")
+    _py_rmtree(root)
+
+
+def _remove_trivial_tree(root: str) -> bool:
+    """Remove a missing, empty or .git-file-only directory without a full walk.
+
+    Returns False when the tree has other contents (or anything fails), in
+    which case nothing but possibly the .git file has been removed.
+    """
+    try:
+        with os.scandir(root) as entries:
+            # Two entries are enough to know the tree needs a real walk
+            first_entries = [entry for _, entry in zip(range(2), entries)]
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+
+    try:
+        if not first_entries:
+            os.rmdir(root)
+            return True
+
+        # A spent linked worktree often holds nothing but its .git file
+        if len(first_entries) == 1:
+            entry = first_entries[0]
+            if entry.name == '.git' and entry.is_file(follow_symlinks=False):
+                os.unlink(entry.path)
+                os.rmdir(root)
+                return True
+    except OSError:
+        pass
+
+    return False
+
+
+def _py_rmtree(root: str) -> None:
+    """Remove a tree depth-first with os.scandir, os.unlink and os.rmdir.
+
+    DirEntry.is_dir(follow_symlinks=False) answers from the directory
+    listing, so no entry is stat'ed just to decide how to remove it.
+    """
+    # Each level keeps its scandir iterator open and resumes it once the
+    # subdirectory it stopped at has been removed
+    stack = [(root, os.scandir(root))]
+    try:
+        while stack:
+            directory, entries = stack[-1]
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, os.scandir(entry.path)))
+                    break
+                _remove_entry(os.unlink, entry.path)
+            else:
+                entries.close()
+                stack.pop()
+                _remove_entry(os.rmdir, directory)
+    finally:
+        for _, entries in stack:
+            entries.close()
+
+
+def _remove_entry(function, path: str) -> None:
+    """Remove one entry, clearing a read-only flag (Windows) if that blocks it."""
+    try:
+        function(path)
+    except PermissionError:
+        if os.access(path, os.W_OK):
+            raise
+        os.chmod(path, stat.S_IWRITE)
+        function(path)
@@ -0,0 +1,152 @@
+"""
+Persistent git plumbing processes for repeated lookups in a worktree.
+"""
+
+import atexit
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# Read-only plumbing needs neither user nor system git config, so these
+# processes start with a minimal environment that skips loading both
+PLUMBING_ENV = {
+    key: os.environ[key]
+    for key in ('PATH', 'HOME', 'SYSTEMROOT')
+    if key in os.environ
+}
+PLUMBING_ENV.update({
+    'GIT_CONFIG_GLOBAL': os.devnull,
+    'GIT_CONFIG_NOSYSTEM': '1',
+    'LC_ALL': 'C',
+})
+
+# Environment for porcelain commands that work on the user's repository
+# (merge, pull, push, mv): the user's config applies, but stderr parsing is
+# locale-independent, optional index locks are skipped and git never blocks
+# on a credential prompt
+COMMAND_ENV = {
+    **os.environ,
+    'LC_ALL': 'C',
+    'LANG': 'C',
+    'GIT_OPTIONAL_LOCKS': '0',
+    'GIT_TERMINAL_PROMPT': '0',
+}
+
+# Lookups written to the batch process before reading their answers back
+_MAX_PIPELINED = 256
+
+
+class GitSession:
+    """Long-lived `git cat-file --batch-check` process bound to one worktree."""
+
+    def __init__(self, worktree_path: Path):
+        self.worktree_path = Path(worktree_path)
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._env: Optional[Dict[str, str]] = PLUMBING_ENV
+
+    def _ensure_process(self) -> subprocess.Popen:
+        """Start the batch process on first use (or after it has exited)."""
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ['git', 'cat-file', '--batch-check=%(objectname)'],
+                cwd=self.worktree_path,
+                env=self._env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+        return self._process
+
+    def rev_parse(self, rev: str) -> Optional[str]:
+        """Resolve a revision to an object name, or None if it does not exist."""
+        return self.resolve_refs([rev])[rev]
+
+    def resolve_refs(self, revs: Sequence[str]) -> Dict[str, Optional[str]]:
+        """Resolve several revisions with as few round trips as possible."""
+        results: Dict[str, Optional[str]] = dict.fromkeys(revs)
+        queries = [rev for rev in results if rev and '\n' not in rev]
+        if not queries:
+            return results
+
+        with self._lock:
+            lines = self._query(queries)
+            if lines is None and self._env is not None:
+                # Some setups need global config to open the repository at
+                # all (e.g. safe.directory), so retry with the full environment
+                self._env = None
+                lines = self._query(queries)
+
+        # Unknown revisions come back as "<rev> missing" / "<rev> ambiguous"
+        for rev, line in zip(queries, lines or ()):
+            if line and ' ' not in line:
+                results[rev] = line
+        return results
+
+    def _query(self, revs: List[str]) -> Optional[List[str]]:
+        """Send lookups to the batch process, or None if the process failed."""
+        lines = []
+        try:
+            process = self._ensure_process()
+            # Write a bounded batch before reading its answers, so neither
+            # pipe can fill up while the other side waits
+            for start in range(0, len(revs), _MAX_PIPELINED):
+                batch = revs[start:start + _MAX_PIPELINED]
+                process.stdin.write(''.join(rev + '\n' for rev in batch))
+                process.stdin.flush()
+                for _ in batch:
+                    line = process.stdout.readline()
+                    # A live process always answers with a full line
+                    if not line:
+                        self._close_process()
+                        return None
+                    lines.append(line.strip())
+        except (OSError, ValueError):
+            self._close_process()
+            return None
+
+        return lines
+
+    def _close_process(self) -> None:
+        """Terminate the batch process if it is running."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=1)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+
+    def close(self) -> None:
+        """Shut down the batch process."""
+        with self._lock:
+            self._close_process()
+
+
+_sessions: Dict[str, GitSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(worktree_path: Path) -> GitSession:
+    """Get the shared session for a worktree, creating it on first use."""
+    key = str(Path(worktree_path).resolve())
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = GitSession(Path(key))
+        return session
+
+
+@atexit.register
+def close_sessions() -> None:
+    """Shut down every shared session."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
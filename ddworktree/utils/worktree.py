@@ -0,0 +1,55 @@
+"""
+Helpers for telling paired worktrees apart.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Optional, Union
+
+from ddworktree.core import DDWorktreeRepo
+from ddworktree.utils.gitignore import get_git_status
+from ddworktree.utils.refs import find_git_dir
+from ddworktree.utils.session import COMMAND_ENV
+
+
+def is_local_worktree(worktree_path: Union[str, Path], repo: DDWorktreeRepo) -> bool:
+    """Check if this is a local worktree."""
+    local_suffix = repo.get_local_suffix()
+    return os.path.basename(os.fspath(worktree_path)).endswith(local_suffix)
+
+
+def is_git_worktree(path: Union[str, Path]) -> bool:
+    """Check if a path is the root of a Git worktree or repository."""
+    git_dir = find_git_dir(path)
+    return git_dir is not None and os.access(os.path.join(git_dir, 'HEAD'), os.F_OK)
+
+
+def get_paired_worktree(
+    current_path: Union[str, Path],
+    repo: DDWorktreeRepo,
+    is_local: bool
+) -> Optional[Path]:
+    """Get the paired worktree path."""
+    # find_pair keeps an index of every pair on the repo, so this is a
+    # single dict lookup shared by all commands
+    pair = repo.find_pair(current_path)
+    if pair and pair[1] == ('local' if is_local else 'main'):
+        return pair[2]
+
+    return None
+
+
+def is_dirty(worktree_path: Union[str, Path]) -> bool:
+    """Check for uncommitted changes to tracked files without scanning untracked ones."""
+    result = subprocess.run(
+        ['git', '--no-pager', '-C', os.fspath(worktree_path), 'diff', '--quiet', 'HEAD', '--'],
+        env=COMMAND_ENV,
+        capture_output=True
+    )
+
+    if result.returncode in (0, 1):
+        return result.returncode == 1
+
+    # No HEAD yet (or git failed) - fall back to a full status scan
+    return any(get_git_status(Path(worktree_path)).values())
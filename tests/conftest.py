@@ -0,0 +1,39 @@
+"""
+Shared pytest configuration for ddworktree tests.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+# RAM-backed on Linux, so fixture repositories skip journaling and writeback
+_RAM_DISK = '/dev/shm'
+
+
+@pytest.fixture(scope='session', autouse=True)
+def ram_backed_tempdir():
+    """Point tempfile (and the git processes tests start) at a RAM disk when available."""
+    if not sys.platform.startswith('linux') or not os.access(_RAM_DISK, os.W_OK | os.X_OK):
+        yield None
+        return
+
+    directory = tempfile.mkdtemp(prefix='ddw-tests-', dir=_RAM_DISK)
+    saved_tempdir = tempfile.tempdir
+    saved_env = os.environ.get('TMPDIR')
+
+    # tempfile caches its directory on first use, so set it directly too
+    tempfile.tempdir = directory
+    os.environ['TMPDIR'] = directory
+    try:
+        yield directory
+    finally:
+        tempfile.tempdir = saved_tempdir
+        if saved_env is None:
+            os.environ.pop('TMPDIR', None)
+        else:
+            os.environ['TMPDIR'] = saved_env
+        # Tests clean up their own directories; this catches anything left behind
+        shutil.rmtree(directory, ignore_errors=True)
@@ -2,6 +2,9 @@
 Tests for ddworktree core functionality.
 """
 
+import os
+import shutil
+import subprocess
 import tempfile
 import unittest
 from pathlib import Path
@@ -13,18 +16,45 @@ from git import Repo
 from ddworktree.core import DDWorktreeRepo, DDWorktreeError
 
 
+def _write_file(path: Path, text: str) -> None:
+    """Write a fixture file with one unbuffered write."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, text.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
 class TestDDWorktreeRepo(unittest.TestCase):
     """Test DDWorktreeRepo class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Initialize one template repository for the whole class."""
+        cls.template_dir = tempfile.mkdtemp()
+        # No template files (sample hooks etc.), so copies stay tiny
+        subprocess.run(['git', 'init', '-q', '--template=', cls.template_dir], check=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the template repository."""
+        shutil.rmtree(cls.template_dir, ignore_errors=True)
+
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
         self.temp_path = Path(self.temp_dir)
 
-        # Create a real Git repository for testing
-        git.Repo.init(self.temp_path)
+        # Create a real Git repository for testing; copying the template's
+        # .git is much cheaper than running git init for every test
+        shutil.copytree(Path(self.template_dir) / '.git', self.temp_path / '.git')
         self.mock_repo = Mock(spec=git.Repo)
         self.mock_repo.path = str(self.temp_path)
+        patcher = patch('git.Repo', return_value=self.mock_repo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_init_with_valid_repo(self):
         """Test initialization with valid repository."""
@@ -39,82 +69,148 @@ class TestDDWorktreeRepo(unittest.TestCase):
         with self.assertRaises(DDWorktreeError):
             DDWorktreeRepo(str(non_git_dir))
 
+    def test_init_with_bare_repo(self):
+        """Test initialization with a bare repository."""
+        bare_dir = self.temp_path / 'bare.git'
+        subprocess.run(['git', 'init', '-q', '--bare', '--template=', str(bare_dir)], check=True)
+
+        repo = DDWorktreeRepo(str(bare_dir))
+        self.assertEqual(repo.repo_path, bare_dir)
+
     def test_config_file_path(self):
         """Test config file path property."""
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
-            expected_path = self.temp_path / '.ddconfig'
-            self.assertEqual(repo.config_file, expected_path)
+        repo = DDWorktreeRepo(str(self.temp_path))
+        expected_path = self.temp_path / '.ddconfig'
+        self.assertEqual(repo.config_file, expected_path)
 
     def test_load_config_no_file(self):
         """Test loading config when no file exists."""
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
-            config = repo.load_config()
-            self.assertEqual(config, {'pairs': {}, 'options': {}})
+        repo = DDWorktreeRepo(str(self.temp_path))
+        config = repo.load_config()
+        self.assertEqual(config, {'pairs': {}, 'options': {}})
 
-    def test_load_config_with_file(self):
-        """Test loading config with existing file."""
-        # Create a test config file
-        config_content = """
-[pairs]
-dev = "dev, dev-local"
-test = "test, test-local"
+    def test_add_pair(self):
+        """Test adding a worktree pair."""
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.add_pair('feature1', 'feature1', 'feature1-local')
 
-[options]
-auto_sync = true
-push_local = false
-local_suffix = "-local"
-"""
+        config = repo.load_config()
+        self.assertEqual(config['pairs']['feature1'], 'feature1, feature1-local')
+
+    def test_save_config_replaces_file(self):
+        """Test that saving writes the whole file and leaves no temporary behind."""
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.save_config({
+            'pairs': {'dev': 'dev, dev-local'},
+            'options': {'auto_sync': True, 'local_suffix': '-custom', 'depth': 2}
+        })
+
+        self.assertEqual(repo.config_file.read_text(), (
+            '# ddworktree configuration\n\n'
+            '[pairs]\ndev = "dev, dev-local"\n\n'
+            '[options]\nauto_sync = true\nlocal_suffix = "-custom"\ndepth = 2\n'
+        ))
+        self.assertEqual([p.name for p in self.temp_path.glob('.ddconfig*')], ['.ddconfig'])
+        self.assertEqual(repo.load_config()['options']['depth'], 2)
+
+    def test_get_pairs_cached_until_save(self):
+        """Test that pairs are cached and refreshed after saving."""
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.add_pair('dev', 'dev', 'dev-local')
+        self.assertEqual(repo.get_pairs(), {'dev': ('dev', 'dev-local')})
+
+        with patch.object(repo, 'load_config', side_effect=AssertionError):
+            self.assertEqual(repo.get_pairs(), {'dev': ('dev', 'dev-local')})
+
+        repo.add_pair('test', 'test', 'test-local')
+        self.assertIn('test', repo.get_pairs())
+
+    def test_config_parsed_once(self):
+        """Test that pair and option lookups share a single config parse."""
         config_file = self.temp_path / '.ddconfig'
-        config_file.write_text(config_content)
+        _write_file(config_file, '[pairs]\ndev = "dev, dev-local"\n\n[options]\nlocal_suffix = "-custom"\n')
 
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
+        repo = DDWorktreeRepo(str(self.temp_path))
+        with patch.object(repo, 'load_config', wraps=repo.load_config) as load_config:
+            self.assertEqual(repo.get_pairs(), {'dev': ('dev', 'dev-local')})
+            self.assertEqual(repo.get_local_suffix(), '-custom')
+            self.assertEqual(repo.get_option('missing', 'default'), 'default')
+            self.assertEqual(load_config.call_count, 1)
+
+    def test_load_config_reparses_only_on_change(self):
+        """Test that load_config reuses its parse until the file changes."""
+        config_file = self.temp_path / '.ddconfig'
+        _write_file(config_file, '[pairs]\ndev = "dev, dev-local"\n')
+
+        repo = DDWorktreeRepo(str(self.temp_path))
+        with patch.object(repo, '_read_config', wraps=repo._read_config) as read_config:
             config = repo.load_config()
+            config['pairs']['scratch'] = 'a, b'
+            self.assertNotIn('scratch', repo.load_config()['pairs'])
+            self.assertEqual(read_config.call_count, 1)
+
+            _write_file(config_file, '[pairs]\ndev = "dev, dev-local"\ntest = "test, test-local"\n')
+            self.assertIn('test', repo.load_config()['pairs'])
+            self.assertEqual(read_config.call_count, 2)
+
+    def test_load_config_large_file(self):
+        """Test that a config large enough to be memory-mapped parses fully."""
+        lines = ['[pairs]\n']
+        lines.extend(f'pair{i} = "pair{i}, pair{i}-local"\n' for i in range(3000))
+        lines.append('[options]\nlocal_suffix = "-custom"\n')
+        _write_file(self.temp_path / '.ddconfig', ''.join(lines))
+        self.assertGreater((self.temp_path / '.ddconfig').stat().st_size, 64 * 1024)
 
-            expected_pairs = {
-                'dev': 'dev, dev-local',
-                'test': 'test, test-local'
-            }
-            expected_options = {
-                'auto_sync': 'true',
-                'push_local': 'false',
-                'local_suffix': '-local'
-            }
+        repo = DDWorktreeRepo(str(self.temp_path))
+        config = repo.load_config()
 
-            self.assertEqual(config['pairs'], expected_pairs)
-            self.assertEqual(config['options'], expected_options)
+        self.assertEqual(len(config['pairs']), 3000)
+        self.assertEqual(config['pairs']['pair2999'], 'pair2999, pair2999-local')
+        self.assertEqual(config['options']['local_suffix'], '-custom')
 
-    def test_get_pairs(self):
-        """Test getting worktree pairs."""
-        config_content = """
-[pairs]
-dev = "dev, dev-local"
-test = "test, test-local"
-"""
-        config_file = self.temp_path / '.ddconfig'
-        config_file.write_text(config_content)
+    def test_config_writes_refresh_cache(self):
+        """Test that each write is followed by exactly one re-parse."""
+        repo = DDWorktreeRepo(str(self.temp_path))
+        with patch.object(repo, '_read_config', wraps=repo._read_config) as read_config:
+            repo.add_pair('dev', 'dev', 'dev-local')
+            repo.set_option('local_suffix', '-custom')
+            parses = read_config.call_count
 
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
-            pairs = repo.get_pairs()
+            self.assertEqual(repo.load_config()['pairs'], {'dev': 'dev, dev-local'})
+            self.assertEqual(repo.get_local_suffix(), '-custom')
+            self.assertEqual(repo.load_config()['options'], {'local_suffix': '-custom'})
+            self.assertEqual(read_config.call_count, parses + 1)
 
-            expected = {
-                'dev': ('dev', 'dev-local'),
-                'test': ('test', 'test-local')
-            }
+            repo.remove_pair('dev')
+            self.assertEqual(repo.load_config()['pairs'], {})
+            self.assertEqual(read_config.call_count, parses + 2)
 
-            self.assertEqual(pairs, expected)
+    def test_find_pair(self):
+        """Test looking up a worktree's pair by path."""
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.add_pair('dev', 'dev', 'dev-local')
 
-    def test_add_pair(self):
-        """Test adding a worktree pair."""
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
-            repo.add_pair('feature1', 'feature1', 'feature1-local')
+        main_path = (self.temp_path / 'dev').resolve()
+        local_path = (self.temp_path / 'dev-local').resolve()
 
-            config = repo.load_config()
-            self.assertEqual(config['pairs']['feature1'], 'feature1, feature1-local')
+        self.assertEqual(repo.find_pair(main_path), ('dev', 'main', local_path))
+        self.assertEqual(repo.find_pair(local_path), ('dev', 'local', main_path))
+        self.assertIsNone(repo.find_pair(self.temp_path / 'other'))
+
+        repo.remove_pair('dev')
+        self.assertIsNone(repo.find_pair(main_path))
+
+    def test_resolve_pair_path(self):
+        """Test resolving pair paths against the repository."""
+        repo = DDWorktreeRepo(str(self.temp_path))
+        cwd = os.getcwd()
+        os.chdir('/')
+        try:
+            self.assertEqual(repo.resolve_pair_path('dev'), (self.temp_path / 'dev').resolve())
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(repo.resolve_pair_path(str(self.temp_path / 'dev-local')),
+                         (self.temp_path / 'dev-local').resolve())
 
     def test_remove_pair(self):
         """Test removing a worktree pair."""
@@ -125,34 +221,14 @@ dev = "dev, dev-local"
 test = "test, test-local"
 """
         config_file = self.temp_path / '.ddconfig'
-        config_file.write_text(config_content)
-
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
-            repo.remove_pair('dev')
-
-            config = repo.load_config()
-            self.assertNotIn('dev', config['pairs'])
-            self.assertIn('test', config['pairs'])
-
-    def test_get_option(self):
-        """Test getting configuration options."""
-        config_content = """
-[options]
-auto_sync = true
-push_local = false
-local_suffix = "-local"
-"""
-        config_file = self.temp_path / '.ddconfig'
-        config_file.write_text(config_content)
+        _write_file(config_file, config_content)
 
         repo = DDWorktreeRepo(str(self.temp_path))
+        repo.remove_pair('dev')
 
-        self.assertEqual(repo.get_option('auto_sync'), 'true')
-        self.assertEqual(repo.get_option('push_local'), 'false')
-        self.assertEqual(repo.get_option('local_suffix'), '-local')
-        self.assertIsNone(repo.get_option('nonexistent'))
-        self.assertEqual(repo.get_option('nonexistent', 'default'), 'default')
+        config = repo.load_config()
+        self.assertNotIn('dev', config['pairs'])
+        self.assertIn('test', config['pairs'])
 
     def test_set_option(self):
         """Test setting configuration options."""
@@ -164,87 +240,284 @@ local_suffix = "-local"
         self.assertEqual(config['options']['auto_sync'], 'true')
         self.assertEqual(config['options']['local_suffix'], '-custom')
 
-    def test_get_local_suffix_default(self):
-        """Test getting default local suffix."""
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
-            self.assertEqual(repo.get_local_suffix(), '-local')
-
-    def test_get_local_suffix_custom(self):
-        """Test getting custom local suffix."""
-        config_content = """
-[options]
-local_suffix = "-custom"
-"""
+    def test_new_keys_appended_to_last_table(self):
+        """Test new keys of the file's last table are appended, others rewrite it."""
         config_file = self.temp_path / '.ddconfig'
-        config_file.write_text(config_content)
+        text = '[options]\nlocal_suffix = "-custom"\n\n[pairs]\ndev = "dev, dev-local"\n'
+        _write_file(config_file, text)
 
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
-            self.assertEqual(repo.get_local_suffix(), '-custom')
+        repo = DDWorktreeRepo(str(self.temp_path))
+        with patch.object(repo, '_write_config_text', wraps=repo._write_config_text) as write:
+            repo.add_pair('test', 'test', 'test-local')
+            self.assertEqual(config_file.read_text(), text + 'test = "test, test-local"\n')
+            self.assertEqual(repo.get_pairs()['test'], ('test', 'test-local'))
+            write.assert_not_called()
+
+            # [options] isn't the last table, so its new keys need a rewrite
+            repo.set_option('auto_sync', True)
+            write.assert_called_once()
 
+        config = repo.load_config()
+        self.assertEqual(config['options'], {'local_suffix': '-custom', 'auto_sync': 'true'})
+        self.assertEqual(set(config['pairs']), {'dev', 'test'})
+
+    def test_get_local_suffix_default(self):
+        """Test getting default local suffix."""
+        repo = DDWorktreeRepo(str(self.temp_path))
+        self.assertEqual(repo.get_local_suffix(), '-local')
+
+    @patch('ddworktree.core._pygit2', None)
     @patch('subprocess.run')
     def test_create_worktree_success(self, mock_run):
         """Test successful worktree creation."""
         mock_run.return_value.returncode = 0
 
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
-            repo.create_worktree('/path/to/worktree', 'main')
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.create_worktree('/path/to/worktree', 'main')
 
-            mock_run.assert_called_once_with(
-                ['git', 'worktree', 'add', '/path/to/worktree', 'main'],
-                cwd=self.temp_path,
-                capture_output=True,
-                text=True
-            )
+        mock_run.assert_called_once_with(
+            ['git', 'worktree', 'add', '/path/to/worktree', 'main'],
+            cwd=self.temp_path,
+            capture_output=True,
+            text=True
+        )
 
+    @patch('ddworktree.core._pygit2', None)
     @patch('subprocess.run')
     def test_create_worktree_failure(self, mock_run):
         """Test failed worktree creation."""
         mock_run.return_value.returncode = 1
         mock_run.return_value.stderr = 'Error: worktree already exists'
 
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
+        repo = DDWorktreeRepo(str(self.temp_path))
 
-            with self.assertRaises(DDWorktreeError) as context:
-                repo.create_worktree('/path/to/worktree', 'main')
+        with self.assertRaises(DDWorktreeError) as context:
+            repo.create_worktree('/path/to/worktree', 'main')
+
+        self.assertIn('Failed to create worktree', str(context.exception))
+
+    def _patch_pygit2(self):
+        """Install a fake pygit2 module, returning its Repository instance."""
+        fake_pygit2 = MagicMock()
+        fake_pygit2.GitError = type('GitError', (Exception,), {})
+        repository = fake_pygit2.Repository.return_value
+        repository.config = []
+        repository.path = str(self.temp_path / '.git')
+        repository.list_worktrees.return_value = []
 
-            self.assertIn('Failed to create worktree', str(context.exception))
+        patcher = patch('ddworktree.core._pygit2', fake_pygit2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return repository
 
     @patch('subprocess.run')
-    def test_remove_worktree(self, mock_run):
-        """Test worktree removal."""
+    def test_create_worktree_libgit2_branch(self, mock_run):
+        """Test a local branch checkout goes through pygit2 without git."""
+        repository = self._patch_pygit2()
+
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.create_worktree('/path/to/worktree', 'main')
+
+        repository.branches.local.get.assert_called_once_with('main')
+        repository.add_worktree.assert_called_once_with(
+            'worktree', '/path/to/worktree', repository.branches.local.get.return_value
+        )
+        mock_run.assert_not_called()
+
+    @patch('subprocess.run')
+    def test_create_worktree_libgit2_falls_back_for_commits(self, mock_run):
+        """Test a commitish that is not a local branch is left to git."""
+        mock_run.return_value.returncode = 0
+        repository = self._patch_pygit2()
+        repository.branches.local.get.return_value = None
+
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.create_worktree('/path/to/worktree', 'abc1234')
+
+        repository.add_worktree.assert_not_called()
+        mock_run.assert_called_once()
+        self.assertEqual(
+            mock_run.call_args[0][0],
+            ['git', 'worktree', 'add', '/path/to/worktree', 'abc1234']
+        )
+
+    @patch('subprocess.run')
+    def test_create_worktree_libgit2_skips_filter_drivers(self, mock_run):
+        """Test repositories with external filter drivers (git-lfs) are left to git."""
         mock_run.return_value.returncode = 0
+        repository = self._patch_pygit2()
+
+        for key in ('filter.lfs.process', 'filter.lfs.smudge'):
+            mock_run.reset_mock()
+            # Mock's name argument sets its repr, so assign the attribute
+            required, driver = Mock(), Mock()
+            required.name, driver.name = 'filter.lfs.required', key
+            repository.config = [required, driver]
 
-        with patch('git.Repo', return_value=self.mock_repo):
             repo = DDWorktreeRepo(str(self.temp_path))
-            repo.remove_worktree('/path/to/worktree', force=True)
+            repo.create_worktree('/path/to/worktree', 'main')
 
-            mock_run.assert_called_once_with(
-                ['git', 'worktree', 'remove', '--force', '/path/to/worktree'],
-                cwd=self.temp_path,
-                capture_output=True,
-                text=True
+            repository.add_worktree.assert_not_called()
+            self.assertEqual(
+                mock_run.call_args[0][0],
+                ['git', 'worktree', 'add', '/path/to/worktree', 'main']
             )
 
+    @patch('subprocess.run')
+    def test_remove_worktree(self, mock_run):
+        """Test worktree removal."""
+        mock_run.return_value.returncode = 0
+
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.remove_worktree('/path/to/worktree', force=True)
+
+        mock_run.assert_called_once_with(
+            ['git', 'worktree', 'remove', '--force', '/path/to/worktree'],
+            cwd=self.temp_path,
+            capture_output=True,
+            text=True
+        )
+
+    @patch('subprocess.run')
+    def test_get_worktrees(self, mock_run):
+        """Test parsing NUL-separated worktree records."""
+        mock_run.return_value.returncode = 0
+        mock_run.return_value.stdout = (
+            b'worktree /repo\0HEAD abc123\0branch refs/heads/main\0\0'
+            b'worktree /repo/new\nline\0HEAD def456\0detached\0\0'
+        )
+
+        repo = DDWorktreeRepo(str(self.temp_path))
+        self.assertEqual(repo.get_worktrees(), [
+            {'path': '/repo', 'head': 'abc123', 'branch': 'refs/heads/main'},
+            {'path': '/repo/new\nline', 'head': 'def456'}
+        ])
+
+        mock_run.assert_called_once_with(
+            ['git', 'worktree', 'list', '--porcelain', '-z'],
+            cwd=self.temp_path,
+            capture_output=True
+        )
+
+    @patch('subprocess.run')
+    def test_get_worktrees_without_nul_output(self, mock_run):
+        """Test falling back to newline records when git rejects -z."""
+        rejected = Mock(returncode=129, stdout=b'')
+        listed = Mock(returncode=0, stdout=b'worktree /repo\nHEAD abc123\nbranch refs/heads/main\n\n')
+        mock_run.side_effect = [rejected, listed]
+
+        repo = DDWorktreeRepo(str(self.temp_path))
+        self.assertEqual(repo.get_worktrees(), [
+            {'path': '/repo', 'head': 'abc123', 'branch': 'refs/heads/main'}
+        ])
+
+    def test_is_valid_worktree(self):
+        """Test worktree validation from the .git file."""
+        worktree_dir = self.temp_path / 'worktree'
+        worktree_dir.mkdir()
+
+        repo = DDWorktreeRepo(str(self.temp_path))
+        self.assertFalse(repo.is_valid_worktree(str(worktree_dir)))
+
+        gitdir = self.temp_path / '.git' / 'worktrees' / 'worktree'
+        (worktree_dir / '.git').write_text(f'gitdir: {gitdir}\n')
+        self.assertTrue(repo.is_valid_worktree(str(worktree_dir)))
+
+        # A .git directory is a repository, not a linked worktree
+        self.assertFalse(repo.is_valid_worktree(str(self.temp_path)))
+
     def test_create_local_gitignore(self):
         """Test creating .gitignore-local file."""
         worktree_dir = self.temp_path / 'worktree'
         worktree_dir.mkdir()
 
-        with patch('git.Repo', return_value=self.mock_repo):
-            repo = DDWorktreeRepo(str(self.temp_path))
-            repo.create_local_gitignore(str(worktree_dir))
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.create_local_gitignore(str(worktree_dir))
+
+        gitignore_local = worktree_dir / '.gitignore-local'
+        self.assertTrue(gitignore_local.exists())
 
-            gitignore_local = worktree_dir / '.gitignore-local'
-            self.assertTrue(gitignore_local.exists())
+        content = gitignore_local.read_text()
+        self.assertIn('# Local files that should not be committed globally', content)
+        self.assertIn('*.local', content)
+        self.assertIn('.env', content)
 
-            content = gitignore_local.read_text()
-            self.assertIn('# Local files that should not be committed globally', content)
-            self.assertIn('*.local', content)
-            self.assertIn('.env', content)
+    def test_create_local_gitignore_keeps_existing(self):
+        """Test an existing .gitignore-local is not overwritten."""
+        worktree_dir = self.temp_path / 'worktree'
+        worktree_dir.mkdir()
+        _write_file(worktree_dir / '.gitignore-local', 'custom/\n')
+
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.create_local_gitignore(str(worktree_dir))
+
+        self.assertEqual((worktree_dir / '.gitignore-local').read_text(), 'custom/\n')
+
+
+class TestDDWorktreeRepoReadOnly(unittest.TestCase):
+    """Test config lookups that never modify the repository or its config."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one repository, config and DDWorktreeRepo shared by every test."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.temp_path = Path(cls.temp_dir)
+        subprocess.run(['git', 'init', '-q', '--template=', cls.temp_dir], check=True)
+
+        _write_file(cls.temp_path / '.ddconfig', """
+[pairs]
+dev = "dev, dev-local"
+test = "test, test-local"
+
+[options]
+auto_sync = true
+push_local = false
+local_suffix = "-custom"
+""")
+        cls.repo = DDWorktreeRepo(cls.temp_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared repository."""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def test_load_config_with_file(self):
+        """Test loading config with existing file."""
+        config = self.repo.load_config()
+
+        expected_pairs = {
+            'dev': 'dev, dev-local',
+            'test': 'test, test-local'
+        }
+        expected_options = {
+            'auto_sync': 'true',
+            'push_local': 'false',
+            'local_suffix': '-custom'
+        }
+
+        self.assertEqual(config['pairs'], expected_pairs)
+        self.assertEqual(config['options'], expected_options)
+
+    def test_get_pairs(self):
+        """Test getting worktree pairs."""
+        expected = {
+            'dev': ('dev', 'dev-local'),
+            'test': ('test', 'test-local')
+        }
+
+        self.assertEqual(self.repo.get_pairs(), expected)
+
+    def test_get_option(self):
+        """Test getting configuration options."""
+        self.assertEqual(self.repo.get_option('auto_sync'), 'true')
+        self.assertEqual(self.repo.get_option('push_local'), 'false')
+        self.assertEqual(self.repo.get_option('local_suffix'), '-custom')
+        self.assertIsNone(self.repo.get_option('nonexistent'))
+        self.assertEqual(self.repo.get_option('nonexistent', 'default'), 'default')
+
+    def test_get_local_suffix_custom(self):
+        """Test getting custom local suffix."""
+        self.assertEqual(self.repo.get_local_suffix(), '-custom')
 
 
 class TestDDWorktreeError(unittest.TestCase):
@@ -2,16 +2,24 @@
 Tests for ddworktree utilities.
 """
 
+import os
+import re
+import subprocess
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 from ddworktree.utils.gitignore import (
     parse_gitignore,
     get_combined_gitignore_patterns,
     is_ignored_by_pattern,
+    compile_patterns,
     get_tracked_files,
-    get_git_status
+    get_tracked_files_git,
+    get_git_status,
+    get_git_status_many,
+    get_git_status_counts_many
 )
 
 
@@ -20,7 +28,9 @@ class TestGitIgnoreUtils(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
         self.temp_path = Path(self.temp_dir)
 
     def test_parse_gitignore_no_file(self):
@@ -72,6 +82,40 @@ config/secrets.py
         expected = {'*.pyc', '__pycache__/', '*.local', '.env'}
         self.assertEqual(patterns, expected)
 
+    def test_get_combined_gitignore_patterns_sees_changes(self):
+        """Test that cached patterns are refreshed when an ignore file changes."""
+        gitignore_file = self.temp_path / '.gitignore'
+        gitignore_file.write_text('*.pyc\n')
+        self.assertEqual(get_combined_gitignore_patterns(self.temp_path), {'*.pyc'})
+
+        (self.temp_path / '.gitignore-local').write_text('*.env\n')
+        self.assertEqual(get_combined_gitignore_patterns(self.temp_path), {'*.pyc', '*.env'})
+
+        gitignore_file.write_text('*.pyc\n*.log\n')
+        self.assertEqual(
+            get_combined_gitignore_patterns(self.temp_path),
+            {'*.pyc', '*.log', '*.env'}
+        )
+
+    def test_get_ignore_regex_cached(self):
+        """Test that each ignore file is parsed once until it changes."""
+        from ddworktree.utils import gitignore
+
+        (self.temp_path / '.gitignore').write_text('*.pyc\n')
+        local_file = self.temp_path / '.gitignore-local'
+        local_file.write_text('*.env\n')
+
+        with patch.object(gitignore, '_read_gitignore', wraps=gitignore._read_gitignore) as parse:
+            regex = gitignore.get_ignore_regex(self.temp_path)
+            self.assertIs(gitignore.get_ignore_regex(self.temp_path), regex)
+            self.assertTrue(is_ignored_by_pattern(Path('a.env'), regex))
+            self.assertEqual(parse.call_count, 2)
+
+            local_file.write_text('*.env\n*.tmp\n')
+            self.assertTrue(is_ignored_by_pattern(Path('a.tmp'), gitignore.get_ignore_regex(self.temp_path)))
+            # Only the changed file was read again
+            self.assertEqual(parse.call_count, 3)
+
     def test_is_ignored_by_pattern_simple(self):
         """Test simple ignore pattern matching."""
         patterns = {'*.pyc', '__pycache__'}
@@ -97,6 +141,61 @@ config/secrets.py
         # Test that different paths don't match
         self.assertFalse(is_ignored_by_pattern(Path('/other/secrets.py'), patterns))
 
+    def test_is_ignored_by_pattern_compiled(self):
+        """Test matching against a precompiled pattern union."""
+        regex = compile_patterns({'*.pyc', 'build/', '/.env', 'secret'})
+
+        self.assertTrue(is_ignored_by_pattern(Path('src/module.pyc'), regex))
+        self.assertTrue(is_ignored_by_pattern(Path('build/output.txt'), regex))
+        self.assertTrue(is_ignored_by_pattern(Path('/.env'), regex))
+        self.assertTrue(is_ignored_by_pattern(Path('src/my_secret.txt'), regex))
+        # Substring patterns only look at the file name
+        self.assertFalse(is_ignored_by_pattern(Path('secret/notes.txt'), regex))
+        self.assertFalse(is_ignored_by_pattern(Path('src/build.py'), regex))
+        self.assertFalse(is_ignored_by_pattern(Path('src/main.py'), compile_patterns(set())))
+
+    def test_compile_patterns_path_prefix(self):
+        """Test the add and rm rules applied to each kind of pattern."""
+        regex = compile_patterns({'*.pyc', 'build/', '/config', 'secret'}, path_prefix=True)
+
+        def is_ignored(file_path):
+            return is_ignored_by_pattern(file_path, regex)
+
+        self.assertTrue(is_ignored(Path('src/module.pyc')))
+        self.assertTrue(is_ignored(Path('build/output.txt')))
+        self.assertTrue(is_ignored(Path('config/settings.py')))
+        self.assertTrue(is_ignored(Path('src/my_secret.txt')))
+        # Simple patterns match anywhere in the path, not just the name
+        self.assertTrue(is_ignored(Path('secret/notes.txt')))
+        self.assertFalse(is_ignored(Path('src/module.py')))
+        self.assertFalse(is_ignored(Path('build/nested/output.txt')))
+        self.assertFalse(is_ignored(Path('src/config/settings.py')))
+        # Anchored patterns only match the start of the path field
+        self.assertFalse(is_ignored(Path('src/config')))
+
+    def test_compile_patterns_path_prefix_empty(self):
+        """Test a union without patterns ignores nothing."""
+        regex = compile_patterns(set(), path_prefix=True)
+
+        self.assertFalse(is_ignored_by_pattern(Path('anything.pyc'), regex))
+
+    def test_compile_patterns_falls_back_to_re(self):
+        """Test unions RE2 refuses are compiled with re instead."""
+        from ddworktree.utils import gitignore
+
+        fake_re2 = MagicMock()
+        fake_re2.error = type('error', (Exception,), {})
+        fake_re2.compile.side_effect = fake_re2.error('pattern too large')
+
+        with patch.object(gitignore, '_re2', fake_re2):
+            regex = gitignore._compile_pattern_union.__wrapped__(frozenset({'*.pyc', 'build/'}))
+
+        self.assertIsInstance(regex, re.Pattern)
+        # RE2 was offered its own spelling of the end-of-text assertion
+        self.assertIn(r'\z', fake_re2.compile.call_args[0][0])
+        self.assertTrue(is_ignored_by_pattern(Path('src/module.pyc'), regex))
+        self.assertTrue(is_ignored_by_pattern(Path('build/output.txt'), regex))
+
     def test_get_tracked_files_with_ignored(self):
         """Test getting files including ignored ones."""
         # Create test files
@@ -129,12 +228,86 @@ config/secrets.py
         self.assertNotIn('test.pyc', file_names)
 
 
+    def test_get_tracked_files_prunes_ignored_directories(self):
+        """Test that ignored directories are skipped along with everything below them."""
+        (self.temp_path / '.gitignore').write_text('node_modules/\n')
+        (self.temp_path / 'node_modules' / 'pkg' / 'lib').mkdir(parents=True)
+        (self.temp_path / 'node_modules' / 'pkg' / 'lib' / 'index.js').write_text('module')
+        (self.temp_path / 'src').mkdir()
+        (self.temp_path / 'src' / 'main.js').write_text('main')
+        (self.temp_path / '.git').mkdir()
+        (self.temp_path / '.git' / 'HEAD').write_text('ref: refs/heads/main')
+        (self.temp_path / 'linked').symlink_to(self.temp_path / 'src')
+
+        relative = {
+            f.relative_to(self.temp_path).as_posix()
+            for f in get_tracked_files(self.temp_path)
+        }
+        self.assertEqual(relative, {'.gitignore', 'src/main.js'})
+
+        relative = {
+            f.relative_to(self.temp_path).as_posix()
+            for f in get_tracked_files(self.temp_path, include_ignored=True)
+        }
+        self.assertIn('node_modules/pkg/lib/index.js', relative)
+        self.assertNotIn('.git/HEAD', relative)
+
+    def test_get_tracked_files_git(self):
+        """Test listing files through git with its own ignore rules."""
+        git = ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com']
+        subprocess.run(['git', 'init', '-q'], cwd=self.temp_path, check=True)
+        (self.temp_path / '.gitignore').write_text('*.pyc\n!keep.pyc\n')
+        (self.temp_path / 'main.py').write_text('print("hello")')
+        (self.temp_path / 'gone.py').write_text('deleted')
+        (self.temp_path / 'test.pyc').write_text('compiled')
+        (self.temp_path / 'keep.pyc').write_text('kept')
+        subprocess.run(git + ['add', 'main.py', 'gone.py'], cwd=self.temp_path, check=True)
+        subprocess.run(git + ['commit', '-q', '-m', 'init'], cwd=self.temp_path, check=True)
+        (self.temp_path / 'gone.py').unlink()
+
+        file_names = {f.name for f in get_tracked_files_git(self.temp_path)}
+        self.assertEqual(file_names, {'.gitignore', 'main.py', 'keep.pyc'})
+
+        file_names = {f.name for f in get_tracked_files_git(self.temp_path, include_ignored=True)}
+        self.assertEqual(file_names, {'.gitignore', 'main.py', 'keep.pyc', 'test.pyc'})
+
+    def test_get_tracked_files_git_fallback(self):
+        """Test falling back to the walk outside a git work tree."""
+        (self.temp_path / 'main.py').write_text('print("hello")')
+
+        with patch.dict(os.environ, {'GIT_CEILING_DIRECTORIES': str(self.temp_path.parent)}):
+            files = get_tracked_files_git(self.temp_path)
+
+        self.assertEqual([f.name for f in files], ['main.py'])
+
+    def test_get_tracked_files_git_applies_local_ignores(self):
+        """Test .gitignore-local is applied by git the same way the walk applies it."""
+        subprocess.run(['git', 'init', '-q'], cwd=self.temp_path, check=True)
+        (self.temp_path / '.gitignore').write_text('*.pyc\n')
+        (self.temp_path / '.gitignore-local').write_text('*.env\nsecrets/\n')
+        (self.temp_path / 'main.py').write_text('print("hello")')
+        (self.temp_path / 'test.pyc').write_text('compiled')
+        (self.temp_path / 'local.env').write_text('KEY=value')
+        (self.temp_path / 'secrets').mkdir()
+        (self.temp_path / 'secrets' / 'key').write_text('secret')
+
+        expected = {'.gitignore', '.gitignore-local', 'main.py'}
+        for list_files in (get_tracked_files, get_tracked_files_git):
+            relative = {
+                f.relative_to(self.temp_path).as_posix()
+                for f in list_files(self.temp_path)
+            }
+            self.assertEqual(relative, expected, list_files.__name__)
+
+
 class TestDiffUtils(unittest.TestCase):
     """Test diff utility functions."""
 
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
         self.temp_path = Path(self.temp_dir)
 
     def test_worktree_diff_creation(self):
@@ -142,21 +315,220 @@ class TestDiffUtils(unittest.TestCase):
         from ddworktree.utils.diff import WorktreeDiff
 
         diff = WorktreeDiff(
-            added_files=['file1.txt', 'file2.txt'],
-            deleted_files=['old.txt'],
-            modified_files=['config.py'],
+            added_files=('file1.txt', 'file2.txt'),
+            deleted_files=('old.txt',),
+            modified_files=('config.py',),
             commit_drift=True,
             main_commit='abc123',
             local_commit='def456'
         )
 
-        self.assertEqual(diff.added_files, ['file1.txt', 'file2.txt'])
-        self.assertEqual(diff.deleted_files, ['old.txt'])
-        self.assertEqual(diff.modified_files, ['config.py'])
+        self.assertEqual(diff.added_files, ('file1.txt', 'file2.txt'))
+        self.assertEqual(diff.deleted_files, ('old.txt',))
+        self.assertEqual(diff.modified_files, ('config.py',))
         self.assertTrue(diff.commit_drift)
         self.assertEqual(diff.main_commit, 'abc123')
         self.assertEqual(diff.local_commit, 'def456')
 
+    def test_detect_drift_sorted_tuples(self):
+        """Test that drift results come back as sorted tuples."""
+        from ddworktree.utils.diff import detect_drift
+
+        main_dir = self.temp_path / 'main'
+        local_dir = self.temp_path / 'local'
+        main_dir.mkdir()
+        local_dir.mkdir()
+        for name in ('zeta.txt', 'alpha.txt', 'mid.txt'):
+            (local_dir / name).write_text(name)
+        (main_dir / 'gone.txt').write_text('gone')
+
+        drift = detect_drift(main_dir, local_dir)
+
+        self.assertEqual(drift.added_files, ('alpha.txt', 'mid.txt', 'zeta.txt'))
+        self.assertEqual(drift.deleted_files, ('gone.txt',))
+        self.assertEqual(drift.modified_files, ())
+
+    def test_worktree_diff_is_immutable(self):
+        """Test WorktreeDiff has no instance dict and rejects assignment."""
+        from dataclasses import FrozenInstanceError
+        from ddworktree.utils.diff import WorktreeDiff
+
+        diff = WorktreeDiff(('new.txt',), (), (), False, 'abc123', 'abc123')
+
+        self.assertFalse(hasattr(diff, '__dict__'))
+        with self.assertRaises(FrozenInstanceError):
+            diff.commit_drift = True
+
+    def test_get_path_differences_matches_full_scan(self):
+        """Test that comparing selected paths agrees with a full scan."""
+        from ddworktree.utils.diff import get_file_differences, get_path_differences
+
+        main_dir = self.temp_path / 'main'
+        local_dir = self.temp_path / 'local'
+        (main_dir / 'src').mkdir(parents=True)
+        (local_dir / 'src').mkdir(parents=True)
+        (main_dir / 'same.txt').write_text('same')
+        (local_dir / 'same.txt').write_text('same')
+        (main_dir / 'src' / 'changed.py').write_text('old')
+        (local_dir / 'src' / 'changed.py').write_text('new')
+        (main_dir / 'gone.txt').write_text('gone')
+        (local_dir / 'new.txt').write_text('new')
+
+        paths = ['same.txt', 'src/changed.py', 'gone.txt', 'new.txt', 'missing.txt']
+        self.assertEqual(
+            get_path_differences(main_dir, local_dir, paths),
+            (['new.txt'], ['gone.txt'], ['src/changed.py'])
+        )
+        self.assertEqual(
+            tuple(sorted(files) for files in get_file_differences(main_dir, local_dir)),
+            (['new.txt'], ['gone.txt'], ['src/changed.py'])
+        )
+
+    def test_get_file_differences_compares_bytes(self):
+        """Test that identical binary files match and .git entries are skipped."""
+        from ddworktree.utils.diff import get_file_differences
+
+        main_dir = self.temp_path / 'main'
+        local_dir = self.temp_path / 'local'
+        (main_dir / '.git').mkdir(parents=True)
+        local_dir.mkdir()
+        (local_dir / '.git').write_text('gitdir: elsewhere')
+
+        for i in range(40):
+            (main_dir / f'blob{i}.bin').write_bytes(b'\xff\x00' * 1000)
+            (local_dir / f'blob{i}.bin').write_bytes(b'\xff\x00' * 1000)
+        (local_dir / 'blob7.bin').write_bytes(b'\xff\x01' * 1000)
+        (local_dir / 'blob9.bin').write_bytes(b'\xff')
+
+        added, deleted, modified = get_file_differences(main_dir, local_dir)
+        self.assertEqual(added, [])
+        self.assertEqual(deleted, [])
+        self.assertEqual(sorted(modified), ['blob7.bin', 'blob9.bin'])
+
+    def test_get_file_differences_large_files(self):
+        """Test comparing large files that differ only in their last byte."""
+        from ddworktree.utils.diff import get_file_differences
+
+        main_dir = self.temp_path / 'main'
+        local_dir = self.temp_path / 'local'
+        main_dir.mkdir()
+        local_dir.mkdir()
+
+        content = os.urandom(3 * 1024 * 1024)
+        for directory in (main_dir, local_dir):
+            (directory / 'same.bin').write_bytes(content)
+        (main_dir / 'tail.bin').write_bytes(content + b'a')
+        (local_dir / 'tail.bin').write_bytes(content + b'b')
+
+        self.assertEqual(get_file_differences(main_dir, local_dir), ([], [], ['tail.bin']))
+
+    def test_get_file_differences_git_matches_scan(self):
+        """Test that the git-based comparison agrees with the directory scan."""
+        from ddworktree.utils.diff import get_file_differences, get_file_differences_git
+
+        main_dir = self.temp_path / 'main'
+        local_dir = self.temp_path / 'local'
+        (main_dir / 'src').mkdir(parents=True)
+        (local_dir / 'src').mkdir(parents=True)
+        (local_dir / '.git').write_text('gitdir: elsewhere')
+        (main_dir / 'src' / 'same.py').write_text('same')
+        (local_dir / 'src' / 'same.py').write_text('same')
+        (local_dir / 'src' / 'same.py').chmod(0o755)
+        (main_dir / 'src' / 'changed.py').write_text('old')
+        (local_dir / 'src' / 'changed.py').write_text('new')
+        (main_dir / 'gone.txt').write_text('gone')
+        (local_dir / 'new.txt').write_text('new')
+
+        expected = (['new.txt'], ['gone.txt'], [os.path.join('src', 'changed.py')])
+        self.assertEqual(
+            tuple(sorted(files) for files in get_file_differences(main_dir, local_dir)),
+            expected
+        )
+        self.assertEqual(
+            tuple(sorted(files) for files in get_file_differences_git(main_dir, local_dir)),
+            expected
+        )
+
+        # A repository's .git directory is left to the scan
+        (main_dir / '.git').mkdir()
+        self.assertIsNone(get_file_differences_git(main_dir, local_dir))
+
+    def test_sync_files(self):
+        """Test copying changed files and skipping identical ones."""
+        from ddworktree.utils.diff import sync_files
+
+        source_dir = self.temp_path / 'source'
+        target_dir = self.temp_path / 'target'
+        (source_dir / 'nested').mkdir(parents=True)
+        target_dir.mkdir()
+        (source_dir / 'nested' / 'new.txt').write_text('new')
+        (source_dir / 'same.txt').write_text('same')
+        (target_dir / 'same.txt').write_text('same')
+        os.utime(source_dir / 'nested' / 'new.txt', (1000000000, 1000000000))
+
+        self.assertEqual(
+            sync_files(source_dir, target_dir, ['nested/new.txt', 'same.txt'], dry_run=True),
+            ['Would copy: nested/new.txt']
+        )
+        self.assertFalse((target_dir / 'nested').exists())
+
+        self.assertEqual(
+            sync_files(source_dir, target_dir, ['nested/new.txt', 'same.txt', 'missing.txt']),
+            ['Copied: nested/new.txt']
+        )
+        copied = target_dir / 'nested' / 'new.txt'
+        self.assertEqual(copied.read_text(), 'new')
+        self.assertEqual(copied.stat().st_mtime, 1000000000)
+
+    def test_is_trivially_in_sync(self):
+        """Test the quick in-sync check on clean and dirty worktrees."""
+        from ddworktree.utils.diff import is_trivially_in_sync
+
+        main_dir = self.temp_path / 'main'
+        local_dir = self.temp_path / 'local'
+        main_dir.mkdir()
+        subprocess.run(['git', 'init', '-q'], cwd=main_dir, check=True)
+        (main_dir / '.gitignore').write_text('*.log\n')
+        subprocess.run(['git', 'add', '.'], cwd=main_dir, check=True)
+        subprocess.run(
+            ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com',
+             'commit', '-q', '-m', 'initial'],
+            cwd=main_dir, check=True
+        )
+        subprocess.run(['git', 'clone', '-q', str(main_dir), str(local_dir)], check=True)
+
+        self.assertTrue(is_trivially_in_sync(main_dir, local_dir))
+
+        (local_dir / 'debug.log').write_text('ignored but still a difference')
+        self.assertFalse(is_trivially_in_sync(main_dir, local_dir))
+
+    def test_read_head_commit(self):
+        """Test resolving HEAD from loose refs, packed refs and linked worktrees."""
+        from ddworktree.utils.refs import read_head_commit
+
+        git = ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com']
+        main_dir = self.temp_path / 'main'
+        linked_dir = self.temp_path / 'linked'
+        main_dir.mkdir()
+        subprocess.run(['git', 'init', '-q'], cwd=main_dir, check=True)
+        self.assertIsNone(read_head_commit(main_dir))
+
+        subprocess.run(git + ['commit', '-q', '--allow-empty', '-m', 'initial'], cwd=main_dir, check=True)
+        subprocess.run(git + ['worktree', 'add', '-q', '-b', 'other', str(linked_dir)], cwd=main_dir, check=True)
+        subprocess.run(git + ['commit', '-q', '--allow-empty', '-m', 'second'], cwd=linked_dir, check=True)
+
+        def rev_parse(directory):
+            return subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], cwd=directory, capture_output=True, text=True
+            ).stdout.strip()
+
+        for directory in (main_dir, linked_dir):
+            self.assertEqual(read_head_commit(directory), rev_parse(directory))
+
+        subprocess.run(['git', 'pack-refs', '--all'], cwd=main_dir, check=True)
+        self.assertEqual(read_head_commit(linked_dir), rev_parse(linked_dir))
+        self.assertIsNone(read_head_commit(self.temp_path))
+
     def test_generate_diff_report_no_drift(self):
         """Test generating diff report with no drift."""
         from ddworktree.utils.diff import WorktreeDiff, generate_diff_report
@@ -195,6 +567,396 @@ class TestDiffUtils(unittest.TestCase):
         self.assertIn('old.txt', report)
         self.assertIn('main.py', report)
 
+    def test_generate_diff_report_layout(self):
+        """Test the report lists each section's files in order and indented."""
+        from ddworktree.utils.diff import WorktreeDiff, generate_diff_report
+
+        diff = WorktreeDiff(
+            added_files=('a.txt', 'b.txt'),
+            deleted_files=(),
+            modified_files=('main.py',),
+            commit_drift=False,
+            main_commit='abc123',
+            local_commit='abc123'
+        )
+
+        self.assertEqual(generate_diff_report(diff), '\n'.join([
+            '➕ Files added in local:',
+            '  a.txt',
+            '  b.txt',
+            '',
+            '✏️  Files modified:',
+            '  main.py',
+            '',
+        ]))
+
+
+class TestIOStatUtils(unittest.TestCase):
+    """Test batched filesystem probes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.temp_path = Path(self.temp_dir)
+
+    def test_probe_paths_exists(self):
+        """Test probing existence of a mix of paths."""
+        from ddworktree.utils.iostat import probe_paths
+
+        present = self.temp_path / 'present'
+        present.write_text('x')
+        missing = self.temp_path / 'missing'
+
+        result = probe_paths([present, missing, present])
+        self.assertEqual(result, {present: True, missing: False})
+
+    def test_probe_paths_large_batch(self):
+        """Test probing a batch large enough to use the thread pool."""
+        from ddworktree.utils.iostat import probe_paths
+
+        paths = [self.temp_path / f'file{i}' for i in range(50)]
+        for path in paths[::2]:
+            path.write_text('x')
+
+        result = probe_paths(paths, lambda path: path.is_file())
+        self.assertEqual(result, {path: i % 2 == 0 for i, path in enumerate(paths)})
+
+
+    def test_path_exists(self):
+        """Test the access-based existence check."""
+        from ddworktree.utils.iostat import path_exists
+
+        present = self.temp_path / 'present'
+        present.write_text('x')
+
+        self.assertTrue(path_exists(present))
+        self.assertTrue(path_exists(str(self.temp_path)))
+        self.assertFalse(path_exists(self.temp_path / 'missing'))
+
+class TestGitSession(unittest.TestCase):
+    """Test persistent git session helper."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.temp_path = Path(self.temp_dir)
+
+        subprocess.run(['git', 'init', '-q'], cwd=self.temp_path, check=True)
+        subprocess.run(
+            ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+             'commit', '-q', '--allow-empty', '-m', 'initial'],
+            cwd=self.temp_path,
+            check=True
+        )
+
+    def test_rev_parse_head(self):
+        """Test resolving HEAD through the batch process."""
+        from ddworktree.utils.session import GitSession
+
+        expected = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=self.temp_path,
+            capture_output=True,
+            text=True
+        ).stdout.strip()
+
+        session = GitSession(self.temp_path)
+        try:
+            self.assertEqual(session.rev_parse('HEAD'), expected)
+            # A second lookup reuses the same process
+            self.assertEqual(session.rev_parse('HEAD'), expected)
+        finally:
+            session.close()
+
+    def test_rev_parse_missing(self):
+        """Test resolving a revision that does not exist."""
+        from ddworktree.utils.session import GitSession
+
+        session = GitSession(self.temp_path)
+        try:
+            self.assertIsNone(session.rev_parse('no-such-branch'))
+        finally:
+            session.close()
+
+    def test_resolve_refs_many(self):
+        """Test resolving more revisions than fit in one pipelined batch."""
+        from ddworktree.utils.session import GitSession
+
+        expected = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=self.temp_path, capture_output=True, text=True
+        ).stdout.strip()
+        revs = [f'missing{i}' for i in range(300)] + ['HEAD', '', 'bad\nrev']
+
+        session = GitSession(self.temp_path)
+        try:
+            results = session.resolve_refs(revs)
+        finally:
+            session.close()
+
+        self.assertEqual(results['HEAD'], expected)
+        self.assertEqual(set(results), set(revs))
+        self.assertEqual([rev for rev, name in results.items() if name], ['HEAD'])
+
+    def test_get_session_is_shared(self):
+        """Test that sessions are cached per worktree."""
+        from ddworktree.utils.session import get_session
+
+        self.assertIs(get_session(self.temp_path), get_session(self.temp_path))
+
+
+class TestGitStatusMany(unittest.TestCase):
+    """Test batched git status lookups."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.temp_path = Path(self.temp_dir)
+        self.clean_repo = self.temp_path / 'clean'
+        self.dirty_repo = self.temp_path / 'dirty'
+
+        for repo_path in (self.clean_repo, self.dirty_repo):
+            repo_path.mkdir()
+            subprocess.run(['git', 'init', '-q'], cwd=repo_path, check=True)
+
+        (self.dirty_repo / 'new.txt').write_text('content')
+
+    def test_get_git_status_many_matches_single(self):
+        """Test that batched statuses match individual lookups."""
+        statuses = get_git_status_many([self.clean_repo, self.dirty_repo])
+
+        self.assertEqual(statuses[self.clean_repo], get_git_status(self.clean_repo))
+        self.assertEqual(statuses[self.dirty_repo], get_git_status(self.dirty_repo))
+        self.assertEqual(statuses[self.dirty_repo]['untracked'], ['new.txt'])
+
+    def test_get_git_status_counts_many_matches_lists(self):
+        """Test that status counts agree with the parsed file lists."""
+        def git(*args):
+            subprocess.run(
+                ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+                cwd=self.dirty_repo, check=True, capture_output=True
+            )
+
+        for name in ('modified.txt', 'deleted.txt', 'renamed.txt'):
+            (self.dirty_repo / name).write_text(name)
+        git('add', '.')
+        git('commit', '-q', '-m', 'initial')
+        (self.dirty_repo / 'modified.txt').write_text('changed')
+        (self.dirty_repo / 'deleted.txt').unlink()
+        (self.dirty_repo / 'staged.txt').write_text('staged')
+        git('add', 'staged.txt')
+        git('mv', 'renamed.txt', 'moved.txt')
+
+        counts = get_git_status_counts_many([self.clean_repo, self.dirty_repo])
+
+        for repo_path in (self.clean_repo, self.dirty_repo):
+            status = get_git_status(repo_path)
+            expected = {category: len(files) for category, files in status.items()}
+            self.assertEqual(counts[repo_path], expected)
+        self.assertEqual(counts[self.dirty_repo]['renamed'], 1)
+
+
+    def test_get_git_status_paths(self):
+        """Test that status paths come through unquoted and untruncated."""
+        def git(*args):
+            subprocess.run(
+                ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+                cwd=self.dirty_repo, check=True, capture_output=True
+            )
+
+        for name in ('edited file.txt', 'old.txt'):
+            (self.dirty_repo / name).write_text(name)
+        git('add', 'edited file.txt', 'old.txt')
+        git('commit', '-q', '-m', 'initial')
+        (self.dirty_repo / 'edited file.txt').write_text('changed')
+        git('mv', 'old.txt', 'moved.txt')
+
+        status = get_git_status(self.dirty_repo)
+
+        self.assertEqual(status['modified'], ['edited file.txt'])
+        self.assertEqual(status['renamed'], ['old.txt -> moved.txt'])
+        self.assertEqual(status['untracked'], ['new.txt'])
+
+class TestParallelRmtree(unittest.TestCase):
+    """Test parallel directory removal."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.temp_path = Path(self.temp_dir)
+
+    def test_parallel_rmtree_nested(self):
+        """Test removing a nested tree with files, links and read-only entries."""
+        from ddworktree.utils.rmtree import parallel_rmtree
+
+        outside = self.temp_path / 'outside.txt'
+        outside.write_text('keep')
+
+        tree = self.temp_path / 'tree'
+        for i in range(5):
+            subdir = tree / f'dir{i}' / 'nested'
+            subdir.mkdir(parents=True)
+            for j in range(10):
+                (subdir / f'file{j}.txt').write_text('content')
+        (tree / 'link').symlink_to(outside)
+        readonly = tree / 'readonly.txt'
+        readonly.write_text('content')
+        readonly.chmod(0o444)
+
+        parallel_rmtree(tree)
+
+        self.assertFalse(tree.exists())
+        self.assertEqual(outside.read_text(), 'keep')
+
+    def test_parallel_rmtree_rejects_symlink(self):
+        """Test that a symlinked directory is not followed."""
+        from ddworktree.utils.rmtree import parallel_rmtree
+
+        target = self.temp_path / 'target'
+        target.mkdir()
+        (target / 'file.txt').write_text('content')
+        link = self.temp_path / 'link'
+        link.symlink_to(target)
+
+        with self.assertRaises(OSError):
+            parallel_rmtree(link)
+        self.assertTrue((target / 'file.txt').exists())
+
+    def test_fast_rmtree(self):
+        """Test removing a tree with the native tool, falling back if needed."""
+        from ddworktree.utils.rmtree import fast_rmtree
+
+        tree = self.temp_path / '-tree with spaces'
+        (tree / 'nested').mkdir(parents=True)
+        (tree / 'nested' / 'file.txt').write_text('content')
+
+        fast_rmtree(tree)
+        self.assertFalse(tree.exists())
+
+        with patch('subprocess.run', side_effect=FileNotFoundError):
+            for i in range(3):
+                subdir = tree / f'dir{i}' / 'nested'
+                subdir.mkdir(parents=True)
+                (subdir / 'file.txt').write_text('content')
+                (tree / f'dir{i}' / 'file.txt').write_text('content')
+            (tree / 'link').symlink_to(self.temp_path)
+            fast_rmtree(tree)
+            self.assertFalse(tree.exists())
+
+            (tree / 'nested').mkdir(parents=True)
+            with self.assertRaises(OSError):
+                fast_rmtree(tree, fallback=False)
+            self.assertTrue(tree.exists())
+
+
+    def test_fast_rmtree_trivial_trees(self):
+        """Test that missing, empty and .git-only trees skip the native tool."""
+        from ddworktree.utils.rmtree import fast_rmtree
+
+        empty = self.temp_path / 'empty'
+        empty.mkdir()
+        spent = self.temp_path / 'spent'
+        spent.mkdir()
+        (spent / '.git').write_text('gitdir: elsewhere')
+
+        with patch('subprocess.run', side_effect=AssertionError) as run:
+            fast_rmtree(empty)
+            fast_rmtree(spent)
+            fast_rmtree(self.temp_path / 'missing')
+            run.assert_not_called()
+
+        self.assertFalse(empty.exists())
+        self.assertFalse(spent.exists())
+
+class TestBatchUtils(unittest.TestCase):
+    """Test command-line batching helpers."""
+
+    def test_chunk_paths_by_count(self):
+        """Test that batches are capped by path count."""
+        from ddworktree.utils.batch import chunk_paths
+
+        paths = [f'file{i}.txt' for i in range(7)]
+        batches = list(chunk_paths(paths, max_paths=3))
+
+        self.assertEqual([len(batch) for batch in batches], [3, 3, 1])
+        self.assertEqual([path for batch in batches for path in batch], paths)
+
+    def test_chunk_paths_by_size(self):
+        """Test that batches are capped by total length."""
+        from ddworktree.utils.batch import chunk_paths
+
+        paths = ['a' * 9, 'b' * 9, 'c' * 9]
+        self.assertEqual(list(chunk_paths(paths, max_bytes=20)), [[paths[0], paths[1]], [paths[2]]])
+        self.assertEqual(list(chunk_paths([])), [])
+
+
+class TestWorktreeUtils(unittest.TestCase):
+    """Test worktree pairing helpers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.temp_path = Path(self.temp_dir)
+        subprocess.run(['git', 'init', '-q'], cwd=self.temp_path, check=True)
+
+    def test_paired_worktree_lookup(self):
+        """Test detecting the worktree type and finding its partner."""
+        from ddworktree.core import DDWorktreeRepo
+        from ddworktree.utils.worktree import is_local_worktree, get_paired_worktree
+
+        repo = DDWorktreeRepo(str(self.temp_path))
+        repo.add_pair('dev', 'dev', 'dev-local')
+        main_path = (self.temp_path / 'dev').resolve()
+        local_path = (self.temp_path / 'dev-local').resolve()
+
+        self.assertFalse(is_local_worktree(main_path, repo))
+        self.assertTrue(is_local_worktree(str(local_path), repo))
+        self.assertEqual(get_paired_worktree(main_path, repo, False), local_path)
+        self.assertEqual(get_paired_worktree(local_path, repo, True), main_path)
+        self.assertIsNone(get_paired_worktree(main_path, repo, True))
+
+    def test_is_git_worktree(self):
+        """Test repositories and linked worktrees are recognized by their git dir."""
+        from ddworktree.utils.worktree import is_git_worktree
+
+        self.assertTrue(is_git_worktree(self.temp_path))
+
+        linked = self.temp_path / 'linked'
+        linked.mkdir()
+        self.assertFalse(is_git_worktree(linked))
+        (linked / '.git').write_text(f'gitdir: {self.temp_path / ".git"}\n')
+        self.assertTrue(is_git_worktree(linked))
+        # The git dir it points to has to exist
+        (linked / '.git').write_text(f'gitdir: {self.temp_path / "missing"}\n')
+        self.assertFalse(is_git_worktree(linked))
+
+    def test_is_dirty(self):
+        """Test tracked changes count as dirty, untracked files don't."""
+        from ddworktree.utils.worktree import is_dirty
+
+        git = ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com']
+        tracked = self.temp_path / 'tracked.txt'
+        tracked.write_text('content')
+        # Without a HEAD commit the full status scan decides
+        self.assertTrue(is_dirty(self.temp_path))
+
+        subprocess.run(git + ['add', 'tracked.txt'], cwd=self.temp_path, check=True)
+        subprocess.run(git + ['commit', '-q', '-m', 'init'], cwd=self.temp_path, check=True)
+        (self.temp_path / 'untracked.txt').write_text('new')
+        self.assertFalse(is_dirty(self.temp_path))
+
+        tracked.write_text('changed')
+        self.assertTrue(is_dirty(self.temp_path))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file